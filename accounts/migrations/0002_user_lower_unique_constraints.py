@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:20
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def resolver_duplicados(apps, schema_editor):
+    """
+    Os índices únicos por Lower() falham se já existirem duplicados.
+
+    Usernames repetidos (sem distinguir maiúsculas) são resolvidos mantendo
+    o utilizador mais antigo e acrescentando o id aos restantes (continuam a
+    entrar pelo email). Emails repetidos não têm dono óbvio, por isso a
+    migração para e lista-os para serem resolvidos à mão.
+    """
+    User = apps.get_model('accounts', 'User')
+    max_length = User._meta.get_field('username').max_length
+
+    usernames = (
+        User.objects.annotate(chave=Lower('username')).values('chave')
+        .annotate(total=Count('id')).filter(total__gt=1).values_list('chave', flat=True)
+    )
+    for chave in list(usernames):
+        repetidos = User.objects.annotate(chave=Lower('username')).filter(chave=chave).order_by('date_joined', 'pk')
+        for user in list(repetidos)[1:]:
+            sufixo = f'_{user.pk}'
+            user.username = user.username[:max_length - len(sufixo)] + sufixo
+            user.save(update_fields=['username'])
+
+    emails = list(
+        User.objects.exclude(email='').annotate(chave=Lower('email')).values('chave')
+        .annotate(total=Count('id')).filter(total__gt=1).values_list('chave', flat=True)[:20]
+    )
+    if emails:
+        raise RuntimeError(
+            'Existem contas com o mesmo email (sem distinguir maiúsculas): '
+            + ', '.join(emails)
+            + '. Resolva os duplicados antes de aplicar accounts.0002.'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(resolver_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('username'), name='accounts_user_username_lower_uniq', violation_error_message='Este nome de utilizador já está registado.'),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='accounts_user_email_lower_uniq', violation_error_message='Este email já está registado.'),
+        ),
+    ]
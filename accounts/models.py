@@ -1,9 +1,30 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
 from decimal import Decimal
 import uuid
 
+
+class UserQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        """UPDATE em lote não emite post_save: limpar também a cache do EmailBackend.get_user"""
+        from authentication.backends import cache_utilizadores_ativa, invalidar_utilizadores
+
+        if not cache_utilizadores_ativa():
+            return super().update(**kwargs)
+        user_ids = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        invalidar_utilizadores(user_ids)
+        return rows
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    pass
+
+
 class User(AbstractUser):
     """
     Modelo de utilizador customizado que estende o AbstractUser do Django
@@ -99,6 +120,8 @@ class User(AbstractUser):
         verbose_name='Última Atualização'
     )
 
+    objects = UserManager()
+
     class Meta:
         verbose_name = 'Utilizador'
         verbose_name_plural = 'Utilizadores'
@@ -107,6 +130,20 @@ class User(AbstractUser):
             models.Index(fields=['is_verified']),
             models.Index(fields=['city', 'district']),
         ]
+        constraints = [
+            # Índices funcionais usados pelo login (EmailBackend) e unicidade sem distinguir maiúsculas
+            models.UniqueConstraint(
+                Lower('username'),
+                name='accounts_user_username_lower_uniq',
+                violation_error_message='Este nome de utilizador já está registado.',
+            ),
+            models.UniqueConstraint(
+                Lower('email'),
+                condition=~Q(email=''),
+                name='accounts_user_email_lower_uniq',
+                violation_error_message='Este email já está registado.',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.username} - {self.get_user_type_display()}"
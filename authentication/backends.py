@@ -1,10 +1,37 @@
+from django.conf import settings
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models.functions import Lower
+
+from carzone.caches import cache_partilhada
 
 User = get_user_model()
 
 
+def chave_utilizador(user_id):
+    """Chave da cache com o utilizador de uma sessão"""
+    return f'auth:user:{user_id}'
+
+
+def cache_utilizadores_ativa():
+    """
+    A cache de get_user só é segura numa cache partilhada entre workers
+    (Redis): com LocMemCache a invalidação limparia apenas o processo que
+    gravou e um utilizador desativado continuaria autenticado nos outros.
+    """
+    return settings.AUTH_USER_CACHE_TIMEOUT > 0 and cache_partilhada()
+
+
+def invalidar_utilizador(user_id):
+    invalidar_utilizadores([user_id])
+
+
+def invalidar_utilizadores(user_ids):
+    if cache_utilizadores_ativa():
+        cache.delete_many([chave_utilizador(user_id) for user_id in user_ids])
+
+
 class EmailBackend(ModelBackend):
     """
     Backend de autenticação personalizado que permite login por email ou username
@@ -17,12 +44,8 @@ class EmailBackend(ModelBackend):
         if username is None or password is None:
             return None
         
-        try:
-            # Tentar encontrar o utilizador por email ou username
-            user = User.objects.get(
-                Q(email__iexact=username) | Q(username__iexact=username)
-            )
-        except User.DoesNotExist:
+        user = self.procurar_utilizador(username)
+        if user is None:
             # Executar o hasher de password padrão para evitar ataques de timing
             User().set_password(password)
             return None
@@ -32,8 +55,40 @@ class EmailBackend(ModelBackend):
         
         return None
     
+    def procurar_utilizador(self, identifier):
+        """
+        Procurar por email e por username sem distinguir maiúsculas.
+
+        São duas consultas de igualdade sobre lower(email) e lower(username),
+        cada uma servida pelo respetivo índice único; um OR entre as duas
+        obrigaria a percorrer a tabela. Começa pelo campo mais provável.
+        """
+        fields = ('email', 'username') if '@' in identifier else ('username', 'email')
+        for field in fields:
+            queryset = User.objects.alias(lookup=Lower(field)).filter(lookup=identifier.lower())
+            if field == 'email':
+                # O índice de email é parcial (ignora emails vazios)
+                queryset = queryset.exclude(email='')
+            user = queryset.first()
+            if user is not None:
+                return user
+        return None
+    
     def get_user(self, user_id):
-        try:
-            return User.objects.get(pk=user_id)
-        except User.DoesNotExist:
-            return None 
\ No newline at end of file
+        """
+        Utilizador da sessão, guardado na cache quando ela é partilhada
+        (invalidado ao gravar o utilizador e no User.objects...update())
+        """
+        if not cache_utilizadores_ativa():
+            return super().get_user(user_id)
+
+        key = chave_utilizador(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = User.objects.get(pk=user_id)
+            except User.DoesNotExist:
+                return None
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        # Como o ModelBackend: utilizadores desativados deixam de ter sessão
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,15 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import invalidar_utilizador
+
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidar_cache_utilizador(sender, instance, **kwargs):
+    """Remover o utilizador da cache do EmailBackend.get_user"""
+    invalidar_utilizador(instance.pk)
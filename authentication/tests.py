@@ -1,3 +1,35 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from .backends import EmailBackend, cache_utilizadores_ativa
+
+
+User = get_user_model()
+
+
+class GetUserCacheTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='ana', email='ana@example.com', password='teste12345')
+        self.backend = EmailBackend()
+
+    def test_sem_cache_partilhada_le_sempre_da_base_de_dados(self):
+        # As definições de desenvolvimento/testes usam LocMemCache
+        self.assertFalse(cache_utilizadores_ativa())
+        self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    @mock.patch('authentication.backends.cache_utilizadores_ativa', return_value=True)
+    def test_update_em_lote_invalida_a_cache(self, _ativa):
+        self.assertTrue(self.backend.get_user(self.user.pk).is_active)
+        with self.assertNumQueries(0):
+            self.backend.get_user(self.user.pk)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertIsNone(self.backend.get_user(self.user.pk))
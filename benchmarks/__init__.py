@@ -0,0 +1,5 @@
+"""
+Gerador de catálogo sintético e suite de benchmarks.
+
+Usar através dos comandos `generate_benchmark_data` e `run_benchmarks`.
+"""
@@ -0,0 +1,228 @@
+import random
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+
+from cars.models import Brand, CarModel, Car, CarPhoto, Favorite, Review
+from cars.models_chat import ChatRoom, ChatMessage
+
+
+User = get_user_model()
+
+# Prefixo dos utilizadores e matrículas criados pelo gerador
+PREFIXO = 'bench'
+PREFIXO_MATRICULA = 'BZ'
+
+CORES = ['Branco', 'Preto', 'Cinzento', 'Azul', 'Vermelho', 'Prata', 'Verde', 'Bege']
+CIDADES = [
+    ('Lisboa', 'Lisboa'), ('Porto', 'Porto'), ('Braga', 'Braga'), ('Coimbra', 'Coimbra'),
+    ('Faro', 'Faro'), ('Aveiro', 'Aveiro'), ('Setúbal', 'Setúbal'), ('Viseu', 'Viseu'),
+    ('Leiria', 'Leiria'), ('Évora', 'Évora'), ('Sintra', 'Lisboa'), ('Guimarães', 'Braga'),
+]
+COMBUSTIVEIS = ['gasoline'] * 4 + ['diesel'] * 4 + ['hybrid', 'electric', 'plugin_hybrid', 'lpg']
+TRANSMISSOES = ['manual'] * 3 + ['automatic'] * 2 + ['semi_automatic', 'cvt']
+ESTADOS = ['active'] * 8 + ['sold', 'reserved', 'inactive']
+
+
+class CatalogueGenerator:
+    """
+    Gerar um catálogo sintético com bulk_create em blocos.
+
+    Os carros são gerados bloco a bloco e, para cada bloco, as respetivas
+    fotos, favoritos, avaliações, chats e mensagens, por isso a memória
+    usada não depende do número total de carros.
+    """
+
+    def __init__(self, cars=10000, sellers=200, buyers=2000, chunk_size=2000,
+                 photos_per_car=3, favorites_per_car=3, reviews_ratio=0.05,
+                 chats_ratio=0.1, messages_per_chat=8, seed=42, log=None):
+        self.cars = cars
+        self.sellers = sellers
+        self.buyers = buyers
+        self.chunk_size = chunk_size
+        self.photos_per_car = photos_per_car
+        self.favorites_per_car = favorites_per_car
+        self.reviews_ratio = reviews_ratio
+        self.chats_ratio = chats_ratio
+        self.messages_per_chat = messages_per_chat
+        self.random = random.Random(seed)
+        self.log = log or (lambda message: None)
+        self.counts = {}
+
+    def run(self):
+        if not Brand.objects.exists():
+            call_command('populate_brands')
+
+        self.models = list(
+            CarModel.objects.filter(is_active=True).values_list('id', 'brand_id', 'name', 'brand__name', 'start_year')
+        )
+        seller_ids = self._criar_utilizadores('seller', self.sellers)
+        buyer_ids = self._criar_utilizadores('buyer', self.buyers)
+
+        offset = Car.objects.filter(license_plate__startswith=PREFIXO_MATRICULA).count()
+        for start in range(0, self.cars, self.chunk_size):
+            size = min(self.chunk_size, self.cars - start)
+            self._gerar_bloco(offset + start, size, seller_ids, buyer_ids)
+            self.log(f'{start + size}/{self.cars} carros')
+
+        return self.counts
+
+    def _contar(self, name, value):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def _criar_utilizadores(self, user_type, total):
+        # A mesma hash para todos: gerar uma hash por utilizador seria o passo mais lento
+        password = make_password('benchmark')
+        existing = User.objects.filter(username__startswith=f'{PREFIXO}_{user_type}_').count()
+
+        users = [
+            User(
+                username=f'{PREFIXO}_{user_type}_{index}',
+                email=f'{PREFIXO}_{user_type}_{index}@example.com',
+                first_name=user_type.capitalize(),
+                last_name=str(index),
+                user_type=user_type,
+                password=password,
+            )
+            for index in range(existing, total)
+        ]
+        User.objects.bulk_create(users, batch_size=self.chunk_size)
+        self._contar('users', len(users))
+
+        return list(
+            User.objects.filter(username__startswith=f'{PREFIXO}_{user_type}_').values_list('id', flat=True)[:total]
+        )
+
+    def _gerar_bloco(self, offset, size, seller_ids, buyer_ids):
+        rnd = self.random
+        cars = []
+        for index in range(offset, offset + size):
+            model_id, brand_id, model_name, brand_name, start_year = rnd.choice(self.models)
+            year = rnd.randint(max(start_year, 2000), 2024)
+            city, district = rnd.choice(CIDADES)
+            price = Decimal(rnd.randrange(3000, 90000, 50))
+            cars.append(Car(
+                seller_id=rnd.choice(seller_ids),
+                brand_id=brand_id,
+                car_model_id=model_id,
+                year=year,
+                color=rnd.choice(CORES),
+                fuel_type=rnd.choice(COMBUSTIVEIS),
+                transmission=rnd.choice(TRANSMISSOES),
+                engine_size=Decimal(rnd.choice(['1.0', '1.2', '1.4', '1.6', '2.0', '2.5', '3.0'])),
+                power=rnd.randint(70, 400),
+                mileage=max(0, (2025 - year) * rnd.randint(5000, 25000)),
+                doors=rnd.choice([3, 5, 5, 4]),
+                seats=rnd.choice([5, 5, 5, 7, 2]),
+                condition=rnd.choice(['used'] * 6 + ['new', 'certified']),
+                license_plate=f'{PREFIXO_MATRICULA}{index:08d}',
+                price=price,
+                original_price=price + Decimal(rnd.choice([0, 0, 500, 1000, 2500])),
+                negotiable=rnd.random() < 0.6,
+                city=city,
+                district=district,
+                postal_code=f'{rnd.randint(1000, 9999)}-{rnd.randint(100, 999)}',
+                title=f'{brand_name} {model_name} {year}',
+                description=f'{brand_name} {model_name} de {year} em bom estado, revisões em dia.',
+                air_conditioning=rnd.random() < 0.9,
+                gps=rnd.random() < 0.5,
+                bluetooth=rnd.random() < 0.7,
+                parking_sensors=rnd.random() < 0.5,
+                backup_camera=rnd.random() < 0.3,
+                leather_seats=rnd.random() < 0.2,
+                electric_windows=rnd.random() < 0.9,
+                central_locking=rnd.random() < 0.95,
+                abs_brakes=True,
+                airbags=True,
+                status=rnd.choice(ESTADOS),
+                featured=rnd.random() < 0.02,
+                views=min(int(rnd.paretovariate(1.5) * 20), 100000),
+            ))
+
+        favorites = []
+        for car in cars:
+            fans = rnd.sample(buyer_ids, min(len(buyer_ids), rnd.randint(0, self.favorites_per_car * 2)))
+            car.favorites_count = len(fans)
+            favorites.extend(Favorite(user_id=user_id, car_id=car.id) for user_id in fans)
+
+        Car.objects.bulk_create(cars, batch_size=self.chunk_size)
+        self._contar('cars', len(cars))
+
+        photos = []
+        for car in cars:
+            for order in range(rnd.randint(1, self.photos_per_car * 2 - 1)):
+                photos.append(CarPhoto(
+                    car_id=car.id,
+                    photo=f'cars/benchmark/{order % 10}.jpg',
+                    is_main=order == 0,
+                    order=order,
+                ))
+        CarPhoto.objects.bulk_create(photos, batch_size=self.chunk_size)
+        self._contar('photos', len(photos))
+
+        # bulk_create não passa por CarPhoto.save: preencher Car.main_photo
+        by_id = {car.id: car for car in cars}
+        for photo in photos:
+            if photo.is_main:
+                by_id[photo.car_id].main_photo = photo
+        Car.objects.bulk_update(cars, ['main_photo'], batch_size=self.chunk_size)
+
+        Favorite.objects.bulk_create(favorites, batch_size=self.chunk_size, ignore_conflicts=True)
+        self._contar('favorites', len(favorites))
+
+        reviews = [
+            Review(
+                reviewer_id=rnd.choice(buyer_ids),
+                seller_id=car.seller_id,
+                car_id=car.id,
+                rating=rnd.choice([3, 4, 4, 5, 5, 5, 1, 2]),
+                title='Boa experiência',
+                comment='Vendedor atencioso e carro conforme o anúncio.',
+                is_approved=True,
+            )
+            for car in cars if rnd.random() < self.reviews_ratio
+        ]
+        Review.objects.bulk_create(reviews, batch_size=self.chunk_size, ignore_conflicts=True)
+        self._contar('reviews', len(reviews))
+
+        self._gerar_chats([car for car in cars if rnd.random() < self.chats_ratio], buyer_ids)
+
+    def _gerar_chats(self, cars, buyer_ids):
+        rnd = self.random
+        rooms = [
+            ChatRoom(
+                car_id=car.id,
+                buyer_id=rnd.choice(buyer_ids),
+                seller_id=car.seller_id,
+                status=rnd.choice(['active', 'active', 'closed']),
+            )
+            for car in cars
+        ]
+        ChatRoom.objects.bulk_create(rooms, batch_size=self.chunk_size)
+        self._contar('chats', len(rooms))
+
+        messages = []
+        for room in rooms:
+            for index in range(rnd.randint(1, self.messages_per_chat * 2 - 1)):
+                sender_id = room.buyer_id if index % 2 == 0 else room.seller_id
+                messages.append(ChatMessage(
+                    chat_room_id=room.id,
+                    sender_id=sender_id,
+                    content=rnd.choice([
+                        'Olá, o carro ainda está disponível?',
+                        'Sim, está disponível.',
+                        'Aceita retoma?',
+                        'Podemos marcar uma visita para sábado?',
+                        'Qual é o valor final?',
+                    ]),
+                ))
+        ChatMessage.objects.bulk_create(messages, batch_size=self.chunk_size)
+        self._contar('messages', len(messages))
+
+
+def apagar_dados_benchmark():
+    """Remover utilizadores e carros do gerador (em cascata)"""
+    Car.objects.filter(license_plate__startswith=PREFIXO_MATRICULA).delete()
+    User.objects.filter(username__startswith=f'{PREFIXO}_').delete()
@@ -0,0 +1,123 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from .suite import _resumo
+
+
+# O que cada tipo de processo carrega até poder atender o primeiro pedido
+# (o URLconf só é importado no primeiro pedido, mas conta para a latência)
+CARREGAR_URLS = 'from django.urls import get_resolver; get_resolver().url_patterns'
+
+ENTRADAS = {
+    'wsgi': ('import carzone.wsgi; ' + CARREGAR_URLS, {}),
+    'asgi': ('import carzone.asgi; ' + CARREGAR_URLS, {}),
+    'asgi-http': ('import carzone.asgi; ' + CARREGAR_URLS, {'ASGI_WEBSOCKET_ENABLED': 'False'}),
+    'comando': ('import django; django.setup()', {}),
+}
+
+# Linhas do -X importtime: "import time: <self us> | <cumulativo us> | <módulo>"
+LINHA_IMPORTTIME = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)')
+
+
+def _apps_do_projeto():
+    """Pacotes de topo do repositório (carzone, cars, service, ...)"""
+    return {
+        entry.name
+        for entry in os.scandir(settings.BASE_DIR)
+        if entry.is_dir() and os.path.isfile(os.path.join(entry.path, '__init__.py'))
+    }
+
+
+def _grupo(module, projeto):
+    top = module.split('.')[0]
+    if top in projeto:
+        return top
+    if top == 'django':
+        # django.contrib.admin, django.db, django.test, ...
+        parts = module.split('.')
+        return '.'.join(parts[:3] if parts[1:2] == ['contrib'] else parts[:2])
+    return top
+
+
+def correr(nome):
+    """
+    Arrancar um processo novo com -X importtime para a entrada `nome` e
+    devolver (ms de relógio, {módulo: (self_us, cumulativo_us)}).
+    """
+    code, env = ENTRADAS[nome]
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'carzone.settings', **env}
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f'{nome}: o arranque falhou\n{result.stderr[-2000:]}')
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = LINHA_IMPORTTIME.match(line)
+        if match:
+            modules[match.group(3)] = (int(match.group(1)), int(match.group(2)))
+    return elapsed, modules
+
+
+def medir_arranque(nome, repeat=5, top=15):
+    """
+    Perfil de arranque de uma entrada: tempo de relógio dos `repeat`
+    processos, tempo próprio dos imports agrupado por app/pacote e os
+    módulos com maior tempo cumulativo (medianas entre execuções).
+    """
+    projeto = _apps_do_projeto()
+    timings = []
+    por_grupo = defaultdict(list)
+    por_modulo = defaultdict(list)
+
+    for _ in range(repeat):
+        elapsed, modules = correr(nome)
+        timings.append(elapsed)
+        grupos = defaultdict(int)
+        for module, (self_us, cumulative_us) in modules.items():
+            grupos[_grupo(module, projeto)] += self_us
+            por_modulo[module].append(cumulative_us)
+        for grupo, total in grupos.items():
+            por_grupo[grupo].append(total)
+
+    grupos = sorted(
+        ((grupo, statistics.median(values) / 1000) for grupo, values in por_grupo.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    modulos = sorted(
+        ((module, statistics.median(values) / 1000) for module, values in por_modulo.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return {
+        'runs': repeat,
+        **_resumo(timings),
+        'modules': len(por_modulo),
+        'imports_ms': round(sum(total for _, total in grupos), 2),
+        'by_package': {grupo: round(total, 2) for grupo, total in grupos[:top]},
+        'project_apps': {grupo: round(total, 2) for grupo, total in grupos if grupo in projeto},
+        'slowest_modules': {module: round(total, 2) for module, total in modulos[:top]},
+    }
+
+
+def perfil_arranque(entradas=None, repeat=5, top=15):
+    """Relatório de arranque para várias entradas (por omissão, todas)"""
+    return {
+        'python': sys.version.split()[0],
+        'entries': {nome: medir_arranque(nome, repeat, top) for nome in entradas or ENTRADAS},
+    }
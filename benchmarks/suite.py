@@ -0,0 +1,245 @@
+import asyncio
+import platform
+import statistics
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connection, connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from cars.models import Car, Favorite, Review
+from cars.models_chat import ChatRoom, ChatMessage
+from service import car_service
+
+from .generator import PREFIXO
+
+
+# URLconf com as páginas públicas como views síncronas (comparação de débito)
+URLCONF_SINCRONO = 'benchmarks.urls_sync'
+
+
+class QueryCounter:
+    """Contar queries executadas em todas as ligações"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _resumo(timings):
+    timings = sorted(timings)
+    return {
+        'min_ms': round(timings[0], 2),
+        'median_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+        'mean_ms': round(statistics.fmean(timings), 2),
+    }
+
+
+def medir(func, repeat):
+    """Executar `func` uma vez para aquecer e `repeat` vezes medidas"""
+    func()
+    timings = []
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(counter))
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        'runs': repeat,
+        **_resumo(timings),
+        'queries': counter.count // repeat,
+    }
+
+
+def medir_concorrencia(url, concurrency, repeat, **kwargs):
+    """
+    Débito de uma página com `concurrency` pedidos em simultâneo, `repeat`
+    vezes. Os pedidos passam pelo ASGIHandler (o mesmo caminho que o
+    Daphne usa), cada um com o seu contexto de threads; views síncronas
+    ocupam uma thread do adaptador durante todo o pedido.
+    """
+    client = AsyncClient()
+
+    async def pedido():
+        started = time.perf_counter()
+        response = await client.get(url, **kwargs)
+        assert response.status_code == 200, f'{url}: {response.status_code}'
+        return (time.perf_counter() - started) * 1000
+
+    async def rondas():
+        await pedido()
+        timings = []
+        started = time.perf_counter()
+        for _ in range(repeat):
+            timings.extend(await asyncio.gather(*(pedido() for _ in range(concurrency))))
+        return timings, time.perf_counter() - started
+
+    timings, elapsed = async_to_sync(rondas)()
+    return {
+        'runs': len(timings),
+        'concurrency': concurrency,
+        **_resumo(timings),
+        'rps': round(len(timings) / elapsed, 1),
+    }
+
+
+class BenchmarkSuite:
+    """
+    Cronometrar as views e serviços mais usados sobre os dados do gerador.
+
+    As views correm pelo cliente de testes (com todo o middleware), com um
+    vendedor e um comprador do gerador autenticados.
+    """
+
+    def __init__(self, repeat=20, concurrency=None):
+        self.repeat = repeat
+        self.concurrency = concurrency
+
+    def cenarios(self):
+        seller_room = ChatRoom.objects.filter(seller__username__startswith=f'{PREFIXO}_').select_related(
+            'seller', 'buyer'
+        ).first()
+        if seller_room is None:
+            raise RuntimeError('Sem dados de benchmark: correr generate_benchmark_data primeiro')
+
+        seller, buyer = seller_room.seller, seller_room.buyer
+        car = Car.objects.filter(status='active').order_by('-views').first()
+
+        anonymous = Client()
+        seller_client = Client()
+        seller_client.force_login(seller)
+        buyer_client = Client()
+        buyer_client.force_login(buyer)
+        ajax = {'X-Requested-With': 'XMLHttpRequest'}
+
+        def pagina(client, url, **kwargs):
+            def run():
+                response = client.get(url, **kwargs)
+                assert response.status_code == 200, f'{url}: {response.status_code}'
+            return run
+
+        cenarios = {
+            'service.pesquisar_cars': lambda: list(car_service.pesquisar_cars()[:12]),
+            'service.obter_estatisticas_vendedor': lambda: car_service.obter_estatisticas_vendedor(seller),
+            'view.home': pagina(anonymous, reverse('home')),
+            'view.cars': pagina(anonymous, reverse('cars')),
+            'view.cars_pagina_5': pagina(anonymous, reverse('cars'), data={'page': 5}),
+            'view.dashboard_home': pagina(seller_client, reverse('dashboard:home')),
+            'view.my_chats': pagina(buyer_client, reverse('chat:my_chats')),
+            'view.get_chat_status': pagina(buyer_client, reverse('chat:get_status'), headers=ajax),
+            'view.recent_messages_api': pagina(buyer_client, reverse('chat:recent_messages_api'), headers=ajax),
+        }
+        # Sem carros ativos (ex.: todos vendidos) não há página de detalhe a medir
+        if car is not None:
+            cenarios['service.pesquisar_cars_filtros'] = lambda: list(
+                car_service.pesquisar_cars(search_query=car.car_model.name, city=car.city, max_price=car.price)[:12]
+            )
+            cenarios['view.car_detail'] = pagina(anonymous, reverse('car_detail', args=[car.id]))
+        return cenarios
+
+    def cenarios_concorrentes(self):
+        """
+        Páginas públicas medidas em débito (ver medir_concorrencia): 'asgi.*'
+        com as views assíncronas e 'asgi_sync.*' com as mesmas views
+        servidas como síncronas (benchmarks.urls_sync), na mesma execução.
+        """
+        car = Car.objects.filter(status='active').order_by('-views').first()
+        paginas = {
+            'home': (reverse('home'), {}),
+            'cars': (reverse('cars'), {}),
+            'cars_pagina_5': (reverse('cars'), {'data': {'page': 5}}),
+        }
+        if car is not None:
+            paginas['car_detail'] = (reverse('car_detail', args=[car.id]), {})
+
+        cenarios = {}
+        for prefix, urlconf in (('asgi', None), ('asgi_sync', URLCONF_SINCRONO)):
+            for name, (url, kwargs) in paginas.items():
+                cenarios[f'{prefix}.{name}'] = (url, kwargs, urlconf)
+        return cenarios
+
+    def run(self, only=None):
+        results = {}
+        with override_settings(ALLOWED_HOSTS=['*']):
+            for name, func in self.cenarios().items():
+                if only and not any(pattern in name for pattern in only):
+                    continue
+                results[name] = medir(func, self.repeat)
+
+            if self.concurrency:
+                for name, (url, kwargs, urlconf) in self.cenarios_concorrentes().items():
+                    if only and not any(pattern in name for pattern in only):
+                        continue
+                    with override_settings(ROOT_URLCONF=urlconf or settings.ROOT_URLCONF):
+                        results[name] = medir_concorrencia(url, self.concurrency, self.repeat, **kwargs)
+
+        return {
+            'generated_at': timezone.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'database': connection.vendor,
+            },
+            'dataset': {
+                'cars': Car.objects.count(),
+                'favorites': Favorite.objects.count(),
+                'reviews': Review.objects.count(),
+                'chats': ChatRoom.objects.count(),
+                'messages': ChatMessage.objects.count(),
+            },
+            'results': results,
+            'async_vs_sync': comparar_sincrono(results),
+        }
+
+
+def comparar_sincrono(results):
+    """Variação (%) do débito das views assíncronas face às síncronas da mesma execução"""
+    diff = {}
+    for name, result in results.items():
+        if not name.startswith('asgi.'):
+            continue
+        sync = results.get('asgi_sync.' + name.removeprefix('asgi.'))
+        if not sync or not sync['rps']:
+            continue
+        diff[name.removeprefix('asgi.')] = {
+            'rps': result['rps'],
+            'sync_rps': sync['rps'],
+            'rps_change_pct': round((result['rps'] - sync['rps']) / sync['rps'] * 100, 1),
+            'median_ms': result['median_ms'],
+            'sync_median_ms': sync['median_ms'],
+        }
+    return diff
+
+
+def comparar(report, baseline):
+    """Variação (%) da mediana, das queries e do débito face a um relatório anterior"""
+    diff = {}
+    for name, result in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        diff[name] = {
+            'median_ms': result['median_ms'],
+            'baseline_median_ms': previous['median_ms'],
+            'change_pct': round((result['median_ms'] - previous['median_ms']) / previous['median_ms'] * 100, 1)
+            if previous['median_ms'] else None,
+            'queries': result.get('queries'),
+            'baseline_queries': previous.get('queries'),
+        }
+        if result.get('rps') and previous.get('rps'):
+            diff[name]['rps'] = result['rps']
+            diff[name]['baseline_rps'] = previous['rps']
+            diff[name]['rps_change_pct'] = round((result['rps'] - previous['rps']) / previous['rps'] * 100, 1)
+    return diff
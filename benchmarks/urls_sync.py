@@ -0,0 +1,28 @@
+"""
+URLconf dos benchmarks com as páginas públicas servidas como views
+síncronas, para comparar o débito com as views assíncronas na mesma
+execução (ver BenchmarkSuite.cenarios_concorrentes).
+"""
+from asgiref.sync import async_to_sync
+from django.urls import include, path
+
+from pages import views
+
+
+def sincrona(view):
+    """
+    Versão síncrona de uma view assíncrona: sob ASGI o Django corre-a na
+    thread do adaptador durante todo o pedido, como as views antigas.
+    """
+    def sync_view(request, *args, **kwargs):
+        return async_to_sync(view)(request, *args, **kwargs)
+    return sync_view
+
+
+urlpatterns = [
+    path('', sincrona(views.home), name='home'),
+    path('cars', sincrona(views.cars), name='cars'),
+    path('carro/<uuid:car_id>/', sincrona(views.car_detail), name='car_detail'),
+    # Restantes URLs (reverse nos templates)
+    path('', include('carzone.urls')),
+]
@@ -1,6 +1,8 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.translation import gettext_lazy as _
 from django.utils.html import format_html
+from .admin_mixins import FastAdminMixin
 from .models import (
     Brand, CarModel, Car, CarPhoto, Favorite, Review, 
     Message, CarComparison, PriceHistory, CarAlert
@@ -16,9 +18,13 @@ class BrandAdmin(admin.ModelAdmin):
     search_fields = ('name', 'country')
     readonly_fields = ('created_at', 'updated_at')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(models_total=Count('models'))
+    
     def total_models(self, obj):
-        return obj.models.count()
+        return obj.models_total
     total_models.short_description = 'Total de Modelos'
+    total_models.admin_order_field = 'models_total'
 
 
 @admin.register(CarModel)
@@ -28,6 +34,7 @@ class CarModelAdmin(admin.ModelAdmin):
     """
     list_display = ('brand', 'name', 'body_type', 'generation', 'start_year', 'end_year', 'is_active')
     list_filter = ('brand', 'body_type', 'is_active', 'start_year')
+    list_select_related = ('brand',)
     search_fields = ('name', 'brand__name', 'generation')
     readonly_fields = ('created_at', 'updated_at')
     
@@ -64,7 +71,7 @@ class CarPhotoInline(admin.TabularInline):
 
 
 @admin.register(Car)
-class CarAdmin(admin.ModelAdmin):
+class CarAdmin(FastAdminMixin, admin.ModelAdmin):
     """
     Admin para Car
     """
@@ -72,11 +79,16 @@ class CarAdmin(admin.ModelAdmin):
         'title', 'brand', 'car_model', 'year', 'price', 'mileage', 
         'fuel_type', 'status', 'featured', 'views', 'created_at'
     )
+    # Sem year/city: esses filtros fazem SELECT DISTINCT sobre a tabela inteira
+    # (continuam a funcionar pelo URL, ex.: ?city=Lisboa)
     list_filter = (
         'status', 'featured', 'brand', 'fuel_type', 'transmission', 
-        'condition', 'year', 'city', 'created_at'
+        'condition', 'created_at'
     )
-    search_fields = ('title', 'brand__name', 'car_model__name', 'license_plate', 'seller__username')
+    list_select_related = ('brand', 'car_model', 'seller')
+    raw_id_fields = ('seller', 'car_model')
+    search_fields = ('title', 'license_plate')
+    search_help_text = 'Pesquisa no título e na matrícula'
     readonly_fields = ('id', 'views', 'favorites_count', 'created_at', 'updated_at')
     inlines = [CarPhotoInline]
     
@@ -116,9 +128,6 @@ class CarAdmin(admin.ModelAdmin):
             'fields': ('id', 'created_at', 'updated_at')
         }),
     )
-    
-    def get_queryset(self, request):
-        return super().get_queryset(request).select_related('brand', 'car_model', 'seller')
 
 
 @admin.register(CarPhoto)
@@ -128,6 +137,8 @@ class CarPhotoAdmin(admin.ModelAdmin):
     """
     list_display = ('car', 'caption', 'is_main', 'order', 'photo_preview', 'created_at')
     list_filter = ('is_main', 'created_at')
+    list_select_related = ('car__brand', 'car__car_model')
+    raw_id_fields = ('car',)
     search_fields = ('car__title', 'caption')
     readonly_fields = ('photo_preview', 'created_at')
     
@@ -145,6 +156,8 @@ class FavoriteAdmin(admin.ModelAdmin):
     """
     list_display = ('user', 'car', 'created_at')
     list_filter = ('created_at',)
+    list_select_related = ('user', 'car__brand', 'car__car_model')
+    raw_id_fields = ('user', 'car')
     search_fields = ('user__username', 'car__title', 'car__brand__name')
     readonly_fields = ('created_at',)
 
@@ -156,6 +169,8 @@ class ReviewAdmin(admin.ModelAdmin):
     """
     list_display = ('reviewer', 'seller', 'car', 'rating', 'is_verified_purchase', 'is_approved', 'created_at')
     list_filter = ('rating', 'is_verified_purchase', 'is_approved', 'created_at')
+    list_select_related = ('reviewer', 'seller', 'car__brand', 'car__car_model')
+    raw_id_fields = ('reviewer', 'seller', 'car')
     search_fields = ('reviewer__username', 'seller__username', 'title', 'comment')
     readonly_fields = ('created_at', 'updated_at')
     
@@ -182,6 +197,8 @@ class MessageAdmin(admin.ModelAdmin):
     """
     list_display = ('sender', 'recipient', 'car', 'subject', 'is_read', 'created_at')
     list_filter = ('is_read', 'created_at')
+    list_select_related = ('sender', 'recipient', 'car__brand', 'car__car_model')
+    raw_id_fields = ('sender', 'recipient', 'car')
     search_fields = ('sender__username', 'recipient__username', 'subject', 'car__title')
     readonly_fields = ('created_at', 'read_at')
     
@@ -207,22 +224,29 @@ class CarComparisonAdmin(admin.ModelAdmin):
     Admin para CarComparison
     """
     list_display = ('user', 'name', 'total_cars', 'created_at')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'name')
     readonly_fields = ('created_at', 'updated_at')
-    filter_horizontal = ('cars',)
+    raw_id_fields = ('user', 'cars')
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(cars_total=Count('cars'))
     
     def total_cars(self, obj):
-        return obj.cars.count()
+        return obj.cars_total
     total_cars.short_description = 'Total de Carros'
+    total_cars.admin_order_field = 'cars_total'
 
 
 @admin.register(PriceHistory)
-class PriceHistoryAdmin(admin.ModelAdmin):
+class PriceHistoryAdmin(FastAdminMixin, admin.ModelAdmin):
     """
     Admin para PriceHistory
     """
     list_display = ('car', 'old_price', 'new_price', 'price_change', 'created_at')
     list_filter = ('created_at',)
+    list_select_related = ('car__brand', 'car__car_model')
+    raw_id_fields = ('car',)
     search_fields = ('car__title', 'car__brand__name')
     readonly_fields = ('created_at',)
     
@@ -243,6 +267,8 @@ class CarAlertAdmin(admin.ModelAdmin):
     """
     list_display = ('user', 'name', 'is_active', 'email_notifications', 'last_notification', 'created_at')
     list_filter = ('is_active', 'email_notifications', 'created_at')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
     search_fields = ('user__username', 'name')
     readonly_fields = ('created_at', 'updated_at')
     filter_horizontal = ('brands', 'car_models')
@@ -274,7 +300,9 @@ from .models_purchase import PurchaseRequest, Purchase, PurchaseStatusHistory, N
 @admin.register(PurchaseRequest)
 class PurchaseRequestAdmin(admin.ModelAdmin):
     list_display = ('buyer_name', 'car', 'seller', 'status', 'proposed_price', 'created_at')
-    list_filter = ('status', 'created_at', 'seller')
+    list_filter = ('status', 'created_at', ('seller', admin.RelatedOnlyFieldListFilter))
+    list_select_related = ('car__brand', 'car__car_model', 'seller')
+    raw_id_fields = ('car', 'buyer', 'seller')
     search_fields = ('buyer_name', 'buyer_email', 'car__title', 'seller__username')
     readonly_fields = ('created_at', 'updated_at')
     
@@ -301,7 +329,9 @@ class PurchaseRequestAdmin(admin.ModelAdmin):
 @admin.register(Purchase)
 class PurchaseAdmin(admin.ModelAdmin):
     list_display = ('buyer_name', 'car', 'seller', 'purchase_price', 'status', 'payment_status', 'created_at')
-    list_filter = ('status', 'payment_status', 'created_at', 'seller')
+    list_filter = ('status', 'payment_status', 'created_at', ('seller', admin.RelatedOnlyFieldListFilter))
+    list_select_related = ('car__brand', 'car__car_model', 'seller')
+    raw_id_fields = ('car', 'buyer', 'seller')
     search_fields = ('buyer_name', 'buyer_email', 'car__title', 'seller__username', 'transaction_id')
     readonly_fields = ('created_at', 'updated_at', 'payment_confirmed_at', 'delivered_at', 'completed_at')
     
@@ -335,15 +365,20 @@ class PurchaseAdmin(admin.ModelAdmin):
 class PurchaseStatusHistoryAdmin(admin.ModelAdmin):
     list_display = ('purchase', 'previous_status', 'new_status', 'changed_by', 'created_at')
     list_filter = ('previous_status', 'new_status', 'created_at')
+    list_select_related = ('purchase__car', 'changed_by')
+    raw_id_fields = ('purchase', 'changed_by')
     search_fields = ('purchase__buyer_name', 'purchase__car__title', 'changed_by__username')
     readonly_fields = ('created_at',)
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(FastAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'user', 'type', 'is_read', 'created_at')
     list_filter = ('type', 'is_read', 'created_at')
-    search_fields = ('title', 'message', 'user__username')
+    list_select_related = ('user',)
+    raw_id_fields = ('user', 'purchase_request', 'purchase', 'car')
+    search_fields = ('title', 'message')
+    search_help_text = 'Pesquisa no título e na mensagem'
     readonly_fields = ('created_at', 'read_at')
     
     fieldsets = (
@@ -368,6 +403,8 @@ from .models_chat import ChatRoom, ChatMessage, ChatNotification
 class ChatRoomAdmin(admin.ModelAdmin):
     list_display = ('car', 'buyer', 'seller', 'status', 'created_at', 'last_activity')
     list_filter = ('status', 'created_at', 'last_activity')
+    list_select_related = ('car__brand', 'car__car_model', 'buyer', 'seller')
+    raw_id_fields = ('car', 'buyer', 'seller', 'closed_by')
     search_fields = ('car__title', 'buyer__username', 'seller__username')
     readonly_fields = ('created_at', 'last_activity')
     
@@ -386,10 +423,13 @@ class ChatRoomAdmin(admin.ModelAdmin):
 
 
 @admin.register(ChatMessage)
-class ChatMessageAdmin(admin.ModelAdmin):
+class ChatMessageAdmin(FastAdminMixin, admin.ModelAdmin):
     list_display = ('chat_room', 'sender', 'message_type', 'content_preview', 'created_at', 'is_deleted')
     list_filter = ('message_type', 'is_deleted', 'created_at')
-    search_fields = ('content', 'sender__username', 'chat_room__car__title')
+    list_select_related = ('chat_room__car', 'chat_room__buyer', 'chat_room__seller', 'sender')
+    raw_id_fields = ('chat_room', 'sender')
+    search_fields = ('content',)
+    search_help_text = 'Pesquisa no conteúdo da mensagem'
     readonly_fields = ('created_at', 'edited_at')
     
     def content_preview(self, obj):
@@ -413,6 +453,8 @@ class ChatMessageAdmin(admin.ModelAdmin):
 class ChatNotificationAdmin(admin.ModelAdmin):
     list_display = ('recipient', 'notification_type', 'title', 'is_read', 'created_at')
     list_filter = ('notification_type', 'is_read', 'created_at')
+    list_select_related = ('recipient',)
+    raw_id_fields = ('recipient', 'chat_room', 'message')
     search_fields = ('title', 'content', 'recipient__username')
     readonly_fields = ('created_at', 'read_at')
     
@@ -0,0 +1,51 @@
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+
+def estimar_contagem(queryset):
+    """
+    Número de linhas estimado pelo planeador do PostgreSQL (EXPLAIN), sem
+    percorrer a tabela. Retorna None noutras bases de dados.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    try:
+        plan = json.loads(queryset.order_by().explain(format='json'))
+    except (DatabaseError, ValueError):
+        return None
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginador que usa a estimativa do planeador quando ela passa de
+    ADMIN_ESTIMATED_COUNT_THRESHOLD; abaixo disso faz o COUNT(*) normal,
+    que nessas tabelas é barato e exato.
+    """
+
+    @cached_property
+    def count(self):
+        threshold = settings.ADMIN_ESTIMATED_COUNT_THRESHOLD
+        if threshold:
+            estimate = estimar_contagem(self.object_list)
+            if estimate is not None and estimate >= threshold:
+                return estimate
+        return super().count
+
+
+class FastAdminMixin:
+    """
+    Modo rápido para changelists de tabelas grandes: sem o segundo
+    COUNT(*) da tabela inteira e com contagem estimada na paginação.
+
+    As classes que o usam declaram `list_select_related`, `raw_id_fields`
+    para as FKs e pesquisam apenas colunas com índice trigram (ver
+    Meta.indexes dos modelos).
+    """
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    list_per_page = 50
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CarsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cars'
+
+    def ready(self):
+        # Registar os receivers dos eventos de preço
+        from . import signals  # noqa: F401
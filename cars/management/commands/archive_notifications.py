@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from service.archive_service import arquivar_notificacoes, arquivar_chats
+
+
+class Command(BaseCommand):
+    help = 'Move notificações lidas e mensagens de chats fechados antigos para as tabelas de arquivo'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Idade mínima (dias) das notificações lidas (por omissão NOTIFICATION_ARCHIVE_DAYS)',
+        )
+        parser.add_argument(
+            '--chat-days',
+            type=int,
+            help='Dias desde o fecho de uma sala de chat (por omissão CHAT_ARCHIVE_DAYS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Número de linhas movidas por transação',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        notifications, chat_notifications = arquivar_notificacoes(options['days'], batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Arquivadas {notifications} notificações e {chat_notifications} notificações de chat'
+            )
+        )
+
+        rooms, messages = arquivar_chats(options['chat_days'], batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(f'Arquivadas {messages} mensagens de {rooms} chats fechados')
+        )
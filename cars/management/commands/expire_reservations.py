@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from service.reservation_service import expirar_reservas, reservas_expiradas
+
+
+class Command(BaseCommand):
+    help = 'Cancela compras por pagar cujo prazo expirou e volta a disponibilizar os carros'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Mostra quantas reservas seriam expiradas sem as alterar',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Número de compras expiradas por transação',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Repetir a cada N segundos (0 corre uma única vez)',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(
+                self.style.SUCCESS(f'Encontradas {reservas_expiradas().count()} reservas expiradas')
+            )
+            return
+
+        interval = options['interval']
+        while True:
+            expired = expirar_reservas(batch_size=options['batch_size'])
+            self.stdout.write(
+                self.style.SUCCESS(f'Expiradas {expired} reservas por pagar')
+            )
+            if not interval:
+                break
+            # Processo de longa duração: não segurar ligações entre execuções
+            close_old_connections()
+            time.sleep(interval)
@@ -0,0 +1,74 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from service.export_service import exportar, EXPORTACOES, EXPORT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Exporta carros, vendas ou histórico de preços em CSV ou JSON Lines (em streaming)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(EXPORTACOES), help='Dados a exportar')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv', help='Formato de saída')
+        parser.add_argument('--output', help='Ficheiro de saída (por omissão, stdout)')
+        parser.add_argument('--seller', help='Exportar apenas os dados deste vendedor (username)')
+        parser.add_argument(
+            '--filter',
+            action='append',
+            default=[],
+            metavar='CAMPO=VALOR',
+            help='Filtro no formato do admin, ex.: status__exact=active (repetível)',
+        )
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Linhas lidas por bloco')
+
+    def handle(self, *args, **options):
+        seller = None
+        if options['seller']:
+            User = get_user_model()
+            try:
+                seller = User.objects.get(username=options['seller'])
+            except User.DoesNotExist:
+                raise CommandError(f'Vendedor não encontrado: {options["seller"]}')
+
+        filtros = {}
+        for item in options['filter']:
+            key, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f'Filtro inválido (esperado CAMPO=VALOR): {item}')
+            filtros[key] = value
+
+        try:
+            chunks = exportar(
+                options['dataset'],
+                options['format'],
+                filtros,
+                seller=seller,
+                chunk_size=options['chunk_size'],
+                replica=True,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        except ValidationError as e:
+            raise CommandError('; '.join(e.messages))
+
+        if options['output']:
+            output = open(options['output'], 'w', encoding='utf-8', newline='')
+        else:
+            output = sys.stdout
+
+        rows = 0
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+                rows += 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+        if options['output']:
+            if options['format'] == 'csv':
+                rows -= 1
+            self.stdout.write(self.style.SUCCESS(f'{rows} linhas exportadas para {options["output"]}'))
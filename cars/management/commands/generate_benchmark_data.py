@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks.generator import CatalogueGenerator, apagar_dados_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Gera um catálogo sintético (utilizadores, carros, fotos, favoritos, avaliações e chats) para benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cars', type=int, default=10000, help='Número de carros a criar')
+        parser.add_argument('--sellers', type=int, default=200, help='Número de vendedores')
+        parser.add_argument('--buyers', type=int, default=2000, help='Número de compradores')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Carros por bloco de bulk_create')
+        parser.add_argument('--photos-per-car', type=int, default=3, help='Média de fotos por carro')
+        parser.add_argument('--favorites-per-car', type=int, default=3, help='Média de favoritos por carro')
+        parser.add_argument('--chats-ratio', type=float, default=0.1, help='Fração de carros com chat')
+        parser.add_argument('--messages-per-chat', type=int, default=8, help='Média de mensagens por chat')
+        parser.add_argument('--seed', type=int, default=42, help='Semente aleatória (dados reproduzíveis)')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Apagar os dados gerados anteriormente antes de gerar',
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            self.stdout.write('A apagar dados de benchmark anteriores...')
+            apagar_dados_benchmark()
+
+        generator = CatalogueGenerator(
+            cars=options['cars'],
+            sellers=options['sellers'],
+            buyers=options['buyers'],
+            chunk_size=options['chunk_size'],
+            photos_per_car=options['photos_per_car'],
+            favorites_per_car=options['favorites_per_car'],
+            chats_ratio=options['chats_ratio'],
+            messages_per_chat=options['messages_per_chat'],
+            seed=options['seed'],
+            log=self.stdout.write,
+        )
+        counts = generator.run()
+
+        summary = ', '.join(f'{value} {name}' for name, value in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Concluído! Criados: {summary}'))
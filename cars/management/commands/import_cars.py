@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from service.import_service import ler_linhas, importar_carros, IMPORT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Importa (ou atualiza pela matrícula) o inventário de um vendedor a partir de CSV ou JSON Lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Ficheiro a importar')
+        parser.add_argument('--seller', required=True, help='Username do vendedor')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='Formato do ficheiro (por omissão, deduzido da extensão)',
+        )
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Carros por lote')
+        parser.add_argument('--errors', help='Gravar os erros por linha neste ficheiro JSON')
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Feed completo: ignorar linhas sem alterações e desativar os carros que deixaram de constar',
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            seller = User.objects.get(username=options['seller'])
+        except User.DoesNotExist:
+            raise CommandError(f'Vendedor não encontrado: {options["seller"]}')
+
+        path = Path(options['path'])
+        formato = options['format'] or ('csv' if path.suffix.lower() == '.csv' else 'jsonl')
+
+        with path.open('r', encoding='utf-8-sig', newline='') as stream:
+            report = importar_carros(
+                ler_linhas(stream, formato),
+                seller,
+                batch_size=options['batch_size'],
+                sync=options['sync'],
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{report.total} linhas: {report.created} criados, {report.updated} atualizados, '
+                f'{report.unchanged} sem alterações, {report.deactivated} desativados, '
+                f'{len(report.errors)} com erros'
+            )
+        )
+
+        if options['errors']:
+            with open(options['errors'], 'w', encoding='utf-8') as errors_file:
+                json.dump(report.errors, errors_file, indent=2, ensure_ascii=False)
+        else:
+            for error in report.errors[:20]:
+                self.stdout.write(self.style.ERROR(
+                    f'  Linha {error["line"]} ({error["license_plate"]}): {error["error"]}'
+                ))
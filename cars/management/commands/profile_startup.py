@@ -0,0 +1,31 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.startup import ENTRADAS, perfil_arranque
+
+
+class Command(BaseCommand):
+    help = 'Mede o arranque a frio (WSGI, ASGI, comandos) com -X importtime e agrupa o tempo dos imports por app'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entry',
+            nargs='*',
+            choices=sorted(ENTRADAS),
+            help='Entradas a medir (por omissão, todas)',
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Processos arrancados por entrada')
+        parser.add_argument('--top', type=int, default=15, help='Pacotes e módulos mais lentos a listar')
+        parser.add_argument('--output', help='Gravar o relatório neste ficheiro (por omissão, stdout)')
+
+    def handle(self, *args, **options):
+        report = perfil_arranque(options['entry'], repeat=options['repeat'], top=options['top'])
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output_file:
+                output_file.write(output)
+            self.stdout.write(self.style.SUCCESS(f'Relatório gravado em {options["output"]}'))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from service.notification_service import limpar_notificacoes
+
+
+class Command(BaseCommand):
+    help = 'Apaga notificações (gerais e de chat) fora do prazo de retenção'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--read-days',
+            type=int,
+            help='Dias a manter notificações lidas (por omissão NOTIFICATION_RETENTION_DAYS)',
+        )
+        parser.add_argument(
+            '--unread-days',
+            type=int,
+            help='Dias a manter notificações por ler (por omissão NOTIFICATION_UNREAD_RETENTION_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        deleted = limpar_notificacoes(
+            read_days=options['read_days'],
+            unread_days=options['unread_days']
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Apagadas {deleted} notificações antigas')
+        )
@@ -0,0 +1,35 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.suite import BenchmarkSuite, comparar
+
+
+class Command(BaseCommand):
+    help = 'Cronometra as views e serviços principais e produz um relatório JSON comparável'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Execuções medidas por cenário')
+        parser.add_argument('--only', nargs='*', help='Correr apenas cenários cujo nome contenha estes textos')
+        parser.add_argument('--output', help='Gravar o relatório neste ficheiro (por omissão, stdout)')
+        parser.add_argument('--baseline', help='Relatório anterior para comparar as medianas')
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Medir também o débito das páginas públicas sob ASGI com N pedidos simultâneos (views assíncronas e síncronas)',
+        )
+
+    def handle(self, *args, **options):
+        report = BenchmarkSuite(repeat=options['repeat'], concurrency=options['concurrency']).run(only=options['only'])
+
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as baseline_file:
+                report['comparison'] = comparar(report, json.load(baseline_file))
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output_file:
+                output_file.write(output)
+            self.stdout.write(self.style.SUCCESS(f'Relatório gravado em {options["output"]}'))
+        else:
+            self.stdout.write(output)
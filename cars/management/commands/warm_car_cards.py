@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from service.card_cache_service import aquecer_cards
+
+
+class Command(BaseCommand):
+    help = 'Preenche a cache dos cartões de carros da página inicial e das primeiras páginas da listagem'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=120,
+            help='Número de anúncios mais recentes a renderizar',
+        )
+
+    def handle(self, *args, **options):
+        pages = aquecer_cards(options['limit'])
+        self.stdout.write(self.style.SUCCESS(f'Renderizadas {pages} páginas com cartões de carros'))
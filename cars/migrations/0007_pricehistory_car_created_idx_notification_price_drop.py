@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0006_remove_old_unique_constraint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pricehistory',
+            index=models.Index(fields=['car', 'created_at'], name='cars_pricehist_car_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('purchase_request', 'Solicitação de Compra'), ('purchase_created', 'Nova Compra'), ('status_changed', 'Status Alterado'), ('payment_confirmed', 'Pagamento Confirmado'), ('delivery_confirmed', 'Entrega Confirmada'), ('price_drop', 'Descida de Preço')], max_length=20),
+        ),
+    ]
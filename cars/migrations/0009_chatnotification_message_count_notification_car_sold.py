@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0008_purchase_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatnotification',
+            name='message_count',
+            field=models.PositiveIntegerField(default=1, verbose_name='Número de Mensagens'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('purchase_request', 'Solicitação de Compra'), ('purchase_created', 'Nova Compra'), ('status_changed', 'Status Alterado'), ('payment_confirmed', 'Pagamento Confirmado'), ('delivery_confirmed', 'Entrega Confirmada'), ('price_drop', 'Descida de Preço'), ('car_sold', 'Carro Vendido')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:05
+
+import cars.models_chat
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0009_chatnotification_message_count_notification_car_sold'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('type', models.CharField(max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('purchase_request_id', models.UUIDField(blank=True, null=True)),
+                ('purchase_id', models.UUIDField(blank=True, null=True)),
+                ('car_id', models.UUIDField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Notificação Arquivada',
+                'verbose_name_plural': 'Notificações Arquivadas',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='cars_notifi_user_id_bb8993_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ChatNotificationArchive',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('chat_room_id', models.UUIDField()),
+                ('notification_type', models.CharField(max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('content', models.TextField()),
+                ('message_count', models.PositiveIntegerField(default=1)),
+                ('created_at', models.DateTimeField()),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_chat_notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Notificação de Chat Arquivada',
+                'verbose_name_plural': 'Notificações de Chat Arquivadas',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['recipient', '-created_at'], name='cars_chatno_recipie_1a863d_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ChatMessageArchive',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('message_type', models.CharField(max_length=20, verbose_name='Tipo de Mensagem')),
+                ('content', models.TextField(verbose_name='Conteúdo')),
+                ('attachment', models.FileField(blank=True, null=True, upload_to='chat_attachments/', verbose_name='Anexo')),
+                ('attachment_name', models.CharField(blank=True, max_length=255, null=True, verbose_name='Nome do Anexo')),
+                ('created_at', models.DateTimeField(verbose_name='Enviado em')),
+                ('is_edited', models.BooleanField(default=False, verbose_name='Foi editado')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('chat_room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_messages', to='cars.chatroom', verbose_name='Sala de Chat')),
+                ('sender', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Remetente')),
+            ],
+            options={
+                'verbose_name': 'Mensagem de Chat Arquivada',
+                'verbose_name_plural': 'Mensagens de Chat Arquivadas',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['chat_room', 'created_at'], name='cars_chatme_chat_ro_acc79b_idx')],
+            },
+            bases=(cars.models_chat.ChatAttachmentMixin, models.Model),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at'], name='cars_notifi_user_id_8826e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatnotification',
+            index=models.Index(fields=['recipient', '-created_at'], name='cars_chatno_recipie_3adf50_idx'),
+        ),
+    ]
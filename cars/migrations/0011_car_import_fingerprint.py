@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0010_notification_archive_tables'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='car',
+            name='import_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+    ]
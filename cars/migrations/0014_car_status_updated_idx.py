@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0013_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['status', '-updated_at'], name='cars_car_status_b3af7d_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-19 20:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def preencher_foto_principal(apps, schema_editor):
+    Car = apps.get_model('cars', 'Car')
+    CarPhoto = apps.get_model('cars', 'CarPhoto')
+
+    main_photos = CarPhoto.objects.filter(car=OuterRef('pk'), is_main=True).order_by('order', 'created_at')
+    Car.objects.filter(photos__is_main=True).update(main_photo=Subquery(main_photos.values('pk')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0014_car_status_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='car',
+            name='main_photo',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='cars.carphoto', verbose_name='Foto Principal'),
+        ),
+        migrations.RunPython(preencher_foto_principal, migrations.RunPython.noop),
+    ]
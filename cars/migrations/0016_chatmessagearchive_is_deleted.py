@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 20:40
+
+from django.db import migrations, models
+
+
+def marcar_apagadas(apps, schema_editor):
+    # Copiar o estado das mensagens que ainda existem na tabela ativa (ex.: um
+    # arquivo interrompido). Nas restantes o soft delete já tinha substituído o
+    # conteúdo, por isso ficarem visíveis não expõe o texto original.
+    ChatMessage = apps.get_model('cars', 'ChatMessage')
+    ChatMessageArchive = apps.get_model('cars', 'ChatMessageArchive')
+    ChatMessageArchive.objects.filter(
+        id__in=ChatMessage.objects.filter(is_deleted=True).values('id')
+    ).update(is_deleted=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0015_car_main_photo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatmessagearchive',
+            name='is_deleted',
+            field=models.BooleanField(default=False, verbose_name='Foi apagado'),
+        ),
+        migrations.RunPython(marcar_apagadas, migrations.RunPython.noop),
+    ]
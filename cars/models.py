@@ -1,4 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import DEFERRED, F
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -7,6 +10,8 @@ import uuid
 from datetime import datetime, timedelta
 from django.utils import timezone
 
+from .signals import price_changed
+
 User = get_user_model()
 
 class Brand(models.Model):
@@ -26,6 +31,9 @@ class Brand(models.Model):
         verbose_name = 'Marca'
         verbose_name_plural = 'Marcas'
         ordering = ['name']
+        indexes = [
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='cars_brand_name_trgm_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -63,11 +71,21 @@ class CarModel(models.Model):
         verbose_name_plural = 'Modelos de Carros'
         unique_together = ['brand', 'name', 'generation']
         ordering = ['brand__name', 'name']
+        indexes = [
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='cars_carmodel_name_trgm_idx'),
+        ]
 
     def __str__(self):
         return f"{self.brand.name} {self.name}"
 
 
+class CarQuerySet(models.QuerySet):
+
+    def com_foto_principal(self):
+        """Trazer a foto principal no mesmo SELECT (ver Car.get_main_photo)"""
+        return self.select_related('main_photo')
+
+
 class Car(models.Model):
     """
     Modelo principal para carros
@@ -265,6 +283,22 @@ class Car(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    
+    # Hash dos dados da última importação (sincronização incremental de feeds)
+    import_fingerprint = models.CharField(max_length=64, blank=True, null=True, editable=False)
+    
+    # Cópia da foto com is_main=True, mantida por CarPhoto.save
+    main_photo = models.ForeignKey(
+        'CarPhoto',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        editable=False,
+        related_name='+',
+        verbose_name='Foto Principal'
+    )
+
+    objects = CarQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Carro'
@@ -278,11 +312,67 @@ class Car(models.Model):
             models.Index(fields=['fuel_type']),
             models.Index(fields=['city', 'district']),
             models.Index(fields=['featured', '-created_at']),
+            models.Index(fields=['-created_at']),
+            # Última alteração dos carros ativos (versão das páginas públicas)
+            models.Index(fields=['status', '-updated_at']),
+            # icontains (UPPER(col) LIKE ...) e pesquisa aproximada com pg_trgm
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='cars_car_title_trgm_idx'),
+            GinIndex(OpClass(Upper('license_plate'), name='gin_trgm_ops'), name='cars_car_plate_trgm_idx'),
+            GinIndex(OpClass(Upper('city'), name='gin_trgm_ops'), name='cars_car_city_trgm_idx'),
         ]
 
     def __str__(self):
         return f"{self.brand.name} {self.car_model.name} {self.year} - €{self.price:,.2f}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Guardar o preço carregado para detetar alterações sem SELECT extra
+        if 'price' in field_names:
+            loaded_price = values[list(field_names).index('price')]
+            if loaded_price is not DEFERRED:
+                instance._loaded_price = loaded_price
+        return instance
+
+    def save(self, *args, **kwargs):
+        old_price = getattr(self, '_loaded_price', None)
+        update_fields = kwargs.get('update_fields')
+        new_price = Decimal(str(self.price)) if self.price is not None else None
+
+        price_changed_now = (
+            old_price is not None
+            and new_price is not None
+            and not self._state.adding
+            and (update_fields is None or 'price' in update_fields)
+            and new_price != old_price
+        )
+
+        super().save(*args, **kwargs)
+
+        if price_changed_now:
+            self._record_price_change(old_price, new_price)
+        # Um save(update_fields=[...]) sem o preço deixa o valor antigo na base de dados
+        if new_price is not None and (update_fields is None or 'price' in update_fields):
+            self._loaded_price = new_price
+
+    def _record_price_change(self, old_price, new_price, reason=None):
+        """Regista a alteração no histórico e emite o evento após o commit"""
+        PriceHistory.objects.create(
+            car=self,
+            old_price=old_price,
+            new_price=new_price,
+            change_reason=reason
+        )
+        transaction.on_commit(
+            lambda: price_changed.send(
+                sender=Car,
+                car=self,
+                old_price=old_price,
+                new_price=new_price
+            ),
+            using=self._state.db
+        )
+
     def is_available(self):
         return self.status == 'active'
     
@@ -295,8 +385,14 @@ class Car(models.Model):
         self.save(update_fields=['views'])
     
     def get_main_photo(self):
-        """Retorna a foto principal do carro"""
-        return self.photos.filter(is_main=True).first()
+        """
+        Retorna a foto principal do carro sem nova query quando as fotos
+        foram carregadas com prefetch_related('photos') ou a foto com
+        com_foto_principal()
+        """
+        if 'photos' in getattr(self, '_prefetched_objects_cache', {}):
+            return next((photo for photo in self.photos.all() if photo.is_main), None)
+        return self.main_photo if self.main_photo_id else None
     
     def get_price_per_year(self):
         """Calcula preço por ano de uso"""
@@ -350,6 +446,12 @@ class CarPhoto(models.Model):
         if self.is_main:
             CarPhoto.objects.filter(car=self.car, is_main=True).update(is_main=False)
         super().save(*args, **kwargs)
+        
+        # Manter Car.main_photo (a remoção da foto fica com o SET_NULL)
+        if self.is_main:
+            Car.objects.filter(pk=self.car_id).update(main_photo=self)
+        else:
+            Car.objects.filter(pk=self.car_id, main_photo=self).update(main_photo=None)
 
 
 class Favorite(models.Model):
@@ -382,17 +484,19 @@ class Favorite(models.Model):
         return f"{self.user.username} favoritou {self.car}"
     
     def save(self, *args, **kwargs):
+        adding = self._state.adding
         super().save(*args, **kwargs)
-        # Atualizar contador de favoritos do carro
-        self.car.favorites_count = self.car.favorited_by.count()
-        self.car.save(update_fields=['favorites_count'])
+        # Atualizar contador de favoritos do carro sem recontar
+        if adding:
+            Car.objects.filter(pk=self.car_id).update(favorites_count=F('favorites_count') + 1)
     
     def delete(self, *args, **kwargs):
-        car = self.car
-        super().delete(*args, **kwargs)
-        # Atualizar contador de favoritos do carro
-        car.favorites_count = car.favorited_by.count()
-        car.save(update_fields=['favorites_count'])
+        result = super().delete(*args, **kwargs)
+        # Atualizar contador de favoritos do carro sem recontar
+        Car.objects.filter(pk=self.car_id, favorites_count__gt=0).update(
+            favorites_count=F('favorites_count') - 1
+        )
+        return result
 
 
 # Modelos de compra serão definidos no final deste arquivo
@@ -592,6 +696,9 @@ class PriceHistory(models.Model):
         verbose_name = 'Histórico de Preços'
         verbose_name_plural = 'Histórico de Preços'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['car', 'created_at'], name='cars_pricehist_car_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.car} - €{self.old_price} → €{self.new_price}"
@@ -709,8 +816,14 @@ class CarAlert(models.Model):
         return f"Alerta de {self.user.username}: {self.name}"
 
 
+# O Django só importa cars.models no arranque: os modelos dos outros módulos
+# têm de ser importados aqui para ficarem registados na app (não são lazy)
+
 # Importar modelos de compra
 from .models_purchase import PurchaseRequest, Purchase, PurchaseStatusHistory, Notification
 
 # Importar modelos de chat
 from .models_chat import ChatRoom, ChatMessage, ChatNotification
+
+# Importar modelos de arquivo
+from .models_archive import NotificationArchive, ChatNotificationArchive, ChatMessageArchive
@@ -0,0 +1,99 @@
+from django.db import models
+from django.contrib.auth import get_user_model
+
+from cars.models_chat import ChatRoom, ChatAttachmentMixin
+
+User = get_user_model()
+
+
+class NotificationArchive(models.Model):
+    """
+    Notificações lidas e antigas, retiradas da tabela ativa.
+
+    Formato compacto: só o utilizador é chave estrangeira (consulta por
+    utilizador e remoção em cascata); as referências a pedidos, compras e
+    carros ficam como UUIDs simples, sem índices.
+    """
+    id = models.UUIDField(primary_key=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications')
+    type = models.CharField(max_length=20)
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+
+    purchase_request_id = models.UUIDField(null=True, blank=True)
+    purchase_id = models.UUIDField(null=True, blank=True)
+    car_id = models.UUIDField(null=True, blank=True)
+
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Notificação Arquivada'
+        verbose_name_plural = 'Notificações Arquivadas'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} (arquivada)"
+
+
+class ChatNotificationArchive(models.Model):
+    """
+    Notificações de chat lidas e antigas, retiradas da tabela ativa
+    """
+    id = models.UUIDField(primary_key=True, editable=False)
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_chat_notifications')
+    chat_room_id = models.UUIDField()
+    notification_type = models.CharField(max_length=20)
+    title = models.CharField(max_length=200)
+    content = models.TextField()
+    message_count = models.PositiveIntegerField(default=1)
+
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Notificação de Chat Arquivada'
+        verbose_name_plural = 'Notificações de Chat Arquivadas'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} (arquivada)"
+
+
+class ChatMessageArchive(ChatAttachmentMixin, models.Model):
+    """
+    Mensagens de salas fechadas há muito tempo (sala com status 'archived')
+    """
+    id = models.UUIDField(primary_key=True, editable=False)
+    chat_room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='archived_messages', verbose_name='Sala de Chat')
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', verbose_name='Remetente')
+
+    message_type = models.CharField(max_length=20, verbose_name='Tipo de Mensagem')
+    content = models.TextField(verbose_name='Conteúdo')
+    attachment = models.FileField(upload_to='chat_attachments/', null=True, blank=True, verbose_name='Anexo')
+    attachment_name = models.CharField(max_length=255, null=True, blank=True, verbose_name='Nome do Anexo')
+
+    created_at = models.DateTimeField(verbose_name='Enviado em')
+    is_edited = models.BooleanField(default=False, verbose_name='Foi editado')
+    # Mensagens apagadas pelo utilizador continuam ocultas depois de arquivadas
+    is_deleted = models.BooleanField(default=False, verbose_name='Foi apagado')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Mensagem de Chat Arquivada'
+        verbose_name_plural = 'Mensagens de Chat Arquivadas'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['chat_room', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.content[:50]}... (arquivada)"
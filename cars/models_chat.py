@@ -1,5 +1,7 @@
 import uuid
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from cars.models import Car
@@ -96,6 +98,12 @@ class ChatRoom(models.Model):
         elif user == self.seller:
             self.seller_last_read = now
         self.save(update_fields=['buyer_last_read', 'seller_last_read'])
+        # A notificação agregada de mensagens fica lida com a sala
+        self.notifications.filter(
+            recipient=user,
+            notification_type='new_message',
+            is_read=False
+        ).update(is_read=True, read_at=now)
 
     def close_chat(self, user, auto_closed=False):
         """Fechar o chat"""
@@ -158,7 +166,62 @@ class ChatRoom(models.Model):
         return None
 
 
-class ChatMessage(models.Model):
+class ChatAttachmentMixin:
+    """
+    Métodos de apresentação de anexos partilhados pelas mensagens
+    ativas e arquivadas
+    """
+
+    def get_file_size_formatted(self):
+        """Retorna o tamanho do arquivo formatado"""
+        if self.attachment:
+            size = self.attachment.size
+            if size < 1024:
+                return f"{size} B"
+            elif size < 1024 * 1024:
+                return f"{size / 1024:.1f} KB"
+            elif size < 1024 * 1024 * 1024:
+                return f"{size / (1024 * 1024):.1f} MB"
+            else:
+                return f"{size / (1024 * 1024 * 1024):.1f} GB"
+        return ""
+    
+    def get_file_icon(self):
+        """Retorna o ícone apropriado para o tipo de arquivo"""
+        if not self.attachment:
+            return "fas fa-file"
+        
+        file_name = self.attachment_name or self.attachment.name
+        extension = file_name.split('.')[-1].lower() if '.' in file_name else ''
+        
+        icon_map = {
+            # Imagens
+            'jpg': 'fas fa-image', 'jpeg': 'fas fa-image', 'png': 'fas fa-image',
+            'gif': 'fas fa-image', 'bmp': 'fas fa-image', 'svg': 'fas fa-image',
+            # Documentos
+            'pdf': 'fas fa-file-pdf', 'doc': 'fas fa-file-word', 'docx': 'fas fa-file-word',
+            'xls': 'fas fa-file-excel', 'xlsx': 'fas fa-file-excel',
+            'ppt': 'fas fa-file-powerpoint', 'pptx': 'fas fa-file-powerpoint',
+            # Áudio/Vídeo
+            'mp3': 'fas fa-file-audio', 'wav': 'fas fa-file-audio', 'ogg': 'fas fa-file-audio',
+            'mp4': 'fas fa-file-video', 'avi': 'fas fa-file-video', 'mov': 'fas fa-file-video',
+            # Arquivos
+            'zip': 'fas fa-file-archive', 'rar': 'fas fa-file-archive', '7z': 'fas fa-file-archive',
+            'txt': 'fas fa-file-alt', 'rtf': 'fas fa-file-alt',
+        }
+        
+        return icon_map.get(extension, 'fas fa-file')
+    
+    def is_image(self):
+        """Verifica se o anexo é uma imagem"""
+        if not self.attachment:
+            return False
+        file_name = self.attachment_name or self.attachment.name
+        extension = file_name.split('.')[-1].lower() if '.' in file_name else ''
+        return extension in ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'svg', 'webp']
+
+
+class ChatMessage(ChatAttachmentMixin, models.Model):
     """
     Mensagem individual dentro de uma sala de chat
     """
@@ -194,6 +257,7 @@ class ChatMessage(models.Model):
             models.Index(fields=['chat_room', 'created_at']),
             models.Index(fields=['sender', 'created_at']),
             models.Index(fields=['-created_at']),
+            GinIndex(OpClass(Upper('content'), name='gin_trgm_ops'), name='cars_chatmsg_content_trgm_idx'),
         ]
 
     def __str__(self):
@@ -211,54 +275,6 @@ class ChatMessage(models.Model):
         self.content = "[Mensagem apagada]"
         self.save(update_fields=['is_deleted', 'content'])
     
-    def get_file_size_formatted(self):
-        """Retorna o tamanho do arquivo formatado"""
-        if self.attachment:
-            size = self.attachment.size
-            if size < 1024:
-                return f"{size} B"
-            elif size < 1024 * 1024:
-                return f"{size / 1024:.1f} KB"
-            elif size < 1024 * 1024 * 1024:
-                return f"{size / (1024 * 1024):.1f} MB"
-            else:
-                return f"{size / (1024 * 1024 * 1024):.1f} GB"
-        return ""
-    
-    def get_file_icon(self):
-        """Retorna o ícone apropriado para o tipo de arquivo"""
-        if not self.attachment:
-            return "fas fa-file"
-        
-        file_name = self.attachment_name or self.attachment.name
-        extension = file_name.split('.')[-1].lower() if '.' in file_name else ''
-        
-        icon_map = {
-            # Imagens
-            'jpg': 'fas fa-image', 'jpeg': 'fas fa-image', 'png': 'fas fa-image',
-            'gif': 'fas fa-image', 'bmp': 'fas fa-image', 'svg': 'fas fa-image',
-            # Documentos
-            'pdf': 'fas fa-file-pdf', 'doc': 'fas fa-file-word', 'docx': 'fas fa-file-word',
-            'xls': 'fas fa-file-excel', 'xlsx': 'fas fa-file-excel',
-            'ppt': 'fas fa-file-powerpoint', 'pptx': 'fas fa-file-powerpoint',
-            # Áudio/Vídeo
-            'mp3': 'fas fa-file-audio', 'wav': 'fas fa-file-audio', 'ogg': 'fas fa-file-audio',
-            'mp4': 'fas fa-file-video', 'avi': 'fas fa-file-video', 'mov': 'fas fa-file-video',
-            # Arquivos
-            'zip': 'fas fa-file-archive', 'rar': 'fas fa-file-archive', '7z': 'fas fa-file-archive',
-            'txt': 'fas fa-file-alt', 'rtf': 'fas fa-file-alt',
-        }
-        
-        return icon_map.get(extension, 'fas fa-file')
-    
-    def is_image(self):
-        """Verifica se o anexo é uma imagem"""
-        if not self.attachment:
-            return False
-        file_name = self.attachment_name or self.attachment.name
-        extension = file_name.split('.')[-1].lower() if '.' in file_name else ''
-        return extension in ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'svg', 'webp']
-
     def edit_message(self, new_content):
         """Editar mensagem"""
         self.content = new_content
@@ -286,6 +302,8 @@ class ChatNotification(models.Model):
     notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES, verbose_name='Tipo de Notificação')
     title = models.CharField(max_length=200, verbose_name='Título')
     content = models.TextField(verbose_name='Conteúdo')
+    # Mensagens agregadas numa notificação 'new_message' ainda por ler
+    message_count = models.PositiveIntegerField(default=1, verbose_name='Número de Mensagens')
     
     is_read = models.BooleanField(default=False, verbose_name='Foi lida')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Criada em')
@@ -297,6 +315,7 @@ class ChatNotification(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['recipient', 'is_read']),
+            models.Index(fields=['recipient', '-created_at']),
             models.Index(fields=['-created_at']),
         ]
 
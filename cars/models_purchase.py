@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.utils import timezone
 from cars.models import Car
 import uuid
 
@@ -117,6 +120,9 @@ class Purchase(models.Model):
     # Tracking
     tracking_code = models.CharField(max_length=100, blank=True, verbose_name='Código de Rastreamento')
     
+    # Chave enviada pelo formulário para ignorar submissões repetidas
+    idempotency_key = models.CharField(max_length=64, blank=True, null=True, editable=False, verbose_name='Chave de Idempotência')
+    
     class Meta:
         verbose_name = 'Compra'
         verbose_name_plural = 'Compras'
@@ -127,6 +133,12 @@ class Purchase(models.Model):
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['payment_status', '-created_at']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['buyer', 'idempotency_key'],
+                name='unique_purchase_idempotency_key'
+            )
+        ]
     
     def __str__(self):
         return f"Compra de {self.buyer_name} - {self.car.title}"
@@ -170,6 +182,8 @@ class Notification(models.Model):
         ('status_changed', 'Status Alterado'),
         ('payment_confirmed', 'Pagamento Confirmado'),
         ('delivery_confirmed', 'Entrega Confirmada'),
+        ('price_drop', 'Descida de Preço'),
+        ('car_sold', 'Carro Vendido'),
     ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -194,14 +208,26 @@ class Notification(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'is_read', '-created_at']),
+            models.Index(fields=['user', '-created_at']),
             models.Index(fields=['type', '-created_at']),
+            models.Index(fields=['-created_at']),
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='cars_notif_title_trgm_idx'),
+            GinIndex(OpClass(Upper('message'), name='gin_trgm_ops'), name='cars_notif_message_trgm_idx'),
         ]
     
     def __str__(self):
         return f"{self.title} - {self.user.username}"
     
     def mark_as_read(self):
+        from service.notification_service import ajustar_contadores
+
         if not self.is_read:
             self.is_read = True
-            self.read_at = models.timezone.now()
-            self.save(update_fields=['is_read', 'read_at'])
+            self.read_at = timezone.now()
+            # UPDATE condicional: só desconta se este pedido a marcou como lida
+            updated = Notification.objects.filter(pk=self.pk, is_read=False).update(
+                is_read=True,
+                read_at=self.read_at
+            )
+            if updated:
+                ajustar_contadores([self.user_id], -1)
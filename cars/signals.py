@@ -0,0 +1,107 @@
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+
+# Enviado após o commit sempre que o preço de um carro muda.
+# Argumentos: car, old_price, new_price
+price_changed = Signal()
+
+# Enviado após o commit apenas quando o preço desce.
+# Argumentos: car, old_price, new_price
+price_dropped = Signal()
+
+
+@receiver(price_changed)
+def emitir_descida_de_preco(sender, car, old_price, new_price, **kwargs):
+    """Converter alterações de preço em eventos de descida"""
+    if new_price < old_price:
+        price_dropped.send(sender=sender, car=car, old_price=old_price, new_price=new_price)
+
+
+@receiver(price_dropped)
+def notificar_favoritos_descida_preco(sender, car, old_price, new_price, **kwargs):
+    """Notificar os utilizadores que têm o carro nos favoritos"""
+    from service.notification_service import notificar_favoritos
+
+    if car.status != 'active':
+        return
+
+    notificar_favoritos(
+        car,
+        'price_drop',
+        title=f'Descida de preço: {car.title}',
+        message=f'O preço baixou de €{old_price} para €{new_price}.'
+    )
+
+
+@receiver(price_dropped)
+def notificar_alertas_descida_preco(sender, car, old_price, new_price, **kwargs):
+    """Notificar alertas ativos cujos critérios passam a incluir o carro"""
+    from cars.models import CarAlert
+    from service.notification_service import notificar_utilizadores
+
+    if car.status != 'active':
+        return
+
+    alerts = CarAlert.objects.filter(
+        is_active=True
+    ).filter(
+        Q(min_price__isnull=True) | Q(min_price__lte=new_price),
+        Q(max_price__isnull=True) | Q(max_price__gte=new_price),
+        Q(min_year__isnull=True) | Q(min_year__lte=car.year),
+        Q(max_year__isnull=True) | Q(max_year__gte=car.year),
+        Q(max_mileage__isnull=True) | Q(max_mileage__gte=car.mileage),
+        Q(brands__isnull=True) | Q(brands=car.brand_id),
+        Q(car_models__isnull=True) | Q(car_models=car.car_model_id),
+    ).exclude(
+        user_id=car.seller_id
+    ).exclude(
+        # Quem tem o carro nos favoritos já foi notificado
+        user__favorites__car_id=car.pk
+    ).distinct().only('id', 'user_id', 'fuel_types', 'cities')
+
+    matched_ids = []
+    notified_users = set()
+    for alert in alerts:
+        if alert.fuel_types:
+            fuel_types = [f.strip() for f in alert.fuel_types.split(',') if f.strip()]
+            if fuel_types and car.fuel_type not in fuel_types:
+                continue
+        if alert.cities:
+            cities = [c.strip().lower() for c in alert.cities.split(',') if c.strip()]
+            if cities and car.city.lower() not in cities:
+                continue
+        matched_ids.append(alert.id)
+        notified_users.add(alert.user_id)
+
+    if not matched_ids:
+        return
+
+    notificar_utilizadores(
+        notified_users,
+        'price_drop',
+        title=f'Alerta de preço: {car.title}',
+        message=f'Um carro que corresponde aos seus alertas baixou para €{new_price}.',
+        car_id=car.pk
+    )
+    CarAlert.objects.filter(id__in=matched_ids).update(last_notification=timezone.now())
+
+
+@receiver(post_save, sender='cars.Favorite')
+@receiver(post_delete, sender='cars.Favorite')
+def invalidar_cache_favorito(sender, instance, **kwargs):
+    """Manter a cache de favoritos coerente com escritas feitas pelo ORM"""
+    from service.favorite_service import invalidar_favorito
+
+    invalidar_favorito(instance.user_id, instance.car_id)
+
+
+@receiver(post_save, sender='cars.CarPhoto')
+@receiver(post_delete, sender='cars.CarPhoto')
+def tocar_carro_da_foto(sender, instance, **kwargs):
+    """As fotos fazem parte dos cartões e das páginas em cache do carro"""
+    from service.card_cache_service import tocar_carro
+
+    tocar_carro(instance.car_id)
@@ -0,0 +1,50 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+
+from service.card_cache_service import chave_card
+
+
+register = template.Library()
+
+
+class CarCardNode(template.Node):
+    def __init__(self, nodelist, car, variante):
+        self.nodelist = nodelist
+        self.car = car
+        self.variante = variante
+
+    def render(self, context):
+        car = self.car.resolve(context)
+        timeout = settings.CAR_CARD_CACHE_TIMEOUT
+        if car is None or not timeout:
+            return self.nodelist.render(context)
+
+        key = chave_card(car, self.variante.resolve(context))
+        html = cache.get(key)
+        if html is None:
+            html = self.nodelist.render(context)
+            cache.set(key, html, timeout)
+        return html
+
+
+@register.tag('cachecard')
+def do_cachecard(parser, token):
+    """
+    Guardar em cache o HTML de um cartão de carro:
+
+        {% load car_cards %}
+        {% cachecard car "listagem" %} ... {% endcachecard %}
+
+    A chave inclui o id e o updated_at do carro (ver chave_card), por isso o
+    conteúdo do bloco só pode depender do carro: favoritos, visualizações
+    e datas relativas ficam fora dele. A variante distingue os vários
+    layouts de cartão.
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' recebe o carro e a variante do cartão")
+
+    nodelist = parser.parse(('endcachecard',))
+    parser.delete_first_token()
+    return CarCardNode(nodelist, parser.compile_filter(bits[1]), parser.compile_filter(bits[2]))
@@ -0,0 +1,44 @@
+import itertools
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+
+from .models import Brand, CarModel, Car
+
+
+_sequencia = itertools.count(1)
+
+
+def criar_utilizador(user_type='buyer', **kwargs):
+    """Utilizador de testes com username e email únicos"""
+    index = next(_sequencia)
+    kwargs.setdefault('username', f'{user_type}_{index}')
+    kwargs.setdefault('email', f'{kwargs["username"]}@example.com')
+    return get_user_model().objects.create_user(password='teste12345', user_type=user_type, **kwargs)
+
+
+def criar_carro(seller=None, brand=None, **kwargs):
+    """Carro ativo com os campos obrigatórios preenchidos (kwargs sobrepõem-se)"""
+    index = next(_sequencia)
+    seller = seller or criar_utilizador('seller')
+    brand = brand or Brand.objects.get_or_create(name='Marca Teste')[0]
+    car_model = kwargs.pop('car_model', None) or CarModel.objects.get_or_create(
+        brand=brand, name='Modelo Teste', defaults={'body_type': 'hatchback', 'start_year': 2010}
+    )[0]
+
+    valores = {
+        'year': 2018,
+        'color': 'Preto',
+        'fuel_type': 'diesel',
+        'transmission': 'manual',
+        'mileage': 90000,
+        'license_plate': f'TS{index:06d}',
+        'price': Decimal('12500.00'),
+        'city': 'Lisboa',
+        'district': 'Lisboa',
+        'title': f'Carro de teste {index}',
+        'description': 'Carro de teste.',
+        'status': 'active',
+    }
+    valores.update(kwargs)
+    return Car.objects.create(seller=seller, brand=brand, car_model=car_model, **valores)
@@ -1,3 +1,295 @@
+import io
+import json
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+
+from cars.models import Brand, CarModel, Car, Favorite, PriceHistory
+from cars.models_purchase import Purchase, PurchaseStatusHistory, Notification
+from cars.signals import price_changed
+from cars.testing import criar_carro, criar_utilizador
+from service.favorite_service import alternar_favorito, eh_favorito, versao_favoritos
+from service.import_service import importar_carros, ler_linhas
+from service.notification_service import contar_por_ler, criar_notificacao, limpar_notificacoes
+from service.purchase_service import CarroIndisponivel, efetuar_compra
+from service.reservation_service import expirar_reservas
+
+
+def linha(license_plate, **kwargs):
+    row = {
+        'brand': 'Marca Teste',
+        'model': 'Modelo Teste',
+        'license_plate': license_plate,
+        'year': '2019',
+        'color': 'Branco',
+        'fuel_type': 'diesel',
+        'transmission': 'manual',
+        'mileage': '50000',
+        'price': '15000',
+        'city': 'Porto',
+        'district': 'Porto',
+    }
+    row.update(kwargs)
+    return row
+
+
+class ImportarCarrosSyncTests(TestCase):
+
+    def setUp(self):
+        brand = Brand.objects.create(name='Marca Teste')
+        CarModel.objects.create(brand=brand, name='Modelo Teste', body_type='sedan', start_year=2010)
+        self.seller = criar_utilizador('seller')
+        importar_carros(enumerate([linha('AA-00-01'), linha('AA-00-02')], start=2), self.seller)
+
+    def test_linha_invalida_nao_desativa_o_anuncio(self):
+        rows = [linha('AA-00-01'), linha('aa-00-02', brand='Marca Tesste')]
+
+        report = importar_carros(enumerate(rows, start=2), self.seller, sync=True)
+
+        self.assertEqual(len(report.errors), 1)
+        self.assertEqual(report.deactivated, 0)
+        self.assertEqual(Car.objects.get(license_plate='AA-00-02').status, 'active')
+
+    def test_ausente_e_desativado_e_volta_quando_a_linha_muda(self):
+        report = importar_carros(enumerate([linha('AA-00-01')], start=2), self.seller, sync=True)
+        self.assertEqual(report.deactivated, 1)
+        self.assertEqual(Car.objects.get(license_plate='AA-00-02').status, 'inactive')
+
+        # A mesma linha de antes não reativa; com alterações volta a ser publicada
+        rows = [linha('AA-00-01'), linha('AA-00-02')]
+        importar_carros(enumerate(rows, start=2), self.seller, sync=True)
+        self.assertEqual(Car.objects.get(license_plate='AA-00-02').status, 'inactive')
+
+        rows = [linha('AA-00-01'), linha('AA-00-02', price='14500')]
+        report = importar_carros(enumerate(rows, start=2), self.seller, sync=True)
+        self.assertEqual(report.updated, 1)
+        self.assertEqual(Car.objects.get(license_plate='AA-00-02').status, 'active')
+
+
+class ImportarJsonLinesTests(TestCase):
+
+    def setUp(self):
+        brand = Brand.objects.create(name='Marca Teste')
+        CarModel.objects.create(brand=brand, name='Modelo Teste', body_type='sedan', start_year=2010)
+        self.seller = criar_utilizador('seller')
+
+    def ficheiro(self, *lines):
+        return io.BytesIO('\n'.join(lines).encode())
+
+    def test_linhas_ilegiveis_ficam_no_relatorio(self):
+        stream = self.ficheiro(
+            json.dumps(linha('BB-00-01')),
+            '{"license_plate": "BB-00-02",',
+            '[1, 2, 3]',
+            json.dumps(linha('BB-00-03')),
+        )
+
+        report = importar_carros(ler_linhas(stream, 'jsonl'), self.seller)
+
+        self.assertEqual(report.total, 4)
+        self.assertEqual(report.created, 2)
+        self.assertEqual([error['line'] for error in report.errors], [2, 3])
+
+    def test_csv_malformado_fica_no_relatorio(self):
+        importar_carros(enumerate([linha('CC-00-01')], start=2), self.seller)
+        # Um campo acima do limite do módulo csv lança csv.Error
+        stream = io.BytesIO(b'brand,model,license_plate\nMarca Teste,Modelo Teste,' + b'x' * 200000 + b'\n')
+
+        report = importar_carros(ler_linhas(stream, 'csv'), self.seller, sync=True)
+
+        self.assertEqual(len(report.errors), 1)
+        self.assertEqual(report.deactivated, 0)
+
+    def test_sync_com_linhas_ilegiveis_nao_desativa(self):
+        importar_carros(enumerate([linha('BB-00-01'), linha('BB-00-02')], start=2), self.seller)
+        stream = self.ficheiro(json.dumps(linha('BB-00-01')), 'nao e json')
+
+        report = importar_carros(ler_linhas(stream, 'jsonl'), self.seller, sync=True)
+
+        self.assertEqual(report.deactivated, 0)
+        self.assertEqual(Car.objects.get(license_plate='BB-00-02').status, 'active')
+
+
+class HistoricoPrecoTests(TestCase):
+
+    def setUp(self):
+        self.car = Car.objects.get(pk=criar_carro(price=Decimal('12500.00')).pk)
+        self.eventos = []
+        price_changed.connect(self.registar)
+        self.addCleanup(price_changed.disconnect, self.registar)
+
+    def registar(self, sender, car, old_price, new_price, **kwargs):
+        self.eventos.append((old_price, new_price))
+
+    def test_alteracao_de_preco_fica_no_historico_e_emite_evento(self):
+        self.car.price = Decimal('11900.00')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.car.save()
+
+        history = PriceHistory.objects.get(car=self.car)
+        self.assertEqual((history.old_price, history.new_price), (Decimal('12500.00'), Decimal('11900.00')))
+        self.assertEqual(self.eventos, [(Decimal('12500.00'), Decimal('11900.00'))])
+
+    def test_gravar_sem_alterar_o_preco_nao_regista_nada(self):
+        self.car.color = 'Azul'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.car.save()
+
+        self.assertFalse(PriceHistory.objects.filter(car=self.car).exists())
+        self.assertEqual(self.eventos, [])
+
+    def test_update_fields_sem_preco_nao_perde_a_alteracao(self):
+        self.car.price = Decimal('11000.00')
+        # Grava só as visualizações: o preço na base de dados continua o antigo
+        self.car.increment_views()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.car.save(update_fields=['price'])
+
+        history = PriceHistory.objects.get(car=self.car)
+        self.assertEqual((history.old_price, history.new_price), (Decimal('12500.00'), Decimal('11000.00')))
+        self.assertEqual(len(self.eventos), 1)
+
+
+def nova_compra(buyer):
+    """Compra por gravar, como sai de form.save(commit=False)"""
+    return Purchase(
+        buyer_name=buyer.username,
+        buyer_email=buyer.email,
+        buyer_phone='912345678',
+        buyer_address='Rua de Teste, 1',
+        buyer_city='Lisboa',
+        buyer_postal_code='1000-001',
+    )
+
+
+class AlternarFavoritoTests(TestCase):
+
+    def setUp(self):
+        self.car = criar_carro()
+        self.user = criar_utilizador('buyer')
+
+    def test_adiciona_e_remove_atualizando_o_contador(self):
+        self.assertEqual(alternar_favorito(self.user, self.car.id), (True, 1))
+        self.assertTrue(Favorite.objects.filter(user=self.user, car=self.car).exists())
+
+        self.assertEqual(alternar_favorito(self.user, self.car.id), (False, 0))
+        self.assertFalse(Favorite.objects.filter(user=self.user, car=self.car).exists())
+        self.car.refresh_from_db()
+        self.assertEqual(self.car.favorites_count, 0)
+
+    def test_sem_cache_partilhada_le_da_base_de_dados(self):
+        # Testes usam LocMemCache: um toggle noutro worker tem de ser visível aqui
+        versao = versao_favoritos(self.user)
+        alternar_favorito(self.user, self.car.id)
+        self.assertTrue(eh_favorito(self.user, self.car.id))
+        self.assertNotEqual(versao_favoritos(self.user), versao)
+
+        Favorite.objects.filter(user=self.user, car=self.car).delete()
+
+        self.assertFalse(eh_favorito(self.user, self.car.id))
+
+    def test_carro_inexistente(self):
+        self.assertIsNone(alternar_favorito(self.user, uuid.uuid4()))
+        self.assertFalse(Favorite.objects.filter(user=self.user).exists())
+
+
+class EfetuarCompraTests(TestCase):
+
+    def setUp(self):
+        self.car = criar_carro()
+        self.buyer = criar_utilizador('buyer')
+
+    def test_reserva_o_carro(self):
+        purchase, criada = efetuar_compra(self.car.id, self.buyer, nova_compra(self.buyer))
+
+        self.assertTrue(criada)
+        self.assertEqual(purchase.seller, self.car.seller)
+        self.assertEqual(purchase.purchase_price, self.car.price)
+        self.car.refresh_from_db()
+        self.assertEqual(self.car.status, 'reserved')
+        self.assertTrue(PurchaseStatusHistory.objects.filter(purchase=purchase).exists())
+
+    def test_segundo_comprador_nao_consegue_comprar(self):
+        efetuar_compra(self.car.id, self.buyer, nova_compra(self.buyer))
+        outro = criar_utilizador('buyer')
+
+        with self.assertRaises(CarroIndisponivel):
+            efetuar_compra(self.car.id, outro, nova_compra(outro))
+        self.assertEqual(Purchase.objects.filter(car=self.car).count(), 1)
+
+    def test_submissao_repetida_devolve_a_mesma_compra(self):
+        purchase, _ = efetuar_compra(self.car.id, self.buyer, nova_compra(self.buyer), idempotency_key='abc')
+
+        repetida, criada = efetuar_compra(self.car.id, self.buyer, nova_compra(self.buyer), idempotency_key='abc')
+
+        self.assertFalse(criada)
+        self.assertEqual(repetida, purchase)
+        self.assertEqual(Purchase.objects.filter(car=self.car).count(), 1)
+
+
+class ExpirarReservasTests(TestCase):
+
+    def setUp(self):
+        self.car = criar_carro()
+        self.buyer = criar_utilizador('buyer')
+        self.purchase, _ = efetuar_compra(self.car.id, self.buyer, nova_compra(self.buyer))
+
+    def test_reserva_antiga_e_cancelada_e_o_carro_volta_a_venda(self):
+        Purchase.objects.filter(pk=self.purchase.pk).update(created_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(expirar_reservas(), 1)
+
+        self.purchase.refresh_from_db()
+        self.car.refresh_from_db()
+        self.assertEqual(self.purchase.status, 'cancelled')
+        self.assertEqual(self.car.status, 'active')
+        self.assertTrue(
+            PurchaseStatusHistory.objects.filter(purchase=self.purchase, new_status='cancelled').exists()
+        )
+        self.assertEqual(
+            set(Notification.objects.filter(purchase=self.purchase).values_list('user_id', flat=True)),
+            {self.buyer.pk, self.car.seller_id},
+        )
+
+    def test_reserva_dentro_do_prazo_nao_expira(self):
+        self.assertEqual(expirar_reservas(), 0)
+
+        self.car.refresh_from_db()
+        self.assertEqual(self.car.status, 'reserved')
+
+
+class ContadorNotificacoesTests(TestCase):
+
+    def setUp(self):
+        self.user = criar_utilizador('buyer')
+        self.notification = criar_notificacao(self.user, 'status_changed', 'Estado', 'Mudou.')
+
+    def test_sem_cache_partilhada_conta_na_base_de_dados(self):
+        self.assertEqual(contar_por_ler(self.user.pk), 1)
+
+        # Como se outro worker a tivesse marcado como lida
+        Notification.objects.filter(pk=self.notification.pk).update(is_read=True)
+
+        self.assertEqual(contar_por_ler(self.user.pk), 0)
+
+    @mock.patch('service.notification_service.cache_partilhada', return_value=True)
+    def test_limpeza_de_por_ler_invalida_o_contador(self, _partilhada):
+        self.assertEqual(contar_por_ler(self.user.pk), 1)
+        Notification.objects.filter(pk=self.notification.pk).update(
+            created_at=timezone.now() - timedelta(days=400)
+        )
+
+        limpar_notificacoes()
+
+        self.assertEqual(contar_por_ler(self.user.pk), 0)
+
+    def test_zero_dias_nao_volta_ao_prazo_por_omissao(self):
+        Notification.objects.filter(pk=self.notification.pk).update(is_read=True)
+
+        limpar_notificacoes(read_days=0)
 
-# Create your tests here.
+        self.assertFalse(Notification.objects.filter(pk=self.notification.pk).exists())
@@ -0,0 +1,104 @@
+# Ficheiros CSS/JS carregados por página. Os templates declaram o que usam
+# com {% bundle_css %} / {% bundle_js %} (pages.templatetags.bundles) nos
+# blocos bundles_css e bundles_js; o resto não é descarregado.
+#
+# Caminhos relativos são ficheiros de static/ (com hash em produção); URLs
+# absolutos são servidos por CDN. Com 'defer' os scripts só correm depois
+# de o HTML ser processado, pela ordem em que aparecem na página.
+BUNDLES = {
+    # Todas as páginas públicas (base.html)
+    'site': {
+        'css': [
+            'css/bootstrap.min.css',
+            'css/animate.min.css',
+            'css/bootstrap-submenu.css',
+            'fonts/font-awesome/css/font-awesome.min.css',
+            'fonts/flaticon/font/flaticon.css',
+            'fonts/linearicons/style.css',
+        ],
+        'js': [
+            'js/jquery-2.2.0.min.js',
+            'js/popper.min.js',
+            'js/bootstrap.min.js',
+            'js/jquery.easing.1.3.js',
+            'js/jquery.scrollUp.js',
+            'js/ie10-viewport-bug-workaround.js',
+        ],
+        'defer': True,
+    },
+    # Inicialização do tema; sempre depois dos plugins declarados pela página
+    'site-app': {
+        'js': ['js/app.js'],
+        'defer': True,
+    },
+    'carrossel': {
+        'css': ['css/slick.css'],
+        'js': ['js/slick.min.js'],
+        'defer': True,
+    },
+    'galeria': {
+        'css': ['css/lightbox.min.css'],
+        'js': ['js/jquery.mousewheel.min.js', 'js/lightgallery-all.js'],
+        'defer': True,
+    },
+    'popup': {
+        'css': ['css/magnific-popup.css'],
+        'js': ['js/jquery.magnific-popup.min.js'],
+        'defer': True,
+    },
+    'seletores': {
+        'css': ['css/bootstrap-select.min.css'],
+        'js': ['js/bootstrap-select.min.js'],
+        'defer': True,
+    },
+    'notificacoes': {
+        'css': ['css/jnoty.css'],
+        'js': ['js/jnoty.js'],
+        'defer': True,
+    },
+    'upload': {
+        'css': ['css/dropzone.css'],
+        'js': ['js/dropzone.js'],
+        'defer': True,
+    },
+    'scroll': {
+        'css': ['css/jquery.mCustomScrollbar.css'],
+        'js': ['js/jquery.mousewheel.min.js', 'js/jquery.mCustomScrollbar.concat.min.js'],
+        'defer': True,
+    },
+    'contagem': {
+        'js': ['js/jquery.countdown.js'],
+        'defer': True,
+    },
+    'filtros': {
+        'js': ['js/jquery.filterizr.js'],
+        'defer': True,
+    },
+    'video': {
+        'js': ['js/jquery.mb.YTPlayer.js'],
+        'defer': True,
+    },
+    'submenu': {
+        'js': ['js/bootstrap-submenu.js'],
+        'defer': True,
+    },
+
+    # Painel (dashboard/base.html)
+    'painel': {
+        'css': [
+            'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+            'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css',
+        ],
+        # Sem defer: os scripts inline das páginas usam o bootstrap logo a seguir
+        'js': ['https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js'],
+    },
+    # Contadores de notificações e mensagens recentes do menu do painel
+    'painel-app': {
+        'js': ['js/dashboard.js'],
+        'defer': True,
+    },
+    # Chart.js, só nas páginas com gráficos (scripts inline usam-no logo a seguir)
+    'graficos': {
+        'js': ['https://cdn.jsdelivr.net/npm/chart.js'],
+    },
+}
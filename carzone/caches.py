@@ -0,0 +1,13 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def cache_partilhada(alias='default'):
+    """
+    Indica se a cache é partilhada entre workers (ex.: Redis).
+
+    A LocMemCache é por processo: um valor guardado ou invalidado num worker
+    não chega aos outros, por isso dados que mudam com escritas não devem
+    ser lá guardados.
+    """
+    return not isinstance(caches[alias], LocMemCache)
@@ -0,0 +1,68 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .routers import EstadoLeitura, leitura_atual
+
+
+# Cookie que mantém as leituras do utilizador no primário depois de ele escrever
+COOKIE_PRIMARIO = 'db_primary'
+
+METODOS_SEGUROS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReadReplicaMiddleware:
+    """
+    Enviar as leituras de pedidos GET/HEAD para as réplicas.
+
+    Depois de um pedido que escreve (POST, PUT, ...), o utilizador fica
+    DB_REPLICA_PIN_SECONDS segundos a ler do primário (cookie), para ver
+    logo o que acabou de gravar apesar do atraso de replicação.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        token = leitura_atual.set(self._estado(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            leitura_atual.reset(token)
+        return self._fixar_primario(request, response)
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        # O ContextVar acompanha as chamadas sync_to_async do ORM assíncrono
+        token = leitura_atual.set(self._estado(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            leitura_atual.reset(token)
+        return self._fixar_primario(request, response)
+
+    def _estado(self, request):
+        replica = request.method in METODOS_SEGUROS and COOKIE_PRIMARIO not in request.COOKIES
+        return EstadoLeitura(replica)
+
+    def _fixar_primario(self, request, response):
+        if request.method not in METODOS_SEGUROS:
+            response.set_cookie(
+                COOKIE_PRIMARIO,
+                '1',
+                max_age=settings.DB_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
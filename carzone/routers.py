@@ -0,0 +1,135 @@
+import functools
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+# Alias com o pool de ligações próprio das operações dos consumers WebSocket
+WEBSOCKET_DB_ALIAS = 'websocket'
+
+# Alias usado pelas queries do contexto atual (None = default)
+ligacao_atual = ContextVar('ligacao_atual', default=None)
+
+# Estado de leitura em réplica do pedido/tarefa atual (None = sempre no primário)
+leitura_atual = ContextVar('leitura_atual', default=None)
+
+
+class EstadoLeitura:
+    """
+    Se as leituras podem ir para uma réplica. É partilhado (e não copiado)
+    entre as threads de sync_to_async do mesmo pedido, por isso uma escrita
+    feita na view é vista pelo middleware.
+    """
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.escreveu = False
+
+
+def usar_ligacao(alias):
+    """Decorador: as queries da função (síncrona) vão para o alias indicado"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = ligacao_atual.set(alias)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                ligacao_atual.reset(token)
+        return wrapper
+    return decorator
+
+
+def alias_da_ligacao():
+    """
+    Alias de usar_ligacao() em vigor, ou None.
+
+    Um transaction.atomic() (ou on_commit) sem `using` fica no default; se
+    o código dentro de usar_ligacao() abrir um, as queries seguem para o
+    default enquanto o bloco estiver aberto, senão ficariam fora da
+    transação que o código julga ter.
+    """
+    alias = ligacao_atual.get()
+    if alias is not None and alias != DEFAULT_DB_ALIAS and connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS
+    return alias
+
+
+def websocket_sync_to_async(func):
+    """database_sync_to_async a usar o pool do WebSocket em vez do dos pedidos HTTP"""
+    # Import local: o router é carregado por todos os processos (WSGI,
+    # comandos) e só os consumers WebSocket precisam do channels
+    from channels.db import database_sync_to_async
+
+    return database_sync_to_async(usar_ligacao(WEBSOCKET_DB_ALIAS)(func))
+
+
+@contextmanager
+def leitura_replica(replica=True):
+    """Ler das réplicas dentro do bloco (comandos e tarefas só de leitura)"""
+    estado = EstadoLeitura(replica)
+    token = leitura_atual.set(estado)
+    try:
+        yield estado
+    finally:
+        leitura_atual.reset(token)
+
+
+def pode_ler_replica():
+    """Se o contexto atual (pedido ou bloco leitura_replica) permite ler das réplicas"""
+    estado = leitura_atual.get()
+    return estado is not None and estado.replica and not estado.escreveu
+
+
+def escolher_replica():
+    """Alias de uma réplica ao acaso, ou None se não houver réplicas"""
+    if not settings.DATABASE_REPLICAS:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+class ConnectionRouter:
+    """
+    Encaminhar as queries entre o primário, as réplicas e o pool do WebSocket.
+
+    - Com usar_ligacao() ativo, tudo vai para esse alias (exceto dentro de
+      um transaction.atomic() no default, ver alias_da_ligacao).
+    - As leituras vão para uma réplica apenas quando o pedido o permite
+      (ReadReplicaMiddleware ou leitura_replica()), fora de transações e
+      antes de qualquer escrita no mesmo pedido (read-your-writes).
+    - As escritas vão sempre para o primário.
+
+    Todos os aliases apontam para os mesmos dados, por isso as relações
+    entre objetos lidos de aliases diferentes são permitidas e as migrações
+    só correm no default.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = alias_da_ligacao()
+        if alias is not None:
+            return alias
+
+        if not pode_ler_replica():
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return escolher_replica()
+
+    def db_for_write(self, model, **hints):
+        estado = leitura_atual.get()
+        if estado is not None:
+            estado.escreveu = True
+        # Nunca None: o Django usaria instance._state.db e um objeto lido de
+        # uma réplica seria gravado nessa réplica (só de leitura)
+        return alias_da_ligacao() or DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == WEBSOCKET_DB_ALIAS or db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv, UndefinedValueError
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'cars.apps.CarsConfig',
     'pages.apps.PagesConfig',
     'chat.apps.ChatConfig',
+    'instrumentation.apps.InstrumentationConfig',
     'channels',
   
     'django.contrib.admin',
@@ -46,9 +47,12 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 MIDDLEWARE = [
+    'instrumentation.middleware.InstrumentationMiddleware',
+    'carzone.middleware.ReadReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,6 +86,11 @@ WSGI_APPLICATION = 'carzone.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Pool de ligações psycopg 3 por processo e por alias. O Django não permite
+# pool e CONN_MAX_AGE ao mesmo tempo; sem pool as ligações podem persistir
+# DB_CONN_MAX_AGE segundos (em ASGI manter 0).
+DB_POOL_ENABLED = config('DB_POOL_ENABLED', default=True, cast=bool)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -89,11 +98,127 @@ DATABASES = {
         'USER': 'postgres',
         'PASSWORD': 'RaiyanSama',
         'HOST': 'localhost',
-        'PORT': '5432'
+        'PORT': '5432',
+        'CONN_MAX_AGE': 0 if DB_POOL_ENABLED else config('DB_CONN_MAX_AGE', default=0, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+# Mesma base de dados com um pool separado para o executor dos consumers
+# WebSocket (ver carzone.routers), para o chat não esgotar o pool do HTTP
+DATABASES['websocket'] = {
+    **DATABASES['default'],
+    'TEST': {'MIRROR': 'default'},
+}
+
+# Réplicas de leitura (hosts separados por vírgulas). Em desenvolvimento
+# DB_REPLICA_NAME permite apontar para uma segunda base de dados local.
+DATABASE_REPLICAS = []
+for _index, _host in enumerate(config('DB_REPLICA_HOSTS', default='', cast=Csv()), start=1):
+    DATABASES[f'replica_{_index}'] = {
+        **DATABASES['default'],
+        'HOST': _host,
+        'NAME': config('DB_REPLICA_NAME', default=DATABASES['default']['NAME']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{_index}')
+
+# Segundos em que um utilizador lê do primário depois de escrever (read-your-writes)
+DB_REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=10, cast=int)
+
+if DB_POOL_ENABLED:
+    # Com CONN_HEALTH_CHECKS o Django já passa check= ao ConnectionPool
+    for _alias, _prefix, _min_size, _max_size in (
+        ('default', 'DB_POOL', 2, 10),
+        ('websocket', 'DB_WEBSOCKET_POOL', 1, 5),
+    ) + tuple((_replica, 'DB_POOL', 2, 10) for _replica in DATABASE_REPLICAS):
+        DATABASES[_alias]['OPTIONS'] = {
+            'pool': {
+                'min_size': config(f'{_prefix}_MIN_SIZE', default=_min_size, cast=int),
+                'max_size': config(f'{_prefix}_MAX_SIZE', default=_max_size, cast=int),
+                # Segundos à espera de uma ligação livre antes de falhar
+                'timeout': config(f'{_prefix}_TIMEOUT', default=10, cast=float),
+                'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+                'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=1800, cast=float),
+            },
+        }
+
+DATABASE_ROUTERS = ['carzone.routers.ConnectionRouter']
+
+# Workers ASGI só para HTTP podem arrancar sem o channels e os consumers
+ASGI_WEBSOCKET_ENABLED = config('ASGI_WEBSOCKET_ENABLED', default=True, cast=bool)
+
+
+# Cache
+# Em produção usar Redis (partilhado entre workers); em desenvolvimento, memória local
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'carzone',
+        }
     }
+
+
+# Reservas de compras
+# Compras por pagar libertam o carro após este prazo (em minutos), quando corre
+# `manage.py expire_reservations` (via cron ou com --interval 60)
+PURCHASE_RESERVATION_TTL_MINUTES = config('PURCHASE_RESERVATION_TTL_MINUTES', default=60 * 24, cast=int)
+
+
+# Notificações
+# Dias que as notificações lidas / por ler são mantidas antes de serem apagadas
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=90, cast=int)
+NOTIFICATION_UNREAD_RETENTION_DAYS = config('NOTIFICATION_UNREAD_RETENTION_DAYS', default=365, cast=int)
+
+# Arquivo: notificações lidas e salas fechadas saem das tabelas ativas após estes dias
+NOTIFICATION_ARCHIVE_DAYS = config('NOTIFICATION_ARCHIVE_DAYS', default=30, cast=int)
+CHAT_ARCHIVE_DAYS = config('CHAT_ARCHIVE_DAYS', default=90, cast=int)
+
+
+# Instrumentação (queries, tempos e cache por view)
+INSTRUMENTATION_ENABLED = config('INSTRUMENTATION_ENABLED', default=DEBUG, cast=bool)
+
+# Falhar (QueryBudgetExceeded) em vez de só registar um aviso; ativar nos testes
+INSTRUMENTATION_STRICT_BUDGETS = config('INSTRUMENTATION_STRICT_BUDGETS', default=False, cast=bool)
+
+# Número máximo de queries por nome de URL
+INSTRUMENTATION_QUERY_BUDGETS = {
+    'home': 15,
+    'cars': 15,
+    'car_detail': 15,
+    'dashboard:home': 25,
+    'dashboard:car_list': 15,
+    'chat:my_chats': 10,
+    'search_autocomplete': 3,
 }
 
 
+# Respostas condicionais (ETag/Last-Modified) das páginas públicas de carros
+HTTP_CACHE_ENABLED = config('HTTP_CACHE_ENABLED', default=not DEBUG, cast=bool)
+# max-age das páginas para visitantes anónimos (autenticados revalidam sempre)
+HTTP_CACHE_MAX_AGE = config('HTTP_CACHE_MAX_AGE', default=60, cast=int)
+# Mudar a cada deploy para invalidar ETags de templates antigos
+HTTP_CACHE_VERSION = config('RELEASE_VERSION', default='dev')
+
+# Fragmentos dos cartões de carros nas grelhas (ver cars.templatetags.car_cards)
+CAR_CARD_CACHE_TIMEOUT = config('CAR_CARD_CACHE_TIMEOUT', default=3600, cast=int)
+
+
+# Admin: a partir deste número de linhas a paginação usa a estimativa do PostgreSQL (0 desativa)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=10000, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -135,6 +260,26 @@ STATICFILES_DIRS = [
  
 ]
 
+# Destino do collectstatic: nomes com hash, imagens otimizadas e variantes .gz/.br
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'carzone.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Servir STATIC_ROOT pela aplicação (em produção, desligar e servir pelo nginx ou CDN:
+# sob ASGI cada ficheiro é lido todo para memória, ver servir_estatico)
+STATIC_SERVE = config('STATIC_SERVE', default=not DEBUG, cast=bool)
+# max-age dos ficheiros sem hash no nome (os com hash ficam um ano, imutáveis)
+STATIC_MAX_AGE = config('STATIC_MAX_AGE', default=3600, cast=int)
+# Qualidade JPEG das imagens de static/img otimizadas no collectstatic
+STATIC_IMAGE_QUALITY = config('STATIC_IMAGE_QUALITY', default=82, cast=int)
+
 # Media files (uploaded files)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -154,6 +299,10 @@ AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
 ]
 
+# Segundos que o utilizador de uma sessão fica em cache (EmailBackend.get_user).
+# Só com REDIS_URL: com a cache em memória local de cada worker fica desativada
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=300, cast=int)
+
 # Login/Logout URLs
 LOGIN_URL = '/auth/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
@@ -171,7 +320,7 @@ try:
     EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
     DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL')
     SERVER_EMAIL = config('SERVER_EMAIL')
-except:
+except UndefinedValueError:
     # Configurações de fallback para desenvolvimento
     EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
     EMAIL_HOST = 'smtp.gmail.com'
@@ -0,0 +1,173 @@
+import gzip
+import io
+import mimetypes
+import os
+import posixpath
+from functools import cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+
+# Ficheiros de texto que vale a pena comprimir (woff2, jpg, png e gif já vêm comprimidos)
+EXTENSOES_COMPRIMIVEIS = {'.css', '.js', '.svg', '.ttf', '.eot', '.ico', '.json', '.txt', '.map'}
+
+# Abaixo disto a compressão não compensa os cabeçalhos
+TAMANHO_MINIMO = 1024
+
+# Codificações pela ordem de preferência: (Accept-Encoding, sufixo do ficheiro)
+CODIFICACOES = (('br', '.br'), ('gzip', '.gz'))
+
+# Nomes com hash mudam a cada alteração, por isso podem ficar em cache um ano
+MAX_AGE_VERSIONADOS = 365 * 24 * 60 * 60
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Storage do collectstatic: nomes com hash do conteúdo (manifest), imagens
+    de img/ otimizadas com o Pillow e variantes .gz/.br (brotli opcional)
+    gravadas ao lado de cada ficheiro de texto, prontas a servir por
+    servir_estatico.
+    """
+
+    # Os bundles do Bootstrap/Popper referem .map que não são distribuídos
+    patterns = tuple(
+        (extension, tuple(pattern for pattern in patterns if 'sourceMappingURL' not in str(pattern)))
+        for extension, patterns in ManifestStaticFilesStorage.patterns
+    )
+
+    def stored_name(self, name):
+        # Sem manifest (testes, que correm com DEBUG=False, ou antes do primeiro
+        # collectstatic) usar o nome original; com manifest, uma entrada em
+        # falta continua a ser um erro
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def save(self, name, content, max_length=None):
+        # Só as cópias do collectstatic passam aqui; as versões com hash
+        # são gravadas pelo post_process com _save e não voltam a perder qualidade
+        return super().save(name, otimizar_imagem(name, content), max_length)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        for name in paths:
+            for stored_name in {name, self.stored_name(name)}:
+                if os.path.splitext(stored_name)[1].lower() in EXTENSOES_COMPRIMIVEIS:
+                    comprimir(self.path(stored_name))
+
+
+def otimizar_imagem(name, content):
+    """Recodificar JPEG/PNG de img/ sem metadados; mantém o original se não ficar mais pequeno"""
+    extension = os.path.splitext(name)[1].lower()
+    if not name.startswith('img/') or extension not in ('.jpg', '.jpeg', '.png'):
+        return content
+
+    from PIL import Image
+
+    original = content.read()
+    content.seek(0)
+    output = io.BytesIO()
+    with Image.open(io.BytesIO(original)) as image:
+        if extension == '.png':
+            image.save(output, format='PNG', optimize=True)
+        else:
+            image.convert('RGB').save(
+                output,
+                format='JPEG',
+                quality=settings.STATIC_IMAGE_QUALITY,
+                optimize=True,
+                progressive=True,
+            )
+
+    if output.tell() >= len(original):
+        return content
+    return ContentFile(output.getvalue(), name=name)
+
+
+def comprimir(path):
+    """Gravar path.gz (e path.br, com brotli instalado) quando a compressão compensa"""
+    with open(path, 'rb') as source:
+        data = source.read()
+    if len(data) < TAMANHO_MINIMO:
+        return
+
+    variantes = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    brotli = _brotli()
+    if brotli is not None:
+        variantes['.br'] = brotli.compress(data, quality=11)
+
+    for suffix, compressed in variantes.items():
+        # Pelo menos 5% mais pequeno, senão não vale o Content-Encoding
+        if len(compressed) < len(data) * 0.95:
+            with open(path + suffix, 'wb') as target:
+                target.write(compressed)
+
+
+@cache
+def _brotli():
+    # Só o collectstatic comprime; os workers servem apenas o que já existe
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+@cache
+def _versionados():
+    return frozenset(staticfiles_storage.hashed_files.values())
+
+
+def servir_estatico(request, path):
+    """
+    Servir STATIC_ROOT quando não há CDN ou proxy à frente: escolhe a
+    variante pré-comprimida que o cliente aceita e marca os nomes com hash
+    como imutáveis.
+
+    Sob ASGI o Django lê o FileResponse (iterador síncrono) todo para
+    memória antes de o enviar. Serve para os ficheiros pequenos do site;
+    em produção deixar STATIC_SERVE desligado e servir STATIC_ROOT pelo
+    proxy (nginx) ou por uma CDN, que também usam as variantes .gz/.br.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Ficheiro estático inválido')
+    if not os.path.isfile(fullpath):
+        raise Http404('Ficheiro estático não encontrado')
+
+    stat = os.stat(fullpath)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    filename, encoding = fullpath, None
+    accept_encoding = request.headers.get('Accept-Encoding', '')
+    for candidate, suffix in CODIFICACOES:
+        if candidate in accept_encoding and os.path.isfile(fullpath + suffix):
+            filename, encoding = fullpath + suffix, candidate
+            break
+
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    response = FileResponse(open(filename, 'rb'), content_type=content_type)
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+
+    if path in _versionados():
+        patch_cache_control(response, public=True, max_age=MAX_AGE_VERSIONADOS, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.STATIC_MAX_AGE)
+    return response
@@ -0,0 +1,42 @@
+from unittest import mock
+
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.test import SimpleTestCase, TransactionTestCase
+
+from cars.models import Brand
+
+from .routers import WEBSOCKET_DB_ALIAS, leitura_replica, usar_ligacao
+
+
+class ConnectionRouterTests(TransactionTestCase):
+    # O alias websocket é um mirror com ligação própria: só vê linhas já confirmadas
+    databases = {DEFAULT_DB_ALIAS, WEBSOCKET_DB_ALIAS}
+
+    def test_objeto_lido_de_outro_alias_e_gravado_no_primario(self):
+        brand = Brand.objects.create(name='Router')
+        # Como se tivesse vindo de uma réplica num pedido GET
+        lida = Brand.objects.using(WEBSOCKET_DB_ALIAS).get(pk=brand.pk)
+        self.assertEqual(lida._state.db, WEBSOCKET_DB_ALIAS)
+
+        with leitura_replica():
+            lida.country = 'Portugal'
+            lida.save(update_fields=['country'])
+
+        self.assertEqual(lida._state.db, DEFAULT_DB_ALIAS)
+        self.assertEqual(Brand.objects.get(pk=brand.pk).country, 'Portugal')
+
+
+class UsarLigacaoTests(SimpleTestCase):
+
+    def test_escritas_seguem_usar_ligacao(self):
+        self.assertEqual(router.db_for_write(Brand), DEFAULT_DB_ALIAS)
+        self.assertEqual(
+            usar_ligacao(WEBSOCKET_DB_ALIAS)(router.db_for_write)(Brand),
+            WEBSOCKET_DB_ALIAS,
+        )
+
+    def test_atomic_sem_using_mantem_as_queries_no_default(self):
+        # Como dentro de um transaction.atomic() aberto pelo código do consumer
+        with mock.patch.object(connections[DEFAULT_DB_ALIAS], 'in_atomic_block', True):
+            self.assertEqual(usar_ligacao(WEBSOCKET_DB_ALIAS)(router.db_for_read)(Brand), DEFAULT_DB_ALIAS)
+            self.assertEqual(usar_ligacao(WEBSOCKET_DB_ALIAS)(router.db_for_write)(Brand), DEFAULT_DB_ALIAS)
@@ -15,21 +15,29 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .staticfiles import servir_estatico
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('auth/', include("authentication.urls")),
     path('dashboard/', include("dashboard.urls")),
     path('chat/', include("chat.urls")),
+    path('instrumentacao/', include("instrumentation.urls")),
     path('', include("pages.urls")),
    
 ] 
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-urlpatterns +=  static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+
+# Em DEBUG o runserver serve os ficheiros diretamente de static/
+if settings.STATIC_SERVE:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), servir_estatico),
+    ]
 
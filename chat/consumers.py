@@ -1,10 +1,11 @@
 import json
 import asyncio
 from channels.generic.websocket import AsyncWebsocketConsumer
-from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from cars.models import ChatRoom, ChatMessage, ChatNotification
+from cars.models import ChatRoom, ChatMessage
+from service import notification_service
+from carzone.routers import websocket_sync_to_async
 
 User = get_user_model()
 
@@ -227,7 +228,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         # Obter informações da sala de chat
         chat_room = await self.get_chat_room()
         if chat_room:
-            # Obter o outro utilizador da conversa usando database_sync_to_async
+            # Obter o outro utilizador da conversa usando websocket_sync_to_async
             other_user = await self.get_other_user(chat_room)
             
             if other_user:
@@ -293,24 +294,24 @@ class ChatConsumer(AsyncWebsocketConsumer):
         }))
 
     # Database operations
-    @database_sync_to_async
+    @websocket_sync_to_async
     def get_chat_room(self):
         try:
             return ChatRoom.objects.get(id=self.room_id)
         except ChatRoom.DoesNotExist:
             return None
 
-    @database_sync_to_async
+    @websocket_sync_to_async
     def get_other_user(self, chat_room):
         """Obter o outro utilizador da conversa (não o atual)"""
         return chat_room.get_other_user(self.user)
 
-    @database_sync_to_async
+    @websocket_sync_to_async
     def user_has_permission(self, chat_room):
         """Verificar se o usuário tem permissão para acessar o chat"""
         return (self.user == chat_room.buyer or self.user == chat_room.seller)
 
-    @database_sync_to_async
+    @websocket_sync_to_async
     def create_message(self, chat_room, content, message_type, file_data=None, file_name=None):
         try:
             from django.core.files.base import ContentFile
@@ -347,38 +348,31 @@ class ChatConsumer(AsyncWebsocketConsumer):
             print(f"Erro ao criar mensagem: {e}")
             return None
 
-    @database_sync_to_async
+    @websocket_sync_to_async
     def create_notification(self, chat_room, message):
         try:
             other_user = chat_room.get_other_user(self.user)
             if other_user:
-                ChatNotification.objects.create(
-                    recipient=other_user,
-                    chat_room=chat_room,
-                    message=message,
-                    notification_type='new_message',
-                    title=f'Nova mensagem de {self.user.get_full_name() or self.user.username}',
-                    content=message.content[:100] + ('...' if len(message.content) > 100 else '')
-                )
+                notification_service.notificar_nova_mensagem(other_user, chat_room, message, self.user)
         except Exception:
             pass
 
-    @database_sync_to_async
+    @websocket_sync_to_async
     def mark_room_as_read(self, chat_room):
         try:
             chat_room.mark_as_read(self.user)
         except Exception:
             pass
     
-    @database_sync_to_async
+    @websocket_sync_to_async
     def get_file_size_formatted(self, message):
         return message.get_file_size_formatted()
     
-    @database_sync_to_async
+    @websocket_sync_to_async
     def get_file_icon(self, message):
         return message.get_file_icon()
     
-    @database_sync_to_async
+    @websocket_sync_to_async
     def is_image(self, message):
         return message.is_image()
     
@@ -432,22 +426,22 @@ class ChatConsumer(AsyncWebsocketConsumer):
         except Exception as e:
             print(f"Erro no monitoramento de inatividade: {e}")
     
-    @database_sync_to_async
+    @websocket_sync_to_async
     def is_buyer_inactive_db(self, chat_room):
         """Verificar se comprador está inativo (versão async)"""
         return chat_room.is_buyer_inactive()
     
-    @database_sync_to_async
+    @websocket_sync_to_async
     def auto_close_chat(self, chat_room):
         """Fechar chat automaticamente (versão async)"""
         chat_room.auto_close_for_inactivity()
     
-    @database_sync_to_async
+    @websocket_sync_to_async
     def update_buyer_activity_db(self, chat_room):
         """Atualizar atividade do comprador (versão async)"""
         chat_room.update_buyer_activity()
     
-    @database_sync_to_async
+    @websocket_sync_to_async
     def is_user_buyer(self, chat_room):
         """Verificar se o usuário atual é o comprador (versão async)"""
         return self.user == chat_room.buyer
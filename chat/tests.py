@@ -1,3 +1,67 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from cars.models_archive import ChatNotificationArchive
+from cars.models_chat import ChatRoom, ChatMessage, ChatNotification
+from cars.testing import criar_carro, criar_utilizador
+from service.archive_service import arquivar_chats
+from service.notification_service import notificar_nova_mensagem
+
+
+class ArquivarChatsTests(TestCase):
+
+    def test_mensagens_apagadas_continuam_ocultas_no_arquivo(self):
+        car = criar_carro()
+        buyer = criar_utilizador('buyer')
+        room = ChatRoom.objects.create(car=car, buyer=buyer, seller=car.seller)
+        ChatMessage.objects.create(chat_room=room, sender=buyer, content='Ainda está disponível?')
+        apagada = ChatMessage.objects.create(chat_room=room, sender=buyer, content='Engano')
+        apagada.delete_message()
+        ChatRoom.objects.filter(pk=room.pk).update(status='closed', closed_at=timezone.now() - timedelta(days=5))
+
+        rooms, messages = arquivar_chats(days=1)
+
+        self.assertEqual((rooms, messages), (1, 2))
+        self.assertFalse(ChatMessage.objects.filter(chat_room=room).exists())
+        visiveis = room.archived_messages.filter(is_deleted=False)
+        self.assertEqual([message.content for message in visiveis], ['Ainda está disponível?'])
+
+    def test_notificacoes_por_ler_nao_vao_para_o_arquivo(self):
+        car = criar_carro()
+        buyer = criar_utilizador('buyer')
+        room = ChatRoom.objects.create(car=car, buyer=buyer, seller=car.seller)
+        message = ChatMessage.objects.create(chat_room=room, sender=buyer, content='Olá')
+        lida = ChatNotification.objects.create(
+            recipient=car.seller, chat_room=room, message=message, notification_type='new_message',
+            title='Nova mensagem', content='Olá', is_read=True
+        )
+        por_ler = ChatNotification.objects.create(
+            recipient=car.seller, chat_room=room, message=message, notification_type='new_message',
+            title='Nova mensagem', content='Olá'
+        )
+        ChatRoom.objects.filter(pk=room.pk).update(status='closed', closed_at=timezone.now() - timedelta(days=5))
+
+        arquivar_chats(days=1)
+
+        self.assertTrue(ChatNotificationArchive.objects.filter(pk=lida.pk).exists())
+        por_ler.refresh_from_db()
+        self.assertFalse(por_ler.is_read)
+        self.assertIsNone(por_ler.message_id)
+
+
+class NotificarNovaMensagemTests(TestCase):
+
+    def test_mensagens_seguidas_agregam_numa_notificacao(self):
+        car = criar_carro()
+        buyer = criar_utilizador('buyer')
+        room = ChatRoom.objects.create(car=car, buyer=buyer, seller=car.seller)
+
+        for content in ('Olá', 'Ainda está disponível?'):
+            message = ChatMessage.objects.create(chat_room=room, sender=buyer, content=content)
+            notificar_nova_mensagem(car.seller, room, message, buyer)
 
-# Create your tests here.
+        notification = ChatNotification.objects.get(recipient=car.seller, chat_room=room)
+        self.assertEqual(notification.message_count, 2)
+        self.assertEqual(notification.content, 'Ainda está disponível?')
@@ -8,6 +8,7 @@ from django.db.models import Q, Count, Max, Case, When
 
 from cars.models import Car
 from cars.models_chat import ChatRoom, ChatMessage, ChatNotification
+from service import notification_service
 
 
 @login_required
@@ -51,7 +52,7 @@ def start_chat(request, car_id):
             created = True
             
             # Criar notificação para o vendedor sobre novo chat
-            ChatNotification.objects.create(
+            notification_service.notificar_chat(
                 recipient=car.seller,
                 chat_room=chat_room,
                 notification_type='chat_started',
@@ -84,8 +85,11 @@ def chat_room(request, room_id):
             messages.error(request, 'Não tem permissão para aceder a este chat.')
             return redirect('dashboard:home')
         
-        # Obter mensagens da conversa
-        messages_list = chat_room.messages.filter(is_deleted=False).select_related('sender').order_by('created_at')
+        # Obter mensagens da conversa (salas arquivadas leem do arquivo)
+        if chat_room.status == 'archived':
+            messages_list = chat_room.archived_messages.filter(is_deleted=False).select_related('sender').order_by('created_at')
+        else:
+            messages_list = chat_room.messages.filter(is_deleted=False).select_related('sender').order_by('created_at')
         
         # Marcar mensagens como lidas apenas se chat estiver ativo
         if chat_room.status == 'active':
@@ -129,7 +133,7 @@ def my_chats(request):
     # Obter chats onde o utilizador é comprador ou vendedor
     chats = ChatRoom.objects.filter(
         Q(buyer=request.user) | Q(seller=request.user)
-    ).select_related('car', 'buyer', 'seller').annotate(
+    ).select_related('car__main_photo', 'buyer', 'seller').annotate(
         unread_count=Count('messages', filter=Q(
             messages__created_at__gt=Case(
                 When(buyer=request.user, then='buyer_last_read'),
@@ -174,7 +178,7 @@ def close_chat(request, room_id):
             try:
                 other_user = chat_room.get_other_user(request.user)
                 if other_user:
-                    ChatNotification.objects.create(
+                    notification_service.notificar_chat(
                         recipient=other_user,
                         chat_room=chat_room,
                         notification_type='chat_closed',
@@ -320,14 +324,7 @@ def send_message_api(request, room_id):
             # Criar notificação para o outro utilizador
             other_user = chat_room.get_other_user(request.user)
             if other_user:
-                ChatNotification.objects.create(
-                    recipient=other_user,
-                    chat_room=chat_room,
-                    message=message,
-                    notification_type='new_message',
-                    title=f'Nova mensagem de {request.user.get_full_name() or request.user.username}',
-                    content=message_content[:100] + ('...' if len(message_content) > 100 else '')
-                )
+                notification_service.notificar_nova_mensagem(other_user, chat_room, message, request.user)
             
             return JsonResponse({
                 'success': True,
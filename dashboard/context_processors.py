@@ -1,19 +1,22 @@
-from cars.models_purchase import Notification
+from functools import cache
+
+from service.notification_service import contar_por_ler
 
 
 def notifications_count(request):
     """
     Context processor para adicionar o contador de notificações não lidas
-    em todos os templates do dashboard
+    em todos os templates do dashboard.
+
+    O valor é uma função: o template só a chama (e só consulta a cache ou a
+    base de dados) se usar a variável, e o resultado é reutilizado.
     """
-    unread_count = 0
-    
-    if request.user.is_authenticated:
-        unread_count = Notification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).count()
-    
+    @cache
+    def unread_count():
+        if not request.user.is_authenticated:
+            return 0
+        return contar_por_ler(request.user.pk)
+
     return {
         'unread_notifications_count': unread_count
     }
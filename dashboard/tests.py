@@ -1,3 +1,55 @@
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from cars.testing import criar_carro, criar_utilizador
+from instrumentation.testing import QueryBudgetTestMixin
+
+
+class ExportDataTests(TestCase):
+
+    async def test_exportacao_em_streaming_assincrono(self):
+        seller = await sync_to_async(criar_utilizador)('seller')
+        car = await sync_to_async(criar_carro)(seller)
+        outro = await sync_to_async(criar_carro)()
+        await self.async_client.aforce_login(seller)
+
+        response = await self.async_client.get(reverse('dashboard:export_data', args=['cars']))
+
+        self.assertEqual(response.status_code, 200)
+        # Um gerador síncrono seria lido todo para memória pelo handler ASGI
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertIn(car.license_plate, content)
+        self.assertNotIn(outro.license_plate, content)
+
+    def test_filtro_com_valor_invalido_devolve_400(self):
+        self.client.force_login(criar_utilizador('seller'))
+
+        response = self.client.get(
+            reverse('dashboard:export_data', args=['cars']), {'created_at__gte': 'ontem'}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(INSTRUMENTATION_ENABLED=True, INSTRUMENTATION_STRICT_BUDGETS=True)
+class OrcamentoQueriesTests(QueryBudgetTestMixin, TestCase):
+
+    def setUp(self):
+        self.seller = criar_utilizador('seller')
+        for _ in range(3):
+            criar_carro(self.seller)
+        self.client.force_login(self.seller)
+
+    def test_dashboard_home(self):
+        response = self.client.get(reverse('dashboard:home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget(response)
+
+    def test_lista_de_carros(self):
+        response = self.client.get(reverse('dashboard:car_list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget(response)
@@ -13,6 +13,8 @@ urlpatterns = [
     path('carros/', views.car_list, name='car_list'),
     path('carros/<uuid:car_id>/', views.car_detail, name='car_detail'),
     path('carros/adicionar/', views.car_add, name='car_add'),
+    path('carros/importar/', views.car_import, name='car_import'),
+    path('exportar/<str:dataset>/', views.export_data, name='export_data'),
     path('carros/<uuid:car_id>/editar/', views.car_edit, name='car_edit'),
     path('carros/<uuid:car_id>/eliminar/', views.car_delete, name='car_delete'),
     
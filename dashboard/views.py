@@ -1,16 +1,19 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse, HttpResponseBadRequest
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
 from django.db.models import Count, Sum
 from datetime import datetime, timedelta
 from django.db.models.functions import TruncMonth
 
-from forms.car_forms import CarForm, CarImageForm
+from forms.car_forms import CarForm, CarImageForm, CarImportForm
 from entities.car_entity import Car as CarEntity
-from service import car_service, auth_service
+from service import car_service, auth_service, favorite_service, search_service
 from cars.models import Car, Brand, CarModel, Favorite
+from carzone.routers import pode_ler_replica
 
 
 def is_seller_or_staff(user):
@@ -73,7 +76,7 @@ def dashboard_home(request):
     else:
         # Estatísticas do comprador
         favoritos_count = Favorite.objects.filter(user=user).count()
-        recent_cars = Car.objects.filter(status='active').order_by('-created_at')[:6]
+        recent_cars = Car.objects.filter(status='active').com_foto_principal().order_by('-created_at')[:6]
         
         context = {
             'user': user,
@@ -236,6 +239,76 @@ def car_add(request):
     return render(request, 'dashboard/car_add.html', context)
 
 
+@user_passes_test(is_seller_or_staff, login_url='dashboard:home')
+def car_import(request):
+    """Importar carros em lote a partir de um ficheiro - APENAS VENDEDORES"""
+    # Import local: importações e exportações são raras, não pesam no arranque dos workers
+    from service import import_service
+
+    report = None
+    
+    if request.method == 'POST':
+        form = CarImportForm(request.POST, request.FILES)
+        
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            rows = import_service.ler_linhas(upload.file, form.cleaned_data['format'])
+            
+            try:
+                report = import_service.importar_carros(rows, request.user, sync=form.cleaned_data['sync'])
+            except (ValueError, UnicodeDecodeError) as e:
+                messages.error(request, f'Não foi possível ler o ficheiro: {e}')
+            else:
+                messages.success(
+                    request,
+                    f'Importação concluída: {report.created} criados, {report.updated} atualizados, '
+                    f'{report.unchanged} sem alterações, {report.deactivated} desativados, '
+                    f'{len(report.errors)} com erros.'
+                )
+    else:
+        form = CarImportForm()
+    
+    context = {
+        'form': form,
+        'report': report,
+        'errors': report.errors[:200] if report else [],
+    }
+    
+    return render(request, 'dashboard/car_import.html', context)
+
+
+@user_passes_test(is_seller_or_staff, login_url='dashboard:home')
+def export_data(request, dataset):
+    """
+    Exportar carros, vendas ou histórico de preços em CSV/JSON Lines.
+
+    Aceita os mesmos filtros que o admin (ex.: ?status__exact=active).
+    Staff exporta tudo; vendedores apenas os seus dados.
+    """
+    from service import export_service
+
+    formato = request.GET.get('format', 'csv')
+    seller = None if request.user.is_staff else request.user
+    
+    try:
+        # Gerador assíncrono: sob ASGI (Daphne) um gerador síncrono seria
+        # lido todo para memória antes de ser enviado
+        chunks = export_service.exportar_async(
+            dataset, formato, request.GET.dict(), seller=seller, replica=pode_ler_replica()
+        )
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    except ValidationError as e:
+        # Valores de filtro inválidos (ex.: created_at__gte=ontem)
+        return HttpResponseBadRequest('; '.join(e.messages))
+    
+    content_type = 'text/csv' if formato == 'csv' else 'application/x-ndjson'
+    response = StreamingHttpResponse(chunks, content_type=f'{content_type}; charset=utf-8')
+    filename = f'{dataset}_{datetime.now():%Y%m%d_%H%M}.{formato}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 @login_required
 def car_detail(request, car_id):
     """Ver detalhes do carro - disponível para todos os utilizadores autenticados"""
@@ -245,7 +318,7 @@ def car_detail(request, car_id):
     user_can_manage = (request.user.is_staff or car.seller == request.user) and is_seller_or_staff(request.user)
     
     # Verificar se o carro está nos favoritos do utilizador
-    is_favorited = Favorite.objects.filter(user=request.user, car=car).exists()
+    is_favorited = favorite_service.eh_favorito(request.user, car.id)
     
     # Obter fotos do carro
     photos = car.photos.all()
@@ -404,7 +477,7 @@ def my_cars(request):
 def my_favorites(request):
     """Listar carros favoritos do utilizador"""
     # Obter favoritos do utilizador
-    favorites = Favorite.objects.filter(user=request.user).select_related('car__brand', 'car__car_model', 'car__seller').order_by('-created_at')
+    favorites = Favorite.objects.filter(user=request.user).select_related('car__brand', 'car__car_model', 'car__seller', 'car__main_photo').order_by('-created_at')
     
     # Paginação
     paginator = Paginator(favorites, 12)
@@ -424,24 +497,17 @@ def my_favorites(request):
 def toggle_favorite(request, car_id):
     """Toggle favorito (AJAX)"""
     if request.method == 'POST':
-        car = car_service.listar_car_id(car_id)
-        favorite, created = Favorite.objects.get_or_create(
-            user=request.user,
-            car=car
-        )
+        result = favorite_service.alternar_favorito(request.user, car_id)
+        if result is None:
+            return JsonResponse({'success': False, 'message': 'Carro não encontrado'}, status=404)
         
-        if not created:
-            favorite.delete()
-            is_favorite = False
-            message = 'Removido dos favoritos'
-        else:
-            is_favorite = True
-            message = 'Adicionado aos favoritos'
+        is_favorite, favorites_count = result
+        message = 'Adicionado aos favoritos' if is_favorite else 'Removido dos favoritos'
         
         return JsonResponse({
             'success': True,
             'is_favorite': is_favorite,
-            'favorites_count': car.favorites_count,
+            'favorites_count': favorites_count,
             'message': message
         })
     
@@ -449,13 +515,18 @@ def toggle_favorite(request, car_id):
 
 
 @login_required
-def get_car_models(request):
-    """Obter modelos por marca (AJAX)"""
+async def get_car_models(request):
+    """Obter modelos por marca (AJAX), opcionalmente filtrados por `q` com tolerância a erros"""
     brand_id = request.GET.get('brand_id')
+    query = request.GET.get('q', '').strip()
+    
+    if brand_id and query:
+        models_list = await sync_to_async(search_service.sugerir_modelos)(query, brand_id=brand_id, limit=20)
+        return JsonResponse({'models': [{'id': model['id'], 'name': model['name']} for model in models_list]})
     
     if brand_id:
-        models = car_service.listar_models_por_brand(brand_id)
-        models_list = [{'id': model.id, 'name': model.name} for model in models]
+        models = car_service.listar_models_por_brand(brand_id).values('id', 'name')
+        models_list = [model async for model in models]
         return JsonResponse({'models': models_list})
     
     return JsonResponse({'models': []})
@@ -1,3 +1,6 @@
+import uuid
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
@@ -12,23 +15,7 @@ from cars.models import Car
 from cars.models_purchase import PurchaseRequest, Purchase, PurchaseStatusHistory, Notification
 from forms.purchase_forms import PurchaseRequestForm, PurchaseForm, SellerResponseForm, PurchaseStatusForm
 from services.email_service import EmailService
-
-
-def create_notification(user, notification_type, title, message, **kwargs):
-    """
-    Função auxiliar para criar notificações
-    """
-    notification = Notification.objects.create(
-        user=user,
-        type=notification_type,
-        title=title,
-        message=message,
-        purchase_request=kwargs.get('purchase_request'),
-        purchase=kwargs.get('purchase'),
-        car=kwargs.get('car')
-    )
-    return notification
-
+from service import notification_service, purchase_service
 
 
 @login_required
@@ -65,7 +52,7 @@ def purchase_request_create(request, car_id):
             purchase_request.save()
             
             # Criar notificação para o vendedor
-            create_notification(
+            notification_service.criar_notificacao(
                 user=car.seller,
                 notification_type='purchase_request',
                 title=f'Nova solicitação de compra para {car.title}',
@@ -104,57 +91,41 @@ def purchase_create(request, car_id):
         messages.error(request, 'Não pode comprar o seu próprio carro.')
         return redirect('dashboard:car_detail', car_id=car_id)
     
-    # Verificar se o carro está disponível
-    if car.status != 'active':
+    # Verificar se o carro está disponível (em POST a verificação é feita
+    # pelo serviço, com o carro bloqueado, para permitir repetir a submissão)
+    if request.method != 'POST' and car.status != 'active':
         messages.error(request, 'Este carro não está disponível para compra.')
         return redirect('dashboard:car_detail', car_id=car_id)
     
     if request.method == 'POST':
         form = PurchaseForm(request.POST, user=request.user, car=car)
+        idempotency_key = request.POST.get('idempotency_key', '')[:64]
         
         if form.is_valid():
-            purchase = form.save(commit=False)
-            purchase.car = car
-            purchase.buyer = request.user
-            purchase.seller = car.seller
-            purchase.purchase_price = car.price
-            purchase.save()
-            
-            # Marcar carro como reservado
-            car.status = 'reserved'
-            car.save()
+            try:
+                purchase, created = purchase_service.efetuar_compra(
+                    car.id,
+                    request.user,
+                    form.save(commit=False),
+                    idempotency_key=idempotency_key
+                )
+            except purchase_service.CarroIndisponivel:
+                messages.error(request, 'Este carro já não está disponível para compra.')
+                return redirect('dashboard:car_detail', car_id=car_id)
             
-            # Criar entrada no histórico
-            PurchaseStatusHistory.objects.create(
-                purchase=purchase,
-                previous_status='',
-                new_status='pending_payment',
-                changed_by=request.user,
-                notes='Compra criada'
-            )
-            
-            # Criar notificação para o vendedor
-            create_notification(
-                user=car.seller,
-                notification_type='purchase_created',
-                title=f'Nova compra para {car.title}',
-                message=f'{purchase.buyer_name} comprou o seu carro por €{purchase.purchase_price}.',
-                purchase=purchase,
-                car=car
-            )
-            
-            # Enviar emails de notificação
-            EmailService.send_purchase_notification(purchase)  # Para o vendedor
-            EmailService.send_purchase_confirmation(purchase)  # Para o comprador
-            
-            messages.success(request, 'Compra realizada com sucesso! O vendedor foi notificado e irá processar o seu pedido.')
+            if created:
+                messages.success(request, 'Compra realizada com sucesso! O vendedor foi notificado e irá processar o seu pedido.')
+            else:
+                messages.info(request, 'Esta compra já tinha sido registada.')
             return redirect('dashboard:purchase_detail', purchase_id=purchase.id)
     else:
         form = PurchaseForm(user=request.user, car=car)
+        idempotency_key = uuid.uuid4().hex
     
     context = {
         'form': form,
         'car': car,
+        'idempotency_key': idempotency_key,
         'form_title': 'Comprar Carro',
         'form_description': f'Finalizar compra de {car.title} por €{car.price}'
     }
@@ -190,7 +161,7 @@ def purchase_request_detail(request, request_id):
                 'negotiating': 'O vendedor quer negociar com você.'
             }
             
-            create_notification(
+            notification_service.criar_notificacao(
                 user=purchase_request.buyer,
                 notification_type='status_changed',
                 title=f'Resposta à sua solicitação - {purchase_request.car.title}',
@@ -298,7 +269,7 @@ def purchase_status_update(request, purchase_id):
                 'cancelled': 'A sua compra foi cancelada.'
             }
             
-            create_notification(
+            notification_service.criar_notificacao(
                 user=purchase.buyer,
                 notification_type='status_changed',
                 title=f'Status atualizado - {purchase.car.title}',
@@ -307,6 +278,16 @@ def purchase_status_update(request, purchase_id):
                 car=purchase.car
             )
             
+            # Avisar quem tinha o carro nos favoritos de que foi vendido
+            if new_status == 'completed' and old_status != 'completed':
+                notification_service.notificar_favoritos(
+                    purchase.car,
+                    'car_sold',
+                    title=f'Carro vendido: {purchase.car.title}',
+                    message='Um carro dos seus favoritos foi vendido.',
+                    exclude=[purchase.buyer_id]
+                )
+            
             # Enviar email de atualização de status para o comprador
             EmailService.send_purchase_status_update(purchase, old_status, new_status)
             
@@ -329,10 +310,10 @@ def my_purchases(request):
     Listar compras do utilizador
     """
     # Compras como comprador
-    purchases = Purchase.objects.filter(buyer=request.user).order_by('-created_at')
+    purchases = Purchase.objects.filter(buyer=request.user).select_related('car__brand', 'car__car_model', 'car__main_photo').order_by('-created_at')
     
     # Solicitações como comprador
-    purchase_requests = PurchaseRequest.objects.filter(buyer=request.user).order_by('-created_at')
+    purchase_requests = PurchaseRequest.objects.filter(buyer=request.user).select_related('car__brand', 'car__car_model', 'car__main_photo').order_by('-created_at')
     
     # Paginação
     purchase_paginator = Paginator(purchases, 10)
@@ -358,10 +339,10 @@ def my_sales(request):
     Listar vendas do utilizador (vendedor)
     """
     # Vendas como vendedor
-    sales = Purchase.objects.filter(seller=request.user).order_by('-created_at')
+    sales = Purchase.objects.filter(seller=request.user).select_related('car__brand', 'car__car_model', 'car__main_photo').order_by('-created_at')
     
     # Solicitações recebidas como vendedor
-    purchase_requests = PurchaseRequest.objects.filter(seller=request.user).order_by('-created_at')
+    purchase_requests = PurchaseRequest.objects.filter(seller=request.user).select_related('car__brand', 'car__car_model', 'car__main_photo').order_by('-created_at')
     
     # Paginação
     sales_paginator = Paginator(sales, 10)
@@ -395,7 +376,7 @@ def notifications_list(request):
     
     context = {
         'notifications': page_obj,
-        'unread_count': notifications.filter(is_read=False).count()
+        'unread_count': notification_service.contar_por_ler(request.user.pk)
     }
     
     return render(request, 'dashboard/notifications.html', context)
@@ -424,6 +405,7 @@ def notifications_mark_all_read(request):
         is_read=True,
         read_at=timezone.now()
     )
+    notification_service.invalidar_contador(request.user.pk)
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({'success': True})
@@ -433,15 +415,13 @@ def notifications_mark_all_read(request):
 
 
 @login_required
-def notifications_count(request):
+async def notifications_count(request):
     """
     Retorna o número de notificações não lidas via AJAX
     """
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        count = Notification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).count()
+        user = await request.auser()
+        count = await sync_to_async(notification_service.contar_por_ler)(user.pk)
         
         return JsonResponse({
             'success': True,
@@ -221,4 +221,30 @@ class CarImageForm(forms.Form):
             'accept': 'image/*'
         }),
         label='Imagem do Carro'
-    ) 
\ No newline at end of file
+    ) 
+
+class CarImportForm(forms.Form):
+    """Formulário para importar o inventário de um vendedor (CSV ou JSON Lines)"""
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ]
+
+    file = forms.FileField(
+        widget=FileInput(attrs={
+            'class': 'form-control',
+            'accept': '.csv,.jsonl,.json'
+        }),
+        label='Ficheiro'
+    )
+    format = forms.ChoiceField(
+        choices=FORMAT_CHOICES,
+        widget=Select(attrs={'class': 'form-select'}),
+        label='Formato'
+    )
+    sync = forms.BooleanField(
+        required=False,
+        widget=CheckboxInput(attrs={'class': 'form-check-input'}),
+        label='Sincronizar inventário',
+        help_text='O ficheiro é o inventário completo: carros importados que não constem ficam inativos'
+    )
@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+
+
+class InstrumentationConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'instrumentation'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.backends.signals import connection_created
+
+        from . import hooks
+
+        # Contar queries em todas as ligações, de qualquer thread; sem pedido
+        # instrumentado em curso o contador não faz nada (o middleware pode
+        # ser ativado por override_settings nos testes)
+        connection_created.connect(hooks.contar_queries, dispatch_uid='instrumentation_contar_queries')
+
+        # Medir renderização de templates e acessos à cache
+        if settings.INSTRUMENTATION_ENABLED:
+            hooks.instalar()
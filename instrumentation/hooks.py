@@ -0,0 +1,116 @@
+import functools
+import time
+
+from django.core.cache import caches
+from django.template.base import Template
+
+from .metrics import pedido_atual
+
+
+_instalado = False
+
+
+def instalar():
+    """Envolver Template.render e as caches configuradas (uma única vez)"""
+    global _instalado
+    if _instalado:
+        return
+    _instalado = True
+
+    Template.render = _medir_template(Template.render)
+
+    from django.conf import settings
+    patched = set()
+    for alias in settings.CACHES:
+        backend = type(caches[alias])
+        if backend in patched:
+            continue
+        patched.add(backend)
+        backend.get = _contar_get(backend.get)
+        backend.get_many = _contar_get_many(backend.get_many)
+
+
+def _medir_template(render):
+    @functools.wraps(render)
+    def wrapper(self, context):
+        metrics = pedido_atual.get()
+        if metrics is None:
+            return render(self, context)
+
+        # Só o template de topo conta; includes e extends já estão dentro dele
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            metrics.template_depth -= 1
+            if metrics.template_depth == 0:
+                metrics.template_time += time.perf_counter() - started
+
+    return wrapper
+
+
+def contar_queries(sender, connection, **kwargs):
+    """
+    Receiver de connection_created: instalar o contador em cada ligação.
+
+    Cada thread tem os seus objetos de ligação (as do sync_to_async não são
+    as do event loop), por isso o contador fica na própria ligação em vez
+    de ser instalado pelo middleware na thread do pedido.
+    """
+    if _contar_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_contar_query)
+
+
+def _contar_query(execute, sql, params, many, context):
+    metrics = pedido_atual.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.sql_time += time.perf_counter() - started
+
+
+_FALTA = object()
+
+
+def _contar_get(get):
+    @functools.wraps(get)
+    def wrapper(self, key, default=None, version=None):
+        metrics = pedido_atual.get()
+        if metrics is None:
+            return get(self, key, default, version)
+
+        value = get(self, key, _FALTA, version)
+        if value is _FALTA:
+            metrics.cache_misses += 1
+            return default
+        metrics.cache_hits += 1
+        return value
+
+    return wrapper
+
+
+def _contar_get_many(get_many):
+    @functools.wraps(get_many)
+    def wrapper(self, keys, version=None):
+        metrics = pedido_atual.get()
+        if metrics is None:
+            return get_many(self, keys, version)
+
+        keys = list(keys)
+        # Backends sem get_many próprio chamam get(): não contar duas vezes
+        token = pedido_atual.set(None)
+        try:
+            result = get_many(self, keys, version)
+        finally:
+            pedido_atual.reset(token)
+        metrics.cache_hits += len(result)
+        metrics.cache_misses += len(keys) - len(result)
+        return result
+
+    return wrapper
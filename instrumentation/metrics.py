@@ -0,0 +1,118 @@
+import bisect
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+
+# Limites superiores dos buckets dos histogramas
+QUERY_BUCKETS = [0, 1, 2, 5, 10, 20, 50, 100]
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+# Métricas do pedido em curso (propagado para threads de sync_to_async)
+pedido_atual = ContextVar('instrumentation_pedido_atual', default=None)
+
+
+class RequestMetrics:
+    """Contadores de um único pedido"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.duration = 0.0
+
+    def finish(self):
+        self.duration = time.perf_counter() - self.started
+        return self
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def as_dict(self):
+        labels = [f'<={bucket}' for bucket in self.buckets] + [f'>{self.buckets[-1]}']
+        return {
+            'buckets': dict(zip(labels, self.counts)),
+            'sum': round(self.total, 3),
+            'max': round(self.maximum, 3),
+        }
+
+
+class ViewStats:
+    """Agregado de todos os pedidos de um nome de URL"""
+
+    def __init__(self):
+        self.requests = 0
+        self.budget_exceeded = 0
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.sql_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.template_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def record(self, metrics, over_budget):
+        self.requests += 1
+        self.budget_exceeded += int(over_budget)
+        self.queries.observe(metrics.queries)
+        self.latency_ms.observe(metrics.duration * 1000)
+        self.sql_ms.observe(metrics.sql_time * 1000)
+        self.template_ms.observe(metrics.template_time * 1000)
+        self.cache_hits += metrics.cache_hits
+        self.cache_misses += metrics.cache_misses
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'budget_exceeded': self.budget_exceeded,
+            'queries': self.queries.as_dict(),
+            'latency_ms': self.latency_ms.as_dict(),
+            'sql_ms': self.sql_ms.as_dict(),
+            'template_ms': self.template_ms.as_dict(),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+
+class Registry:
+    """Agregados por nome de URL, mantidos em memória neste processo"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, metrics, over_budget=False):
+        with self._lock:
+            stats = self._views.get(view_name)
+            if stats is None:
+                stats = self._views[view_name] = ViewStats()
+            stats.record(metrics, over_budget)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'views': {name: stats.as_dict() for name, stats in sorted(self._views.items())},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = Registry()
@@ -0,0 +1,98 @@
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import RequestMetrics, pedido_atual, registry
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Uma view excedeu o número de queries declarado no seu orçamento"""
+
+
+def orcamento(view_name):
+    """Número máximo de queries declarado para um nome de URL (ou None)"""
+    return settings.INSTRUMENTATION_QUERY_BUDGETS.get(view_name)
+
+
+class InstrumentationMiddleware:
+    """
+    Medir queries SQL, tempo de SQL, renderização de templates e acessos à
+    cache de cada pedido, agregando por nome de URL.
+
+    Os números também seguem no cabeçalho Server-Timing e em
+    `response.metrics`. Quando um pedido excede o orçamento da view é
+    registado um aviso; com INSTRUMENTATION_STRICT_BUDGETS (testes) é
+    lançado QueryBudgetExceeded.
+
+    Funciona com views síncronas e assíncronas: sob ASGI não obriga as
+    views assíncronas a passar por uma thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.INSTRUMENTATION_ENABLED:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = pedido_atual.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            pedido_atual.reset(token)
+        return self._registar(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not settings.INSTRUMENTATION_ENABLED:
+            return await self.get_response(request)
+
+        # As queries do ORM assíncrono correm nas threads do sync_to_async,
+        # com ligações próprias mas com uma cópia deste contexto: o contador
+        # instalado em cada ligação (hooks.contar_queries) vê este pedido
+        metrics = RequestMetrics()
+        token = pedido_atual.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            pedido_atual.reset(token)
+        return self._registar(request, response, metrics)
+
+    def _registar(self, request, response, metrics):
+        metrics.finish()
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        if view_name is None:
+            return response
+
+        budget = orcamento(view_name)
+        over_budget = budget is not None and metrics.queries > budget
+        registry.record(view_name, metrics, over_budget)
+
+        response.metrics = metrics
+        response['Server-Timing'] = (
+            f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.queries} queries", '
+            f'tpl;dur={metrics.template_time * 1000:.1f}, '
+            f'total;dur={metrics.duration * 1000:.1f}'
+        )
+
+        if over_budget:
+            message = f'{view_name} executou {metrics.queries} queries (orçamento: {budget})'
+            if settings.INSTRUMENTATION_STRICT_BUDGETS:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
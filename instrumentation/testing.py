@@ -0,0 +1,26 @@
+from .middleware import orcamento
+
+
+class QueryBudgetTestMixin:
+    """
+    Mixin para TestCase: verifica o orçamento de queries de uma resposta
+    obtida com o cliente de testes (requer InstrumentationMiddleware).
+    """
+
+    def assertWithinQueryBudget(self, response, budget=None):
+        metrics = getattr(response, 'metrics', None)
+        if metrics is None:
+            self.fail('Resposta sem métricas: ative INSTRUMENTATION_ENABLED')
+
+        # O cliente assíncrono expõe o pedido como asgi_request
+        request = getattr(response, 'wsgi_request', None) or response.asgi_request
+        view_name = request.resolver_match.view_name
+        budget = budget if budget is not None else orcamento(view_name)
+        if budget is None:
+            self.fail(f'Sem orçamento de queries declarado para {view_name}')
+
+        self.assertLessEqual(
+            metrics.queries,
+            budget,
+            f'{view_name} executou {metrics.queries} queries (orçamento: {budget})'
+        )
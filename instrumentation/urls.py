@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'instrumentation'
+
+urlpatterns = [
+    path('', views.metrics_view, name='metrics'),
+]
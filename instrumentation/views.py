@@ -0,0 +1,24 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from .metrics import registry
+from .middleware import orcamento
+
+
+@staff_member_required
+@require_http_methods(['GET', 'POST'])
+def metrics_view(request):
+    """
+    Métricas agregadas por nome de URL (apenas administradores).
+
+    POST limpa os agregados deste processo.
+    """
+    if request.method == 'POST':
+        registry.reset()
+        return JsonResponse({'success': True})
+
+    snapshot = registry.snapshot()
+    for view_name, stats in snapshot['views'].items():
+        stats['query_budget'] = orcamento(view_name)
+    return JsonResponse(snapshot)
@@ -0,0 +1,64 @@
+import calendar
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+def calcular_etag(request, *versoes):
+    """
+    ETag fraco da página a partir das versões dos dados que ela mostra.
+
+    Entram também o URL completo (filtros e página), o utilizador, o cookie
+    CSRF (o token vai embutido nos formulários) e a versão da aplicação,
+    para que um deploy com templates novos não devolva 304.
+    """
+    user_id = request.user.pk if request.user.is_authenticated else 'anon'
+    partes = [
+        settings.HTTP_CACHE_VERSION,
+        request.get_full_path(),
+        user_id,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+        *versoes,
+    ]
+    return 'W/"%s"' % hashlib.md5('|'.join(str(parte) for parte in partes).encode()).hexdigest()
+
+
+def _timestamp(last_modified):
+    return calendar.timegm(last_modified.utctimetuple()) if last_modified else None
+
+
+def resposta_nao_modificada(request, etag, last_modified=None):
+    """Resposta 304 (ou 412) se o cliente já tem esta versão da página, senão None"""
+    if not settings.HTTP_CACHE_ENABLED or request.method not in ('GET', 'HEAD'):
+        return None
+
+    response = get_conditional_response(request, etag=etag, last_modified=_timestamp(last_modified))
+    if response is not None:
+        aplicar_politica(request, response, etag, last_modified)
+    return response
+
+
+def aplicar_politica(request, response, etag, last_modified=None):
+    """
+    Validadores e Cache-Control: público (CDN e browser) para anónimos,
+    privado e sempre revalidado para utilizadores autenticados. A resposta
+    varia com o cookie (sessão e CSRF).
+    """
+    if not settings.HTTP_CACHE_ENABLED:
+        return response
+
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(_timestamp(last_modified))
+
+    # Respostas que vão definir cookies (ex.: o primeiro token CSRF, enviado
+    # pelo CsrfViewMiddleware depois da view) não são partilháveis
+    novos_cookies = response.cookies or request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+    if request.user.is_authenticated or novos_cookies:
+        patch_cache_control(response, private=True, no_cache=True, max_age=0)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.HTTP_CACHE_MAX_AGE)
+    patch_vary_headers(response, ('Cookie',))
+    return response
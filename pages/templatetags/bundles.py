@@ -0,0 +1,47 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+from carzone.bundles import BUNDLES
+
+
+register = template.Library()
+
+
+def _url(path):
+    return path if path.startswith(('http://', 'https://', '//')) else static(path)
+
+
+def _ficheiros(nomes, tipo):
+    """Ficheiros de um tipo dos bundles indicados, sem repetições e pela ordem declarada"""
+    ficheiros, vistos = [], set()
+    for nome in nomes:
+        try:
+            bundle = BUNDLES[nome]
+        except KeyError:
+            raise template.TemplateSyntaxError(f'Bundle desconhecido: {nome}')
+        for path in bundle.get(tipo, []):
+            if path not in vistos:
+                vistos.add(path)
+                ficheiros.append((path, bundle.get('defer', False)))
+    return ficheiros
+
+
+@register.simple_tag
+def bundle_css(*nomes):
+    """<link> das folhas de estilo dos bundles (ver carzone.bundles)"""
+    return format_html_join(
+        '\n',
+        '<link rel="stylesheet" type="text/css" href="{}">',
+        ((_url(path),) for path, _ in _ficheiros(nomes, 'css')),
+    )
+
+
+@register.simple_tag
+def bundle_js(*nomes):
+    """<script> dos bundles, com defer quando o bundle o declara"""
+    return format_html_join(
+        '\n',
+        '<script src="{}"{}></script>',
+        ((_url(path), ' defer' if defer else '') for path, defer in _ficheiros(nomes, 'js')),
+    )
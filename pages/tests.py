@@ -1,3 +1,55 @@
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from cars.models import Review
+from cars.testing import criar_carro, criar_utilizador
+from instrumentation.testing import QueryBudgetTestMixin
+
+
+def criar_avaliacao(car):
+    """Avaliação de um comprador ao carro (percorre o bloco de avaliações do detalhe)"""
+    return Review.objects.create(
+        reviewer=criar_utilizador('buyer'),
+        seller=car.seller,
+        car=car,
+        rating=4,
+        title='Bom negócio',
+        comment='Carro como descrito.',
+    )
+
+
+@override_settings(INSTRUMENTATION_ENABLED=True, INSTRUMENTATION_STRICT_BUDGETS=True)
+class OrcamentoQueriesTests(QueryBudgetTestMixin, TestCase):
+
+    def setUp(self):
+        self.car = criar_carro()
+        criar_carro(seller=self.car.seller)
+        self.review = criar_avaliacao(self.car)
+
+    def verificar(self, response):
+        self.assertEqual(response.status_code, 200)
+        # As views são assíncronas: as queries correm noutra thread e têm de ser contadas
+        self.assertGreater(response.metrics.queries, 0)
+        self.assertWithinQueryBudget(response)
+
+    def test_home(self):
+        self.verificar(self.client.get(reverse('home')))
+
+    def test_cars(self):
+        self.verificar(self.client.get(reverse('cars')))
+
+    def test_car_detail(self):
+        response = self.client.get(reverse('car_detail', args=[self.car.id]))
+
+        self.verificar(response)
+        self.assertContains(response, self.review.reviewer.username)
+
+    async def test_car_detail_pelo_handler_assincrono(self):
+        car = await sync_to_async(criar_carro)()
+        review = await sync_to_async(criar_avaliacao)(car)
+
+        response = await self.async_client.get(reverse('car_detail', args=[car.id]))
+
+        self.verificar(response)
+        self.assertContains(response, review.reviewer.username)
@@ -10,5 +10,7 @@ urlpatterns = [
     path("contacts", views.contacts, name="contacts"),
     path("cars", views.cars, name="cars"),
     path("carro/<uuid:car_id>/", views.car_detail, name="car_detail"),
+    path("carro/<uuid:car_id>/precos/", views.car_price_history, name="car_price_history"),
     path("toggle-favorite/", views.toggle_favorite, name="toggle_favorite"),
+    path("pesquisa/sugestoes/", views.search_autocomplete, name="search_autocomplete"),
 ]
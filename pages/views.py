@@ -1,73 +1,113 @@
-from django.shortcuts import render, get_object_or_404
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, get_object_or_404, aget_object_or_404
 from django.core.paginator import Paginator
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
+from django.core.exceptions import ValidationError
+from django.db.models import Count, F, Max
 import json
 
 from forms.car_forms import CarSearchForm
 from entities.car_entity import Car as CarEntity
-from service import car_service, team_service
-from cars.models import Car
+from service import car_service, team_service, favorite_service, search_service
+from cars.models import Brand, Car
+
+from . import conditional
+
+
+async def _carregar_utilizador(request):
+    """
+    Resolver request.user sem bloquear o event loop; o resto do pedido
+    (ETag, templates) reutiliza o utilizador já carregado.
+    """
+    auser = getattr(request, 'auser', None)
+    if auser is not None:
+        request.user = await auser()
+    return request.user
+
+
+async def _lista(queryset):
+    """Avaliar um queryset com o ORM assíncrono"""
+    return [obj async for obj in queryset]
 
 
-def home(request):
+async def home(request):
     """Página inicial"""
-    teams = team_service.list_team()
-    try:
-        featured_cars = Car.objects.filter(
-            status='active',
-            featured=True
-        ).select_related('brand', 'car_model', 'seller').prefetch_related('photos')[:6]
-    except Exception as e:
-        featured_cars = Car.objects.filter(
-            status='active'
-        ).select_related('brand', 'car_model', 'seller').prefetch_related('photos')[:6]
-    
-    latest_cars = Car.objects.filter(
-        status='active'
-    ).select_related('brand', 'car_model', 'seller').prefetch_related('photos').order_by('-created_at')[:6]
+    await _carregar_utilizador(request)
     
-    total_cars = Car.objects.filter(status='active').count()
+    # Uma query dá o total de carros ativos e a versão da página
+    catalogo = await Car.objects.filter(status='active').aaggregate(total=Count('id'), last_modified=Max('updated_at'))
+    etag = conditional.calcular_etag(request, catalogo['total'], catalogo['last_modified'])
+    not_modified = conditional.resposta_nao_modificada(request, etag, catalogo['last_modified'])
+    if not_modified is not None:
+        return not_modified
     
-    from cars.models import Brand
-    brands = Brand.objects.filter(is_active=True).order_by('name')[:10]
+    cars = Car.objects.filter(status='active').select_related('brand', 'car_model', 'seller').prefetch_related('photos')
+    teams, featured_cars, latest_cars, brands = await asyncio.gather(
+        _lista(team_service.list_team()),
+        _lista(cars.filter(featured=True)[:6]),
+        _lista(cars.order_by('-created_at')[:6]),
+        _lista(Brand.objects.filter(is_active=True).order_by('name')[:10]),
+    )
     years = range(2024, 2010, -1)
     
     context = {
         "teams": teams,
         "featured_cars": featured_cars,
         "latest_cars": latest_cars,
-        "total_cars": total_cars,
+        "total_cars": catalogo['total'],
         "brands": brands,
         "years": years,
     }
     
-    return render(request, 'pages/home.html', context)
+    response = await sync_to_async(render)(request, 'pages/home.html', context)
+    return conditional.aplicar_politica(request, response, etag, catalogo['last_modified'])
 
 
-def car_detail(request, car_id):
+async def car_detail(request, car_id):
     """Página de detalhes do carro"""
-    car = get_object_or_404(Car, id=car_id, status__in=['active', 'reserved', 'sold'])
+    user = await _carregar_utilizador(request)
+    car = await aget_object_or_404(
+        Car.objects.select_related('brand', 'car_model', 'seller').prefetch_related('photos'),
+        id=car_id,
+        status__in=['active', 'reserved', 'sold']
+    )
     
-    # Incrementar visualizações
-    car.views += 1
-    car.save()
+    # Carros similares, avaliações e favorito não dependem uns dos outros
+    similar_cars, reviews, is_favorite = await asyncio.gather(
+        _lista(Car.objects.filter(
+            brand_id=car.brand_id,
+            status='active'
+        ).exclude(id=car.id).select_related('brand', 'car_model').prefetch_related('photos')[:4]),
+        _lista(car.reviews.select_related('reviewer')),
+        sync_to_async(favorite_service.eh_favorito)(user, car.id),
+    )
     
-    # Carros similares
-    similar_cars = Car.objects.filter(
-        brand=car.brand,
-        status='active'
-    ).exclude(id=car.id).select_related('brand', 'car_model').prefetch_related('photos')[:4]
+    # A página depende do carro, dos similares, das avaliações e do favorito
+    # (as visualizações podem ficar desatualizadas numa resposta 304)
+    last_modified = max(
+        [car.updated_at] + [similar.updated_at for similar in similar_cars] + [review.updated_at for review in reviews]
+    )
+    etag = conditional.calcular_etag(
+        request,
+        last_modified,
+        [similar.id for similar in similar_cars],
+        len(reviews),
+        is_favorite,
+    )
     
-    # Verificar se é favorito
-    is_favorite = False
-    if request.user.is_authenticated:
-        from cars.models import Favorite
-        is_favorite = Favorite.objects.filter(user=request.user, car=car).exists()
+    # Incrementar visualizações sem tocar em updated_at (a versão da página)
+    await Car.objects.filter(pk=car.pk).aupdate(views=F('views') + 1)
+    car.views += 1
+    
+    not_modified = conditional.resposta_nao_modificada(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
     
     # Calcular média de avaliações
-    reviews = car.reviews.all()
     avg_rating = 0
     if reviews:
         total_rating = sum(review.rating for review in reviews)
@@ -82,7 +122,37 @@ def car_detail(request, car_id):
         'reviews_count': len(reviews),
     }
     
-    return render(request, 'pages/car-details.html', context)
+    response = await sync_to_async(render)(request, 'pages/car-details.html', context)
+    return conditional.aplicar_politica(request, response, etag, last_modified)
+
+
+def car_price_history(request, car_id):
+    """Série compacta de preços de um carro (JSON)"""
+    car = get_object_or_404(
+        Car.objects.only('id', 'price', 'status', 'created_at'),
+        id=car_id,
+        status__in=['active', 'reserved', 'sold']
+    )
+
+    changes = car.price_history.order_by('created_at').values_list(
+        'created_at', 'old_price', 'new_price'
+    )
+
+    # Cada ponto é [timestamp ISO, preço]; o primeiro ponto é o preço inicial
+    series = []
+    for created_at, old_price, new_price in changes:
+        if not series:
+            series.append([car.created_at.isoformat(), float(old_price)])
+        series.append([created_at.isoformat(), float(new_price)])
+
+    if not series:
+        series.append([car.created_at.isoformat(), float(car.price)])
+
+    return JsonResponse({
+        'car_id': str(car.id),
+        'current_price': float(car.price),
+        'series': series,
+    })
 
 
 def about(request):
@@ -108,8 +178,9 @@ def contacts(request):
     return render(request, 'pages/contacts.html', context)
 
 
-def cars(request):
+async def cars(request):
     """Página de listagem de carros com filtros"""
+    user = await _carregar_utilizador(request)
     form = CarSearchForm(request.GET or None)
     
     # Parâmetros de pesquisa
@@ -163,21 +234,29 @@ def cars(request):
     else:  # default: -created_at
         cars = cars.order_by('-created_at')
     
-    # Paginação
+    # Versão do resultado: total e última alteração dos carros filtrados
+    resultado, versao_favoritos = await asyncio.gather(
+        cars.aaggregate(total=Count('id'), last_modified=Max('updated_at')),
+        sync_to_async(favorite_service.versao_favoritos)(user),
+    )
+    etag = conditional.calcular_etag(request, resultado['total'], resultado['last_modified'], versao_favoritos)
+    not_modified = conditional.resposta_nao_modificada(request, etag, resultado['last_modified'])
+    if not_modified is not None:
+        return not_modified
+    
+    # Paginação (o total já veio no agregado, sem segundo COUNT)
     paginator = Paginator(cars, 12)  # 12 carros por página
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator.count = resultado['total']
+    page_obj = paginator.get_page(request.GET.get('page'))
+    page_obj.object_list = await _lista(page_obj.object_list)
     
-    # Dados para filtros
-    brands = car_service.listar_brands()
+    # Dados para filtros e favoritos do utilizador, apenas entre os carros visíveis na página
+    brands, user_favorites = await asyncio.gather(
+        _lista(car_service.listar_brands()),
+        sync_to_async(favorite_service.verificar_favoritos)(user, [car.id for car in page_obj]),
+    )
     years_range = range(2024, 1999, -1)
     
-    # Favoritos do utilizador (se autenticado)
-    user_favorites = []
-    if request.user.is_authenticated:
-        from cars.models import Favorite
-        user_favorites = list(Favorite.objects.filter(user=request.user).values_list('car_id', flat=True))
-    
     context = {
         'form': form,
         'page_obj': page_obj,
@@ -201,7 +280,13 @@ def cars(request):
         }
     }
     
-    return render(request, 'pages/cars.html', context)
+    response = await sync_to_async(render)(request, 'pages/cars.html', context)
+    return conditional.aplicar_politica(request, response, etag, resultado['last_modified'])
+
+
+def search_autocomplete(request):
+    """Sugestões de marcas, modelos e cidades para o formulário de pesquisa (AJAX)"""
+    return JsonResponse(search_service.autocompletar(request.GET.get('q', '')))
 
 
 @login_required
@@ -209,56 +294,30 @@ def cars(request):
 def toggle_favorite(request):
     """Toggle favorito de um carro"""
     try:
-        print(f"Toggle favorite - User: {request.user}, Method: {request.method}")
-        print(f"Request body: {request.body}")
-        
         data = json.loads(request.body)
         car_id = data.get('car_id')
         
-        print(f"Car ID recebido: {car_id}")
-        
         if not car_id:
             return JsonResponse({'success': False, 'message': 'ID do carro não fornecido'})
         
-        car = get_object_or_404(Car, id=car_id)
-        print(f"Carro encontrado: {car.title}")
-        
-        from cars.models import Favorite
-        favorite, created = Favorite.objects.get_or_create(
-            user=request.user,
-            car=car
-        )
+        result = favorite_service.alternar_favorito(request.user, car_id)
+        if result is None:
+            return JsonResponse({'success': False, 'message': 'Carro não encontrado'}, status=404)
         
-        if not created:
-            # Se já existia, remove
-            favorite.delete()
-            is_favorite = False
-            message = 'Removido dos favoritos'
-            print(f"Favorito removido para carro {car_id}")
-        else:
-            # Se não existia, foi criado
-            is_favorite = True
-            message = 'Adicionado aos favoritos'
-            print(f"Favorito adicionado para carro {car_id}")
+        is_favorite, favorites_count = result
+        message = 'Adicionado aos favoritos' if is_favorite else 'Removido dos favoritos'
         
-        response_data = {
+        return JsonResponse({
             'success': True,
             'is_favorite': is_favorite,
+            'favorites_count': favorites_count,
             'message': message
-        }
-        print(f"Resposta: {response_data}")
-        
-        return JsonResponse(response_data)
+        })
         
+    except (json.JSONDecodeError, ValidationError):
+        return JsonResponse({'success': False, 'message': 'Pedido inválido'})
     except Exception as e:
-        print(f"Erro no toggle_favorite: {str(e)}")
-        import traceback
-        traceback.print_exc()
         return JsonResponse({
             'success': False,
             'message': str(e)
         })
-
-
-
-
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from cars.models_archive import NotificationArchive, ChatNotificationArchive, ChatMessageArchive
+from cars.models_chat import ChatRoom, ChatMessage, ChatNotification
+from cars.models_purchase import Notification
+
+
+ARQUIVO_BATCH_SIZE = 1000
+
+CAMPOS_NOTIFICACAO = [
+    'id', 'user_id', 'type', 'title', 'message',
+    'purchase_request_id', 'purchase_id', 'car_id', 'created_at', 'read_at',
+]
+CAMPOS_NOTIFICACAO_CHAT = [
+    'id', 'recipient_id', 'chat_room_id', 'notification_type', 'title', 'content',
+    'message_count', 'created_at', 'read_at',
+]
+CAMPOS_MENSAGEM = [
+    'id', 'chat_room_id', 'sender_id', 'message_type', 'content',
+    'attachment', 'attachment_name', 'created_at', 'is_edited', 'is_deleted',
+]
+
+
+def _mover_em_lotes(queryset, archive_model, fields, batch_size):
+    """
+    Copiar as linhas para a tabela de arquivo e apagá-las da tabela ativa.
+
+    Cada lote é uma transação (INSERT em lote + DELETE por chave primária),
+    por isso uma interrupção nunca deixa linhas duplicadas ou perdidas.
+    """
+    total = 0
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.values(*fields)[:batch_size])
+            if not rows:
+                return total
+
+            archive_model.objects.bulk_create(
+                [archive_model(**row) for row in rows],
+                ignore_conflicts=True
+            )
+            queryset.model.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+
+        total += len(rows)
+        if len(rows) < batch_size:
+            return total
+
+
+def arquivar_notificacoes(days=None, batch_size=ARQUIVO_BATCH_SIZE):
+    """
+    Mover notificações lidas com mais de `days` dias para o arquivo.
+
+    Retorna (notificacoes, notificacoes_chat) arquivadas.
+    """
+    days = days or settings.NOTIFICATION_ARCHIVE_DAYS
+    cutoff = timezone.now() - timedelta(days=days)
+
+    notifications = _mover_em_lotes(
+        Notification.objects.filter(is_read=True, created_at__lt=cutoff),
+        NotificationArchive,
+        CAMPOS_NOTIFICACAO,
+        batch_size
+    )
+    chat_notifications = _mover_em_lotes(
+        ChatNotification.objects.filter(is_read=True, created_at__lt=cutoff),
+        ChatNotificationArchive,
+        CAMPOS_NOTIFICACAO_CHAT,
+        batch_size
+    )
+    return notifications, chat_notifications
+
+
+def arquivar_chats(days=None, batch_size=ARQUIVO_BATCH_SIZE):
+    """
+    Arquivar as mensagens de salas fechadas há mais de `days` dias.
+
+    As mensagens e as notificações já lidas passam para o arquivo e a sala
+    fica com status 'archived' (apenas de leitura); as notificações por ler
+    continuam ativas. Retorna (salas, mensagens) arquivadas.
+    """
+    days = days or settings.CHAT_ARCHIVE_DAYS
+    cutoff = timezone.now() - timedelta(days=days)
+
+    room_ids = list(
+        ChatRoom.objects.filter(status='closed', closed_at__lt=cutoff).values_list('id', flat=True)
+    )
+
+    messages = 0
+    for room_id in room_ids:
+        # As notificações que apontam para as mensagens seriam apagadas em cascata:
+        # as lidas vão para o arquivo, as por ler ficam ativas sem a mensagem
+        _mover_em_lotes(
+            ChatNotification.objects.filter(chat_room_id=room_id, is_read=True),
+            ChatNotificationArchive,
+            CAMPOS_NOTIFICACAO_CHAT,
+            batch_size
+        )
+        ChatNotification.objects.filter(
+            chat_room_id=room_id,
+            is_read=False,
+            message__isnull=False
+        ).update(message=None)
+        messages += _mover_em_lotes(
+            ChatMessage.objects.filter(chat_room_id=room_id),
+            ChatMessageArchive,
+            CAMPOS_MENSAGEM,
+            batch_size
+        )
+        ChatRoom.objects.filter(id=room_id, status='closed').update(status='archived')
+
+    return len(room_ids), messages
@@ -240,4 +240,4 @@ def obter_estatisticas_vendedor(seller):
 
 def listar_cars_recentes_vendedor(seller, limit=6):
     """Listar carros recentes de um vendedor"""
-    return Car.objects.filter(seller=seller).order_by('-created_at')[:limit] 
\ No newline at end of file
+    return Car.objects.filter(seller=seller).com_foto_principal().order_by('-created_at')[:limit]
\ No newline at end of file
@@ -0,0 +1,57 @@
+import math
+
+from django.conf import settings
+from django.utils import timezone, translation
+
+from cars.models import Car
+
+
+# Cartões por página na listagem pública (ver pages.views.cars)
+CARDS_POR_PAGINA = 12
+
+
+def chave_card(car, variante):
+    """
+    Chave do fragmento de um cartão: muda quando o carro é gravado
+    (updated_at, também avançado quando as fotos mudam), com o idioma dos
+    textos das escolhas e com a versão da aplicação (templates novos).
+    """
+    versao = car.updated_at.timestamp() if car.updated_at else 0
+    return (
+        f'car_card:{variante}:{car.pk}:{versao}:'
+        f'{translation.get_language()}:{settings.HTTP_CACHE_VERSION}'
+    )
+
+
+def tocar_carro(car_id):
+    """Avançar updated_at sem passar por save() (invalida cartões e ETags)"""
+    Car.objects.filter(pk=car_id).update(updated_at=timezone.now())
+
+
+def aquecer_cards(limit=120):
+    """
+    Renderizar a página inicial e as primeiras páginas da listagem (os
+    `limit` anúncios mais recentes) para preencher a cache dos cartões
+    antes do tráfego. Retorna o número de páginas renderizadas.
+    """
+    # Imports locais: a template tag cachecard carrega este módulo em todos
+    # os workers e só o comando warm_car_cards precisa do django.test
+    from asgiref.sync import async_to_sync
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+    from django.urls import reverse
+
+    from pages import views
+
+    total = min(limit, Car.objects.filter(status='active').count())
+    pedidos = [(reverse('home'), views.home, {})] + [
+        (reverse('cars'), views.cars, {'page': page})
+        for page in range(1, math.ceil(total / CARDS_POR_PAGINA) + 1)
+    ]
+
+    factory = RequestFactory()
+    for path, view, params in pedidos:
+        request = factory.get(path, params)
+        request.user = AnonymousUser()
+        async_to_sync(view)(request)
+    return len(pedidos)
@@ -0,0 +1,204 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+
+from carzone.routers import leitura_replica
+from cars.models import Car, PriceHistory
+from cars.models_purchase import Purchase
+
+
+# Linhas lidas da base de dados de cada vez (cursor do lado do servidor em PostgreSQL)
+EXPORT_CHUNK_SIZE = 2000
+
+# Sufixos aceites nos filtros, os mesmos que o list_filter do admin coloca no URL
+LOOKUPS_PERMITIDOS = {'', 'exact', 'id__exact', 'gte', 'lt', 'lte', 'isnull'}
+
+# Parâmetros do pedido que não são filtros
+PARAMETROS_RESERVADOS = {'format', 'o', 'q', 'p'}
+
+EXPORTACOES = {
+    'cars': {
+        'queryset': Car.objects.all,
+        'owner': 'seller',
+        # Mesmos campos que o list_filter de CarAdmin
+        'filters': {
+            'status', 'featured', 'brand', 'fuel_type', 'transmission',
+            'condition', 'year', 'city', 'created_at',
+        },
+        'columns': [
+            ('id', 'id'),
+            ('license_plate', 'license_plate'),
+            ('title', 'title'),
+            ('brand', 'brand__name'),
+            ('model', 'car_model__name'),
+            ('version', 'version'),
+            ('year', 'year'),
+            ('fuel_type', 'fuel_type'),
+            ('transmission', 'transmission'),
+            ('condition', 'condition'),
+            ('mileage', 'mileage'),
+            ('price', 'price'),
+            ('status', 'status'),
+            ('featured', 'featured'),
+            ('city', 'city'),
+            ('district', 'district'),
+            ('seller', 'seller__username'),
+            ('views', 'views'),
+            ('favorites_count', 'favorites_count'),
+            ('created_at', 'created_at'),
+            ('sold_at', 'sold_at'),
+        ],
+    },
+    'purchases': {
+        'queryset': Purchase.objects.all,
+        'owner': 'seller',
+        'filters': {'status', 'payment_status', 'created_at', 'seller'},
+        'columns': [
+            ('id', 'id'),
+            ('created_at', 'created_at'),
+            ('status', 'status'),
+            ('payment_status', 'payment_status'),
+            ('car_id', 'car_id'),
+            ('license_plate', 'car__license_plate'),
+            ('car', 'car__title'),
+            ('seller', 'seller__username'),
+            ('buyer', 'buyer__username'),
+            ('buyer_name', 'buyer_name'),
+            ('buyer_email', 'buyer_email'),
+            ('purchase_price', 'purchase_price'),
+            ('payment_method', 'payment_method'),
+            ('transaction_id', 'transaction_id'),
+            ('payment_confirmed_at', 'payment_confirmed_at'),
+            ('delivered_at', 'delivered_at'),
+            ('completed_at', 'completed_at'),
+        ],
+    },
+    'price_history': {
+        'queryset': PriceHistory.objects.all,
+        'owner': 'car__seller',
+        'filters': {'created_at'},
+        'columns': [
+            ('id', 'id'),
+            ('created_at', 'created_at'),
+            ('car_id', 'car_id'),
+            ('license_plate', 'car__license_plate'),
+            ('old_price', 'old_price'),
+            ('new_price', 'new_price'),
+            ('change_reason', 'change_reason'),
+        ],
+    },
+}
+
+
+class _Eco:
+    """Pseudo-ficheiro para o csv.writer: devolve a linha em vez de a guardar"""
+
+    def write(self, value):
+        return value
+
+
+def filtrar(queryset, filtros, permitidos):
+    """
+    Aplicar filtros no formato do URL do admin (ex.: status__exact=active,
+    brand__id__exact=3, created_at__gte=2025-01-01). Campos fora de
+    `permitidos` ou lookups desconhecidos lançam ValueError.
+    """
+    lookups = {}
+    for key, value in filtros.items():
+        if key in PARAMETROS_RESERVADOS:
+            continue
+        name, _, lookup = key.partition('__')
+        if name not in permitidos or lookup not in LOOKUPS_PERMITIDOS:
+            raise ValueError(f'Filtro não suportado: {key}')
+        if lookup == 'isnull':
+            value = value in ('1', 'true', 'True')
+        lookups[key] = value
+    return queryset.filter(**lookups)
+
+
+def linhas(nome, filtros=None, seller=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Cabeçalho e tuplos (values_list) de uma exportação, lidos em blocos.
+
+    Com `seller` a exportação fica restrita aos dados desse vendedor.
+    """
+    try:
+        exportacao = EXPORTACOES[nome]
+    except KeyError:
+        raise ValueError(f'Exportação desconhecida: {nome}')
+
+    queryset = filtrar(exportacao['queryset'](), filtros or {}, exportacao['filters'])
+    if seller is not None:
+        queryset = queryset.filter(**{exportacao['owner']: seller})
+
+    headers = [header for header, _ in exportacao['columns']]
+    rows = queryset.order_by('pk').values_list(
+        *[lookup for _, lookup in exportacao['columns']]
+    ).iterator(chunk_size=chunk_size)
+    return headers, rows
+
+
+def exportar(nome, formato='csv', filtros=None, seller=None, chunk_size=EXPORT_CHUNK_SIZE, replica=False):
+    """
+    Gerador de texto (uma linha de cada vez) em CSV ou JSON Lines.
+
+    Nada é acumulado em memória: serve para StreamingHttpResponse ou para
+    escrever diretamente num ficheiro. Os filtros são validados logo aqui,
+    antes da primeira linha. Com `replica=True` as linhas são lidas de uma
+    réplica (o gerador é consumido depois de o middleware terminar).
+    """
+    if formato not in ('csv', 'jsonl'):
+        raise ValueError(f'Formato não suportado: {formato}')
+
+    headers, rows = linhas(nome, filtros, seller, chunk_size)
+    chunks = _csv(headers, rows) if formato == 'csv' else _jsonl(headers, rows)
+    return _em_replica(chunks) if replica else chunks
+
+
+def exportar_async(nome, formato='csv', filtros=None, seller=None, chunk_size=EXPORT_CHUNK_SIZE, replica=False):
+    """
+    Como exportar, mas devolve um gerador assíncrono para StreamingHttpResponse
+    sob ASGI: com um gerador síncrono o Django consome-o todo com
+    sync_to_async(list) antes de enviar a primeira linha.
+
+    As linhas são lidas em blocos de `chunk_size`, cada bloco numa chamada
+    sync_to_async (thread-sensitive: sempre a mesma thread e a mesma ligação,
+    onde vive o cursor do lado do servidor). Os filtros são validados aqui.
+    """
+    chunks = exportar(nome, formato, filtros, seller, chunk_size)
+    return _em_blocos(chunks, chunk_size, replica)
+
+
+async def _em_blocos(chunks, chunk_size, replica):
+    proximos = sync_to_async(_proximos)
+    while True:
+        bloco = await proximos(chunks, chunk_size, replica)
+        if not bloco:
+            return
+        for chunk in bloco:
+            yield chunk
+
+
+def _proximos(chunks, chunk_size, replica):
+    # A réplica é escolhida na primeira leitura; o resto do cursor segue nela
+    with leitura_replica(replica):
+        return list(islice(chunks, chunk_size))
+
+
+def _em_replica(chunks):
+    with leitura_replica():
+        yield from chunks
+
+
+def _csv(headers, rows):
+    writer = csv.writer(_Eco())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _jsonl(headers, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(headers, row)), default=str, ensure_ascii=False) + '\n'
@@ -0,0 +1,156 @@
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from cars.models import Car, Favorite
+from carzone.caches import cache_partilhada
+
+
+# Tempo de vida das entradas de pertença na cache (24 horas). Só é usada
+# com uma cache partilhada: na LocMemCache um toggle não chegaria aos outros
+# workers e o coração (e o ETag) ficariam errados até expirar.
+FAVORITOS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def chave_favorito(user_id, car_id):
+    """Chave de cache da pertença de um carro aos favoritos de um utilizador"""
+    return f'favorito:{user_id}:{_normalizar_id(car_id).hex}'
+
+
+def chave_versao(user_id):
+    """Chave da versão dos favoritos de um utilizador (muda a cada alteração)"""
+    return f'favoritos:versao:{user_id}'
+
+
+def versao_favoritos(user):
+    """Versão atual dos favoritos, usada nos ETags das páginas com corações"""
+    if not user.is_authenticated:
+        return 0
+    if cache_partilhada():
+        return cache.get(chave_versao(user.pk), 0)
+
+    # Sem cache partilhada: cada alteração muda o total ou a data mais recente
+    versao = Favorite.objects.filter(user=user).aggregate(total=Count('id'), ultimo=Max('created_at'))
+    return f"{versao['total']}:{versao['ultimo'].timestamp() if versao['ultimo'] else 0}"
+
+
+def _normalizar_id(car_id):
+    return car_id if isinstance(car_id, uuid.UUID) else uuid.UUID(str(car_id))
+
+
+def alternar_favorito(user, car_id):
+    """
+    Adicionar ou remover um carro dos favoritos do utilizador.
+
+    Usa um único INSERT ... ON CONFLICT (ou DELETE ... RETURNING) e ajusta
+    o contador do carro na mesma transação, sem recontar os favoritos.
+    Retorna (is_favorite, favorites_count) ou None se o carro não existir.
+    """
+    using = router.db_for_write(Favorite)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+
+    favorite_table = quote(Favorite._meta.db_table)
+    car_table = quote(Car._meta.db_table)
+    car_pk = Car._meta.pk.get_db_prep_value(car_id, connection)
+    created_at = Favorite._meta.get_field('created_at').get_db_prep_value(timezone.now(), connection)
+
+    try:
+        with transaction.atomic(using=using):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'INSERT INTO {favorite_table} (user_id, car_id, created_at) '
+                    f'VALUES (%s, %s, %s) '
+                    f'ON CONFLICT (user_id, car_id) DO NOTHING RETURNING id',
+                    [user.pk, car_pk, created_at]
+                )
+                is_favorite = cursor.fetchone() is not None
+
+                if is_favorite:
+                    delta = 1
+                else:
+                    cursor.execute(
+                        f'DELETE FROM {favorite_table} '
+                        f'WHERE user_id = %s AND car_id = %s RETURNING id',
+                        [user.pk, car_pk]
+                    )
+                    # Se outro pedido já removeu o favorito, o contador fica igual
+                    delta = -1 if cursor.fetchone() is not None else 0
+
+                cursor.execute(
+                    f'UPDATE {car_table} SET favorites_count = CASE '
+                    f'WHEN favorites_count + %s < 0 THEN 0 '
+                    f'ELSE favorites_count + %s END '
+                    f'WHERE id = %s RETURNING favorites_count',
+                    [delta, delta, car_pk]
+                )
+                row = cursor.fetchone()
+
+            if row is None:
+                # Carro inexistente: desfazer o INSERT
+                transaction.set_rollback(True, using=using)
+                return None
+    except IntegrityError:
+        return None
+
+    if cache_partilhada():
+        cache.set(chave_favorito(user.pk, car_id), is_favorite, FAVORITOS_CACHE_TIMEOUT)
+        _nova_versao(user.pk)
+    return is_favorite, row[0]
+
+
+def verificar_favoritos(user, car_ids):
+    """
+    Verificar em lote quais dos carros indicados estão nos favoritos.
+
+    Consulta apenas os carros pedidos (ex.: os 12 visíveis numa página):
+    primeiro na cache partilhada, depois com uma única query para os que
+    faltarem (sem cache partilhada, sempre com essa query).
+    Retorna o conjunto de UUIDs favoritos.
+    """
+    if not user.is_authenticated:
+        return set()
+
+    keys = {chave_favorito(user.pk, car_id): _normalizar_id(car_id) for car_id in car_ids}
+    if not keys:
+        return set()
+
+    if not cache_partilhada():
+        return set(Favorite.objects.filter(user=user, car_id__in=keys.values()).values_list('car_id', flat=True))
+
+    cached = cache.get_many(keys.keys())
+    favoritos = {keys[key] for key, value in cached.items() if value}
+
+    em_falta = [car_id for key, car_id in keys.items() if key not in cached]
+    if em_falta:
+        encontrados = set(
+            Favorite.objects.filter(user=user, car_id__in=em_falta).values_list('car_id', flat=True)
+        )
+        cache.set_many(
+            {chave_favorito(user.pk, car_id): car_id in encontrados for car_id in em_falta},
+            FAVORITOS_CACHE_TIMEOUT
+        )
+        favoritos |= encontrados
+
+    return favoritos
+
+
+def eh_favorito(user, car_id):
+    """Verificar se um único carro está nos favoritos do utilizador"""
+    return _normalizar_id(car_id) in verificar_favoritos(user, [car_id])
+
+
+def invalidar_favorito(user_id, car_id):
+    """Remover da cache a pertença de um carro aos favoritos"""
+    if cache_partilhada():
+        cache.delete(chave_favorito(user_id, car_id))
+        _nova_versao(user_id)
+
+
+def _nova_versao(user_id):
+    # Sem expiração: se voltasse a 0 um ETag antigo podia voltar a coincidir
+    cache.set(chave_versao(user_id), time.time_ns(), None)
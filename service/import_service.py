@@ -0,0 +1,322 @@
+import csv
+import hashlib
+import io
+import json
+from decimal import Decimal
+import unicodedata
+from dataclasses import dataclass, field as dataclass_field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from cars.models import Brand, CarModel, Car, CarPhoto, PriceHistory
+from cars.signals import price_changed
+
+
+# Carros gravados por INSERT ... ON CONFLICT
+IMPORT_BATCH_SIZE = 500
+
+# Colunas aceites no ficheiro (nomes dos campos de Car, mais `brand`, `model` e `photos`)
+CAMPOS_IMPORTACAO = [
+    'title', 'description', 'version', 'year', 'color', 'fuel_type', 'transmission',
+    'engine_size', 'power', 'mileage', 'doors', 'seats', 'condition', 'license_plate',
+    'registration_date', 'inspection_valid_until', 'insurance_valid_until',
+    'price', 'original_price', 'negotiable', 'city', 'district', 'postal_code',
+    'air_conditioning', 'gps', 'bluetooth', 'parking_sensors', 'backup_camera',
+    'leather_seats', 'electric_windows', 'central_locking', 'abs_brakes', 'airbags',
+]
+
+# Campos reescritos quando a matrícula já existe (estado, vendedor e contadores mantêm-se)
+CAMPOS_ATUALIZADOS = ['brand', 'car_model', 'updated_at', 'import_fingerprint'] + [
+    name for name in CAMPOS_IMPORTACAO if name != 'license_plate'
+]
+
+VALORES_VERDADEIROS = {'1', 'true', 't', 'sim', 's', 'yes', 'y', 'x'}
+VALORES_FALSOS = {'0', 'false', 'f', 'nao', 'não', 'n', 'no', ''}
+
+
+@dataclass
+class RelatorioImportacao:
+    """Resultado de uma importação"""
+    total: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deactivated: int = 0
+    errors: list = dataclass_field(default_factory=list)
+
+    def add_error(self, line, license_plate, message):
+        self.errors.append({'line': line, 'license_plate': license_plate, 'error': message})
+
+
+def normalizar(texto):
+    """Normalizar nomes para comparação (minúsculas, sem acentos nem espaços extra)"""
+    texto = unicodedata.normalize('NFKD', str(texto or '')).encode('ascii', 'ignore').decode()
+    return ' '.join(texto.lower().split())
+
+
+def ler_linhas(stream, formato):
+    """
+    Ler linhas de um ficheiro CSV ou JSON Lines de forma preguiçosa.
+
+    Aceita ficheiros binários (ex.: uploads) ou de texto e produz
+    (numero_da_linha, dicionario) sem carregar o ficheiro em memória.
+    Linhas JSON ilegíveis ou que não são um objeto não interrompem a
+    leitura: seguem como um ValidationError no lugar do dicionário. Um CSV
+    malformado também produz um ValidationError, mas termina a leitura (o
+    leitor de CSV não retoma depois de um erro).
+    """
+    if isinstance(stream.read(0), bytes):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if formato == 'csv':
+        reader = csv.DictReader(stream)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield reader.line_num, ValidationError(f'CSV inválido: {e}')
+                return
+            yield reader.line_num, row
+    elif formato == 'jsonl':
+        for line_num, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_num, ValidationError(f'JSON inválido: {e.msg} (coluna {e.colno})')
+                continue
+            if not isinstance(row, dict):
+                yield line_num, ValidationError('A linha não é um objeto JSON')
+                continue
+            yield line_num, row
+    else:
+        raise ValueError(f'Formato não suportado: {formato}')
+
+
+class ResolvedorCatalogo:
+    """Cache em memória de marcas e modelos, carregada uma vez por importação"""
+
+    def __init__(self):
+        self.brands = {
+            normalizar(name): brand_id
+            for brand_id, name in Brand.objects.filter(is_active=True).values_list('id', 'name')
+        }
+        self.models = {
+            (brand_id, normalizar(name)): model_id
+            for model_id, brand_id, name in CarModel.objects.values_list('id', 'brand_id', 'name')
+        }
+
+    def resolver(self, brand_name, model_name):
+        brand_id = self.brands.get(normalizar(brand_name))
+        if brand_id is None:
+            raise ValidationError(f'Marca desconhecida: {brand_name}')
+        model_id = self.models.get((brand_id, normalizar(model_name)))
+        if model_id is None:
+            raise ValidationError(f'Modelo desconhecido: {brand_name} {model_name}')
+        return brand_id, model_id
+
+
+def construir_carro(row, seller, resolvedor):
+    """Converter uma linha num Car validado (sem gravar nem consultar a base de dados)"""
+    brand_id, model_id = resolvedor.resolver(row.get('brand'), row.get('model'))
+
+    values = {}
+    for name in CAMPOS_IMPORTACAO:
+        value = row.get(name)
+        if isinstance(value, str):
+            value = value.strip()
+        if value in (None, ''):
+            continue
+        model_field = Car._meta.get_field(name)
+        if model_field.get_internal_type() == 'BooleanField' and isinstance(value, str):
+            lowered = value.lower()
+            if lowered not in VALORES_VERDADEIROS | VALORES_FALSOS:
+                raise ValidationError({name: f'Valor booleano inválido: {value}'})
+            value = lowered in VALORES_VERDADEIROS
+        values[name] = model_field.to_python(value)
+
+    values['license_plate'] = values.get('license_plate', '').upper()
+    car = Car(seller=seller, brand_id=brand_id, car_model_id=model_id, status='active', **values)
+    if not car.title:
+        car.title = f"{row.get('brand')} {row.get('model')} {car.year or ''}".strip()
+    if not car.description:
+        car.description = car.title
+
+    # FKs já resolvidas pela cache; unicidade tratada pelo upsert
+    car.clean_fields(exclude=['seller', 'brand', 'car_model'])
+    car.import_fingerprint = impressao_digital(car)
+    return car
+
+
+def impressao_digital(car):
+    """SHA-256 dos campos importados, normalizados (ex.: 15000 e 15000.00 são iguais)"""
+    values = [car.brand_id, car.car_model_id]
+    for name in CAMPOS_IMPORTACAO:
+        value = getattr(car, name)
+        if isinstance(value, Decimal):
+            value = format(value.normalize(), 'f')
+        values.append(value)
+    payload = json.dumps(values, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def importar_carros(rows, seller, batch_size=IMPORT_BATCH_SIZE, sync=False):
+    """
+    Importar carros de um vendedor a partir de linhas (ver ler_linhas).
+
+    As linhas são validadas em memória e gravadas em lotes com
+    bulk_create(update_conflicts=True) pela matrícula. Matrículas de outros
+    vendedores são rejeitadas e as descidas de preço continuam a ficar no
+    histórico e a emitir price_changed. Retorna um RelatorioImportacao.
+
+    Com `sync=True` o ficheiro é tratado como o inventário completo: linhas
+    cuja impressão digital não mudou não são escritas e os carros ativos do
+    vendedor vindos de importações anteriores que não aparecem no ficheiro
+    passam a 'inactive' (os inativos cuja linha mudou voltam a 'active').
+    """
+    report = RelatorioImportacao()
+    resolvedor = ResolvedorCatalogo()
+    batch = []
+    seen = set()
+    incompleto = False
+
+    for line, row in rows:
+        report.total += 1
+        if isinstance(row, ValidationError):
+            # Linha ilegível (ver ler_linhas): sem matrícula, o feed fica incompleto
+            report.add_error(line, None, '; '.join(row.messages))
+            incompleto = True
+            continue
+        # Antes de validar: um anúncio existente com uma linha inválida (ex.:
+        # marca mal escrita) continua no feed e não pode ser desativado
+        seen.add(str(row.get('license_plate') or '').strip().upper())
+        try:
+            car = construir_carro(row, seller, resolvedor)
+        except ValidationError as e:
+            report.add_error(line, row.get('license_plate'), '; '.join(e.messages))
+            continue
+        except (ValueError, TypeError) as e:
+            report.add_error(line, row.get('license_plate'), str(e))
+            continue
+
+        batch.append((line, car, row.get('photos')))
+        if len(batch) >= batch_size:
+            _gravar_lote(batch, seller, report, sync)
+            batch = []
+
+    if batch:
+        _gravar_lote(batch, seller, report, sync)
+
+    # Com linhas ilegíveis não se sabe que matrículas faltam: não desativar nada
+    if sync and not incompleto:
+        report.deactivated = _desativar_ausentes(seller, seen)
+
+    return report
+
+
+def _desativar_ausentes(seller, seen):
+    """Marcar como inativos os carros importados que deixaram de vir no feed"""
+    vanished = [
+        car_id
+        for car_id, plate in Car.objects.filter(
+            seller=seller,
+            status='active',
+            import_fingerprint__isnull=False
+        ).values_list('id', 'license_plate').iterator()
+        if plate not in seen
+    ]
+
+    for start in range(0, len(vanished), IMPORT_BATCH_SIZE):
+        Car.objects.filter(
+            id__in=vanished[start:start + IMPORT_BATCH_SIZE]
+        ).update(status='inactive', updated_at=timezone.now())
+    return len(vanished)
+
+
+def _gravar_lote(batch, seller, report, sync=False):
+    # Última ocorrência de cada matrícula no lote prevalece
+    by_plate = {}
+    for line, car, photos in batch:
+        if car.license_plate in by_plate:
+            report.add_error(by_plate[car.license_plate][0], car.license_plate, f'Matrícula repetida (substituída pela linha {line})')
+        by_plate[car.license_plate] = (line, car, photos)
+
+    existing = {
+        plate: (car_id, seller_id, status, price, fingerprint)
+        for plate, car_id, seller_id, status, price, fingerprint in Car.objects.filter(
+            license_plate__in=by_plate.keys()
+        ).values_list('license_plate', 'id', 'seller_id', 'status', 'price', 'import_fingerprint')
+    }
+
+    cars, new_photos, price_changes, reactivated = [], [], [], []
+    for plate, (line, car, photos) in by_plate.items():
+        if plate in existing:
+            car_id, seller_id, status, old_price, fingerprint = existing[plate]
+            if seller_id != seller.pk:
+                report.add_error(line, plate, 'Matrícula registada por outro vendedor')
+                continue
+            if sync and fingerprint == car.import_fingerprint:
+                report.unchanged += 1
+                continue
+            # O upsert não altera o estado; os receivers de preço precisam dele.
+            # Em sync, uma linha alterada volta a publicar um carro inativo
+            # (ex.: desativado por ter saído do feed); vendidos e reservados não
+            car.id = car_id
+            car.status = status
+            if sync and status == 'inactive':
+                car.status = 'active'
+                reactivated.append(car_id)
+            if old_price != car.price:
+                price_changes.append((car, old_price, car.price))
+        elif photos:
+            new_photos.extend(_fotos(car, photos))
+        cars.append(car)
+
+    if not cars:
+        return
+
+    with transaction.atomic():
+        Car.objects.bulk_create(
+            cars,
+            batch_size=IMPORT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['license_plate'],
+            update_fields=CAMPOS_ATUALIZADOS,
+        )
+        if reactivated:
+            Car.objects.filter(id__in=reactivated, status='inactive').update(status='active')
+        if new_photos:
+            CarPhoto.objects.bulk_create(new_photos, batch_size=IMPORT_BATCH_SIZE)
+            # bulk_create não passa por CarPhoto.save: preencher Car.main_photo
+            main_photos = [photo for photo in new_photos if photo.is_main]
+            for photo in main_photos:
+                photo.car.main_photo = photo
+            Car.objects.bulk_update([photo.car for photo in main_photos], ['main_photo'], batch_size=IMPORT_BATCH_SIZE)
+        if price_changes:
+            PriceHistory.objects.bulk_create([
+                PriceHistory(car=car, old_price=old_price, new_price=new_price, change_reason='Importação')
+                for car, old_price, new_price in price_changes
+            ])
+            transaction.on_commit(lambda: [
+                price_changed.send(sender=Car, car=car, old_price=old_price, new_price=new_price)
+                for car, old_price, new_price in price_changes
+            ])
+
+    updated = sum(1 for car in cars if car.license_plate in existing)
+    report.updated += updated
+    report.created += len(cars) - updated
+
+
+def _fotos(car, photos):
+    """Fotos indicadas por caminho no storage (separadas por '|'), a primeira é a principal"""
+    if isinstance(photos, str):
+        photos = [path.strip() for path in photos.split('|')]
+    return [
+        CarPhoto(car=car, photo=path, is_main=order == 0, order=order)
+        for order, path in enumerate(p for p in photos if p)
+    ]
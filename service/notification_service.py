@@ -0,0 +1,249 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from cars.models import Favorite
+from cars.models_archive import NotificationArchive, ChatNotificationArchive
+from cars.models_chat import ChatRoom, ChatNotification
+from cars.models_purchase import Notification
+from carzone.caches import cache_partilhada
+
+
+# Tamanho dos lotes de INSERT/DELETE
+NOTIFICACOES_BATCH_SIZE = 1000
+
+# Tempo de vida do contador de notificações por ler na cache (1 hora).
+# Só é usado com uma cache partilhada: os incr/decr na LocMemCache ficariam
+# no worker que gravou e os outros mostrariam o contador errado.
+CONTADOR_CACHE_TIMEOUT = 60 * 60
+
+
+def chave_contador(user_id):
+    """Chave de cache do número de notificações por ler de um utilizador"""
+    return f'notificacoes:por_ler:{user_id}'
+
+
+def contar_por_ler(user_id):
+    """Número de notificações por ler, lido da cache ou calculado uma vez"""
+    if not cache_partilhada():
+        return Notification.objects.filter(user_id=user_id, is_read=False).count()
+
+    key = chave_contador(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(key, count, CONTADOR_CACHE_TIMEOUT)
+    return count
+
+
+def _ajustar_contador(user_id, delta):
+    try:
+        if delta > 0:
+            cache.incr(chave_contador(user_id), delta)
+        else:
+            cache.decr(chave_contador(user_id), -delta)
+    except ValueError:
+        # Sem contador na cache: será calculado na próxima leitura
+        pass
+
+
+def ajustar_contadores(user_ids, delta=1):
+    """Atualizar os contadores dos utilizadores depois do commit"""
+    if not cache_partilhada():
+        return
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: [_ajustar_contador(user_id, delta) for user_id in user_ids])
+
+
+def invalidar_contador(user_id):
+    """Descartar o contador (ex.: depois de marcar todas como lidas)"""
+    invalidar_contadores([user_id])
+
+
+def invalidar_contadores(user_ids):
+    if cache_partilhada():
+        cache.delete_many([chave_contador(user_id) for user_id in user_ids])
+
+
+def criar_em_lote(notifications):
+    """Gravar notificações já construídas com bulk_create e atualizar os contadores"""
+    created = Notification.objects.bulk_create(notifications, batch_size=NOTIFICACOES_BATCH_SIZE)
+    ajustar_contadores(notification.user_id for notification in created)
+    return created
+
+
+def criar_notificacao(user, notification_type, title, message, dedup_window=None, **kwargs):
+    """
+    Criar uma notificação para um utilizador.
+
+    Com `dedup_window` (timedelta) não cria nada se já existir uma notificação
+    por ler igual (tipo, título e referências) dentro dessa janela.
+    Retorna a notificação criada ou None.
+    """
+    created = notificar_utilizadores(
+        [user.pk], notification_type, title, message, dedup_window=dedup_window, **kwargs
+    )
+    return created[0] if created else None
+
+
+def notificar_utilizadores(user_ids, notification_type, title, message, dedup_window=None, **kwargs):
+    """
+    Criar a mesma notificação para vários utilizadores com bulk_create.
+
+    Aceita as referências opcionais `purchase_request`, `purchase` e `car`
+    (instâncias) ou os respetivos `*_id`. Retorna as notificações criadas.
+    """
+    refs = _referencias(kwargs)
+    user_ids = list(dict.fromkeys(user_ids))
+
+    if dedup_window and user_ids:
+        recentes = set(
+            Notification.objects.filter(
+                user_id__in=user_ids,
+                type=notification_type,
+                title=title,
+                is_read=False,
+                created_at__gte=timezone.now() - dedup_window,
+                **refs
+            ).values_list('user_id', flat=True)
+        )
+        user_ids = [user_id for user_id in user_ids if user_id not in recentes]
+
+    if not user_ids:
+        return []
+
+    return criar_em_lote([
+        Notification(
+            user_id=user_id,
+            type=notification_type,
+            title=title,
+            message=message,
+            **refs
+        )
+        for user_id in user_ids
+    ])
+
+
+def notificar_favoritos(car, notification_type, title, message, exclude=(), dedup_window=None):
+    """Notificar todos os utilizadores que têm o carro nos favoritos"""
+    user_ids = Favorite.objects.filter(car_id=car.pk).exclude(
+        user_id__in=[car.seller_id, *exclude]
+    ).values_list('user_id', flat=True)
+
+    return notificar_utilizadores(
+        user_ids, notification_type, title, message, dedup_window=dedup_window, car_id=car.pk
+    )
+
+
+def _referencias(kwargs):
+    refs = {}
+    for name in ('purchase_request', 'purchase', 'car'):
+        value = kwargs.get(name)
+        if value is not None:
+            refs[f'{name}_id'] = value.pk
+        elif kwargs.get(f'{name}_id') is not None:
+            refs[f'{name}_id'] = kwargs[f'{name}_id']
+    return refs
+
+
+def notificar_chat(recipient, chat_room, notification_type, title, content, message=None):
+    """Criar uma notificação de chat (início, fecho, reabertura)"""
+    return ChatNotification.objects.create(
+        recipient=recipient,
+        chat_room=chat_room,
+        message=message,
+        notification_type=notification_type,
+        title=title,
+        content=content
+    )
+
+
+def notificar_nova_mensagem(recipient, chat_room, message, sender):
+    """
+    Notificar uma nova mensagem, agregando por sala.
+
+    Enquanto existir uma notificação 'new_message' por ler para a mesma sala,
+    ela é atualizada (contador, última mensagem e data) num único UPDATE em
+    vez de criar uma linha por mensagem. A linha da sala fica bloqueada
+    durante a operação, para duas mensagens simultâneas não criarem duas
+    notificações por ler.
+    """
+    sender_name = sender.get_full_name() or sender.username
+    content = message.content[:100] + ('...' if len(message.content) > 100 else '')
+
+    using = router.db_for_write(ChatNotification)
+    with transaction.atomic(using=using):
+        list(ChatRoom.objects.using(using).select_for_update().filter(pk=chat_room.pk).values_list('pk'))
+
+        updated = ChatNotification.objects.using(using).filter(
+            recipient=recipient,
+            chat_room=chat_room,
+            notification_type='new_message',
+            is_read=False
+        ).update(
+            message=message,
+            message_count=F('message_count') + 1,
+            title=f'Novas mensagens de {sender_name}',
+            content=content,
+            created_at=timezone.now()
+        )
+        if updated:
+            return None
+
+        return ChatNotification.objects.using(using).create(
+            recipient=recipient,
+            chat_room=chat_room,
+            message=message,
+            notification_type='new_message',
+            title=f'Nova mensagem de {sender_name}',
+            content=content
+        )
+
+
+def limpar_notificacoes(read_days=None, unread_days=None):
+    """
+    Aplicar a política de retenção às notificações gerais e de chat.
+
+    Apaga, em lotes, as notificações lidas (ativas ou arquivadas) mais
+    antigas que `read_days` e as por ler mais antigas que `unread_days`.
+    Retorna o total apagado.
+    """
+    if read_days is None:
+        read_days = settings.NOTIFICATION_RETENTION_DAYS
+    if unread_days is None:
+        unread_days = settings.NOTIFICATION_UNREAD_RETENTION_DAYS
+    now = timezone.now()
+
+    total = 0
+    for model in (Notification, ChatNotification):
+        for is_read, days in ((True, read_days), (False, unread_days)):
+            queryset = model.objects.filter(
+                is_read=is_read,
+                created_at__lt=now - timedelta(days=days)
+            )
+            if model is Notification and not is_read:
+                # Apagar por ler altera os contadores destes utilizadores
+                afetados = list(queryset.order_by().values_list('user_id', flat=True).distinct())
+                total += _apagar_em_lotes(queryset)
+                invalidar_contadores(afetados)
+            else:
+                total += _apagar_em_lotes(queryset)
+    for model in (NotificationArchive, ChatNotificationArchive):
+        total += _apagar_em_lotes(
+            model.objects.filter(created_at__lt=now - timedelta(days=read_days))
+        )
+    return total
+
+
+def _apagar_em_lotes(queryset):
+    total = 0
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:NOTIFICACOES_BATCH_SIZE])
+        if not ids:
+            return total
+        deleted, _ = queryset.model.objects.filter(pk__in=ids).delete()
+        total += deleted
@@ -0,0 +1,80 @@
+from django.db import transaction
+from django.utils import timezone
+
+from cars.models import Car
+from cars.models_purchase import Purchase, PurchaseStatusHistory
+from service import notification_service
+from services.email_service import EmailService
+
+
+class CarroIndisponivel(Exception):
+    """O carro já não está disponível para compra"""
+
+
+def efetuar_compra(car_id, buyer, purchase, idempotency_key=None):
+    """
+    Registar uma compra direta de forma segura em concorrência.
+
+    `purchase` é a instância ainda por gravar (form.save(commit=False)).
+    A linha do carro fica bloqueada (SELECT ... FOR UPDATE) durante a
+    transação, por isso dois compradores nunca reservam o mesmo carro.
+    Uma submissão repetida com a mesma chave de idempotência devolve a
+    compra já existente. Notificações e emails só saem após o commit.
+
+    Retorna (purchase, criada) ou lança CarroIndisponivel.
+    """
+    with transaction.atomic():
+        try:
+            car = Car.objects.select_for_update().get(pk=car_id)
+        except Car.DoesNotExist:
+            raise CarroIndisponivel()
+
+        # Verificado depois do lock: vê a compra de um pedido concorrente já confirmado
+        if idempotency_key:
+            existing = Purchase.objects.filter(
+                buyer=buyer,
+                idempotency_key=idempotency_key
+            ).first()
+            if existing:
+                return existing, False
+
+        if car.status != 'active' or car.seller_id == buyer.pk:
+            raise CarroIndisponivel()
+
+        purchase.car = car
+        purchase.buyer = buyer
+        purchase.seller_id = car.seller_id
+        purchase.purchase_price = car.price
+        purchase.idempotency_key = idempotency_key or None
+        purchase.save()
+
+        # Marcar carro como reservado sem regravar todas as colunas
+        Car.objects.filter(pk=car.pk).update(status='reserved', updated_at=timezone.now())
+        car.status = 'reserved'
+
+        PurchaseStatusHistory.objects.create(
+            purchase=purchase,
+            previous_status='',
+            new_status='pending_payment',
+            changed_by=buyer,
+            notes='Compra criada'
+        )
+
+        transaction.on_commit(lambda: _notificar_compra_criada(purchase))
+
+    return purchase, True
+
+
+def _notificar_compra_criada(purchase):
+    """Notificar vendedor e comprador (executado após o commit)"""
+    notification_service.criar_notificacao(
+        user=purchase.seller,
+        notification_type='purchase_created',
+        title=f'Nova compra para {purchase.car.title}',
+        message=f'{purchase.buyer_name} comprou o seu carro por €{purchase.purchase_price}.',
+        purchase=purchase,
+        car=purchase.car
+    )
+
+    EmailService.send_purchase_notification(purchase)  # Para o vendedor
+    EmailService.send_purchase_confirmation(purchase)  # Para o comprador
@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from cars.models import Car
+from cars.models_purchase import Purchase, PurchaseStatusHistory, Notification
+from service.notification_service import criar_em_lote
+
+
+# Estados de compra que continuam a prender o carro
+ESTADOS_QUE_RESERVAM = ['pending_payment', 'payment_confirmed', 'preparing_delivery', 'in_transit', 'delivered']
+
+
+def prazo_reserva():
+    """Tempo que uma compra pode ficar por pagar antes de libertar o carro"""
+    return timedelta(minutes=getattr(settings, 'PURCHASE_RESERVATION_TTL_MINUTES', 60 * 24))
+
+
+def reservas_expiradas(now=None):
+    """Compras por pagar cujo prazo já passou (servido pelo índice status/created_at)"""
+    now = now or timezone.now()
+    return Purchase.objects.filter(
+        status='pending_payment',
+        payment_status='pending',
+        created_at__lt=now - prazo_reserva()
+    )
+
+
+def expirar_reservas(batch_size=500, now=None):
+    """
+    Cancelar em lote as compras por pagar cujo prazo expirou.
+
+    Cada lote é uma transação: bloqueia até `batch_size` compras (saltando
+    as que outro worker já tem bloqueadas), cancela-as com um único UPDATE,
+    devolve os carros a 'active' com outro UPDATE e cria o histórico e as
+    notificações com bulk_create. Retorna o número de compras expiradas.
+    """
+    now = now or timezone.now()
+    total = 0
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                reservas_expiradas(now).select_for_update(skip_locked=True, of=('self',)).order_by(
+                    'created_at'
+                ).values_list('id', 'car_id', 'buyer_id', 'seller_id', 'car__title')[:batch_size]
+            )
+            if not rows:
+                break
+
+            purchase_ids = [row[0] for row in rows]
+            car_ids = {row[1] for row in rows}
+
+            Purchase.objects.filter(
+                id__in=purchase_ids,
+                status='pending_payment'
+            ).update(status='cancelled', updated_at=now)
+
+            # Só liberta carros que não estejam presos por outra compra
+            Car.objects.filter(
+                id__in=car_ids,
+                status='reserved'
+            ).exclude(
+                purchases__status__in=ESTADOS_QUE_RESERVAM
+            ).update(status='active', updated_at=now)
+
+            PurchaseStatusHistory.objects.bulk_create([
+                PurchaseStatusHistory(
+                    purchase_id=purchase_id,
+                    previous_status='pending_payment',
+                    new_status='cancelled',
+                    changed_by_id=buyer_id,
+                    notes='Reserva expirada sem pagamento'
+                )
+                for purchase_id, car_id, buyer_id, seller_id, title in rows
+            ])
+
+            notifications = []
+            for purchase_id, car_id, buyer_id, seller_id, title in rows:
+                notifications.append(Notification(
+                    user_id=buyer_id,
+                    type='status_changed',
+                    title=f'Reserva expirada: {title}',
+                    message='A compra foi cancelada porque o pagamento não foi confirmado a tempo.',
+                    purchase_id=purchase_id,
+                    car_id=car_id
+                ))
+                notifications.append(Notification(
+                    user_id=seller_id,
+                    type='status_changed',
+                    title=f'Reserva expirada: {title}',
+                    message='A compra não foi paga a tempo e o carro voltou a estar disponível.',
+                    purchase_id=purchase_id,
+                    car_id=car_id
+                ))
+            criar_em_lote(notifications)
+
+        total += len(rows)
+        if len(rows) < batch_size:
+            break
+
+    return total
+
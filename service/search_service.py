@@ -0,0 +1,79 @@
+import hashlib
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import Upper
+
+from cars.models import Brand, CarModel, Car
+
+
+# Sugestões por categoria
+AUTOCOMPLETE_LIMIT = 8
+
+# Abaixo disto não há trigramas suficientes para uma pesquisa útil
+AUTOCOMPLETE_MIN_LENGTH = 2
+
+# As sugestões mudam pouco e são pedidas a cada tecla
+AUTOCOMPLETE_CACHE_TIMEOUT = 300
+
+
+def filtro_aproximado(field, termo):
+    """
+    Q que aceita o termo contido no campo (icontains) ou uma palavra do
+    campo parecida com ele (operador %> do pg_trgm, tolera erros de
+    escrita). As duas condições usam o índice GIN trigram sobre
+    UPPER(campo); usar com `.alias(**{f'{field}_upper': Upper(field)})`.
+    """
+    return Q(**{f'{field}__icontains': termo}) | Q(**{f'{field}_upper__trigram_word_similar': termo})
+
+
+def procurar(queryset, field, termo):
+    """Filtrar por aproximação e ordenar da sugestão mais parecida para a menos"""
+    return queryset.alias(**{f'{field}_upper': Upper(field)}).filter(
+        filtro_aproximado(field, termo)
+    ).annotate(
+        similarity=TrigramWordSimilarity(termo, field)
+    ).order_by('-similarity', field)
+
+
+def sugerir_marcas(termo, limit=AUTOCOMPLETE_LIMIT):
+    brands = procurar(Brand.objects.filter(is_active=True), 'name', termo)
+    return [{'id': brand_id, 'name': name} for brand_id, name in brands.values_list('id', 'name')[:limit]]
+
+
+def sugerir_modelos(termo, brand_id=None, limit=AUTOCOMPLETE_LIMIT):
+    models = CarModel.objects.filter(is_active=True)
+    if brand_id:
+        models = models.filter(brand_id=brand_id)
+    models = procurar(models, 'name', termo).values_list('id', 'name', 'brand_id', 'brand__name')
+    return [
+        {'id': model_id, 'name': name, 'brand_id': model_brand_id, 'brand': brand_name}
+        for model_id, name, model_brand_id, brand_name in models[:limit]
+    ]
+
+
+def sugerir_cidades(termo, limit=AUTOCOMPLETE_LIMIT):
+    """Cidades com carros ativos, as com mais anúncios primeiro em caso de empate"""
+    cities = procurar(Car.objects.filter(status='active'), 'city', termo).values('city').annotate(
+        total=Count('id')
+    ).order_by('-similarity', '-total')
+    return [{'name': row['city'], 'total': row['total']} for row in cities[:limit]]
+
+
+def autocompletar(termo, limit=AUTOCOMPLETE_LIMIT):
+    """Sugestões de marcas, modelos e cidades para a caixa de pesquisa (com cache)"""
+    termo = ' '.join((termo or '').split())
+    if len(termo) < AUTOCOMPLETE_MIN_LENGTH:
+        return {'brands': [], 'models': [], 'cities': []}
+
+    key = 'autocompletar:' + hashlib.md5(f'{termo.lower()}:{limit}'.encode()).hexdigest()
+    return cache.get_or_set(
+        key,
+        lambda: {
+            'brands': sugerir_marcas(termo, limit),
+            'models': sugerir_modelos(termo, limit=limit),
+            'cities': sugerir_cidades(termo, limit),
+        },
+        AUTOCOMPLETE_CACHE_TIMEOUT,
+    )
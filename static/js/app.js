@@ -9,7 +9,7 @@ $(function () {
             $(".page_loader").fadeOut("fast");
         }, 100);
 
-        if ($('body .filter-portfolio').length > 0) {
+        if ($('body .filter-portfolio').length > 0 && $.fn.filterizr) {
             $(function () {
                 $('.filter-portfolio').filterizr(
                     {
@@ -30,14 +30,19 @@ $(function () {
     $('.dashboard-nav').css('min-height', winHeight);
 
 
+    // Plugins are loaded per page (carzone/bundles.py): only initialise the ones present
     // Magnify activation
-    $('.portfolio-item').magnificPopup({
-        delegate: 'a',
-        type: 'image',
-        gallery:{enabled:true}
-    });
+    if ($.fn.magnificPopup) {
+        $('.portfolio-item').magnificPopup({
+            delegate: 'a',
+            type: 'image',
+            gallery:{enabled:true}
+        });
+    }
 
-    $(".car-magnify-gallery").lightGallery();
+    if ($.fn.lightGallery) {
+        $(".car-magnify-gallery").lightGallery();
+    }
 
     $(document).on('click', '.compare-btn', function () {
         if($(this).hasClass('active')){
@@ -179,7 +184,7 @@ $(function () {
     })(jQuery);
 
     // Page scroller initialization.
-    $.scrollUp({
+    if ($.scrollUp) $.scrollUp({
         scrollName: 'page_scroller',
         scrollDistance: 300,
         scrollFrom: 'top',
@@ -225,7 +230,7 @@ $(function () {
 
 
     // Countdown activation
-    $( function() {
+    if ($.fn.countdown) $( function() {
         // Add background image
         //$.backstretch('../img/nature.jpg');
         var endDate = "December  27, 2019 15:03:25";
@@ -288,7 +293,9 @@ $(function () {
     });
 
     // Select picket
-    $('.selectpicker').selectpicker();
+    if ($.fn.selectpicker) {
+        $('.selectpicker').selectpicker();
+    }
 
     // Search option's icon toggle
     $('.search-options-btn').on('click', function () {
@@ -318,7 +325,7 @@ $(function () {
 
     // Background video playing script
     $(document).ready(function () {
-        $(".player").mb_YTPlayer(
+        if ($.fn.mb_YTPlayer) $(".player").mb_YTPlayer(
             {
                 mobileFallbackImage: 'static/img/banner/banner-1.jpg'
             }
@@ -326,7 +333,9 @@ $(function () {
     });
 
     // Multilevel menuus
-    $('[data-submenu]').submenupicker();
+    if ($.fn.submenupicker) {
+        $('[data-submenu]').submenupicker();
+    }
 
     // Expending/Collapsing advance search content
     $('.show-more-options').on('click', function () {
@@ -383,7 +392,7 @@ $(function () {
 
 
     // Slick Sliders
-    $('.slick-carousel').each(function () {
+    if ($.fn.slick) $('.slick-carousel').each(function () {
         var slider = $(this);
         $(this).slick({
             infinite: true,
@@ -410,12 +419,14 @@ $(function () {
 
 
     // Dropzone initialization
-    Dropzone.autoDiscover = false;
-    $(function () {
-        $("div#myDropZone").dropzone({
-            url: "/file-upload"
+    if (window.Dropzone) {
+        Dropzone.autoDiscover = false;
+        $(function () {
+            $("div#myDropZone").dropzone({
+                url: "/file-upload"
+            });
         });
-    });
+    }
 
     // Filterizr initialization
     $(function () {
@@ -466,6 +477,9 @@ $(function () {
 
 // mCustomScrollbar initialization
 (function ($) {
+    if (!$.fn.mCustomScrollbar) {
+        return;
+    }
     $(window).resize(function () {
         $('#map').css('height', $(this).height() - 110);
         if ($(this).width() > 768) {
@@ -0,0 +1,183 @@
+function toggleSidebar() {
+    document.querySelector('.sidebar').classList.toggle('show');
+}
+
+// Função para atualizar contador de notificações
+function updateNotificationCount(newCount) {
+    const sidebarBadge = document.getElementById('notification-count');
+    const navbarBadge = document.querySelector('.notification-badge');
+    const bellIcon = document.querySelector('.notification-icon');
+
+    if (newCount > 0) {
+        // Mostrar badges com o novo contador
+        if (sidebarBadge) {
+            sidebarBadge.textContent = newCount;
+            sidebarBadge.style.display = 'inline';
+            sidebarBadge.classList.add('notification-badge');
+        }
+
+        if (navbarBadge) {
+            navbarBadge.textContent = newCount;
+            navbarBadge.style.display = 'inline';
+        }
+
+        if (bellIcon) {
+            bellIcon.classList.add('has-notifications');
+        }
+    } else {
+        // Ocultar badges quando não há notificações
+        if (sidebarBadge) {
+            sidebarBadge.style.display = 'none';
+            sidebarBadge.classList.remove('notification-badge');
+        }
+
+        if (navbarBadge) {
+            navbarBadge.style.display = 'none';
+        }
+
+        if (bellIcon) {
+            bellIcon.classList.remove('has-notifications');
+        }
+    }
+}
+
+// Verificar periodicamente por novas notificações
+function checkForNewNotifications() {
+    fetch('/dashboard/notificacoes/count/', {
+        method: 'GET',
+        headers: {
+            'X-Requested-With': 'XMLHttpRequest'
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            const currentCount = parseInt(document.getElementById('notification-count')?.textContent || '0');
+            if (data.count !== currentCount) {
+                updateNotificationCount(data.count);
+            }
+        }
+    })
+    .catch(error => {
+        console.error('Erro ao verificar notificações:', error);
+    });
+}
+
+// Carregar mensagens recentes de chat
+function loadRecentMessages() {
+    // Não executar na página de chat
+    if (window.location.pathname.includes('/chat/sala/')) {
+        return;
+    }
+
+    fetch('/chat/api/recent-messages/')
+        .then(response => response.json())
+        .then(data => {
+            const container = document.getElementById('recent-messages-container');
+            const badge = document.getElementById('chat-notification-badge');
+
+            if (data.success && data.messages.length > 0) {
+                let html = '';
+                let unreadCount = 0;
+
+                data.messages.forEach(message => {
+                    const timeAgo = formatTimeAgo(message.timestamp);
+                    const isUnread = !message.is_read;
+                    if (isUnread) unreadCount++;
+
+                    html += `
+                        <li>
+                            <a class="dropdown-item py-2 ${isUnread ? 'bg-light' : ''}" href="/chat/sala/${message.chat_room_id}/">
+                                <div class="d-flex">
+                                    <div class="flex-shrink-0">
+                                        <i class="fas fa-user-circle fs-4 text-secondary"></i>
+                                    </div>
+                                    <div class="flex-grow-1 ms-2">
+                                        <div class="d-flex justify-content-between">
+                                            <h6 class="mb-1 ${isUnread ? 'fw-bold' : ''}">${message.other_user_name}</h6>
+                                            <small class="text-muted">${timeAgo}</small>
+                                        </div>
+                                        <p class="mb-1 text-truncate" style="max-width: 250px;">
+                                            ${isUnread ? '<i class="fas fa-circle text-success me-1" style="font-size: 6px;"></i>' : ''}
+                                            ${message.content}
+                                        </p>
+                                        <small class="text-muted">${message.car_title}</small>
+                                    </div>
+                                </div>
+                            </a>
+                        </li>
+                    `;
+                });
+
+                container.innerHTML = html;
+
+                // Atualizar badge
+                if (unreadCount > 0) {
+                    badge.textContent = unreadCount;
+                    badge.style.display = 'inline-block';
+                } else {
+                    badge.style.display = 'none';
+                }
+            } else {
+                container.innerHTML = `
+                    <li><div class="dropdown-item text-muted text-center py-3">
+                        <i class="fas fa-comment-slash me-2"></i>Nenhuma mensagem recente
+                    </div></li>
+                `;
+                badge.style.display = 'none';
+            }
+        })
+        .catch(error => {
+            console.error('Erro ao carregar mensagens:', error);
+            document.getElementById('recent-messages-container').innerHTML = `
+                <li><div class="dropdown-item text-danger text-center py-3">
+                    <i class="fas fa-exclamation-triangle me-2"></i>Erro ao carregar mensagens
+                </div></li>
+            `;
+        });
+}
+
+// Formatar tempo relativo
+function formatTimeAgo(timestamp) {
+    const now = new Date();
+    const messageTime = new Date(timestamp);
+    const diffInSeconds = Math.floor((now - messageTime) / 1000);
+
+    if (diffInSeconds < 60) {
+        return 'Agora mesmo';
+    } else if (diffInSeconds < 3600) {
+        const minutes = Math.floor(diffInSeconds / 60);
+        return `${minutes}m atrás`;
+    } else if (diffInSeconds < 86400) {
+        const hours = Math.floor(diffInSeconds / 3600);
+        return `${hours}h atrás`;
+    } else {
+        const days = Math.floor(diffInSeconds / 86400);
+        return `${days}d atrás`;
+    }
+}
+
+// Verificar notificações e mensagens a cada 30 segundos
+document.addEventListener('DOMContentLoaded', function() {
+    // Não executar na página de chat para evitar conflitos
+    const isCharRoom = window.location.pathname.includes('/chat/sala/');
+
+    if (!isCharRoom) {
+        setInterval(() => {
+            checkForNewNotifications();
+            loadRecentMessages();
+        }, 30000);
+
+        // Carregar imediatamente
+        loadRecentMessages();
+    }
+});
+
+// Auto-hide alerts
+setTimeout(function() {
+    var alerts = document.querySelectorAll('.alert');
+    alerts.forEach(function(alert) {
+        var bsAlert = new bootstrap.Alert(alert);
+        bsAlert.close();
+    });
+}, 5000);